@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import argparse
+import heapq
+import time
+from dataclasses import dataclass, replace
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from core.clock import SimulatedClock
+from core.config import AppConfig, load_config
+from core.logger import setup_logger
+from core.market_store import MarketDataStore
+from core.storage import Storage
+from trading.engine import TradingEngine, build_engine
+
+KLINE_COLUMNS = [
+    "open_time",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "close_time",
+    "quote_volume",
+    "trades",
+    "taker_buy_base_volume",
+    "taker_buy_quote_volume",
+    "ignore",
+]
+
+Bar = Tuple[float, str, float]
+
+
+@dataclass
+class BacktestResult:
+    bars: int
+    trades: int
+    final_equity: float
+    realized_pnl: float
+    elapsed_seconds: float
+
+    @property
+    def bars_per_minute(self) -> float:
+        return self.bars / self.elapsed_seconds * 60 if self.elapsed_seconds else 0.0
+
+
+def _has_header(path: Path) -> bool:
+    with path.open() as handle:
+        first = handle.readline().split(",", 1)[0].strip()
+    return not first.lstrip("-").isdigit()
+
+
+def _epoch_seconds(column: pd.Series) -> pd.Series:
+    if pd.api.types.is_numeric_dtype(column):
+        values = column.astype("float64")
+        return values / 1000 if len(values) and values.iloc[0] > 1e11 else values
+    return pd.to_datetime(column, utc=True).astype("int64") / 1e9
+
+
+def frame_timestamps(frame: pd.DataFrame) -> pd.Series:
+    time_column = next(name for name in ("close_time", "open_time", "timestamp") if name in frame.columns)
+    return _epoch_seconds(frame[time_column])
+
+
+def _frame_bars(frame: pd.DataFrame, symbol: str) -> Iterator[Bar]:
+    timestamps = frame_timestamps(frame).tolist()
+    closes = frame["close"].astype("float64").tolist()
+    symbols = frame["symbol"].tolist() if "symbol" in frame.columns else None
+    for i, (timestamp, close) in enumerate(zip(timestamps, closes)):
+        yield timestamp, symbols[i] if symbols else symbol, close
+
+
+def read_kline_frames(path: Path | str, chunksize: int = 250_000) -> Iterator[pd.DataFrame]:
+    source = Path(path)
+    if source.suffix == ".parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise RuntimeError(f"Reading {source} needs pyarrow: pip install pyarrow") from exc
+
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+        return
+
+    header = _has_header(source)
+    yield from pd.read_csv(
+        source,
+        chunksize=chunksize,
+        header=0 if header else None,
+        names=None if header else KLINE_COLUMNS,
+    )
+
+
+def read_klines(path: Path | str, symbol: str, chunksize: int = 250_000) -> Iterator[Bar]:
+    for frame in read_kline_frames(path, chunksize):
+        yield from _frame_bars(frame, symbol)
+
+
+def symbol_from_path(path: Path | str) -> str:
+    return Path(path).stem.replace("_", "-").split("-")[0].upper()
+
+
+def merge_bars(sources: Dict[str, Path | str]) -> Iterator[Bar]:
+    streams = [read_klines(path, symbol) for symbol, path in sources.items()]
+    return heapq.merge(*streams, key=lambda bar: bar[0])
+
+
+def merge_store_bars(
+    store: MarketDataStore,
+    symbols: List[str],
+    interval: str,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+) -> Iterator[Bar]:
+    streams = [store.iter_closes(symbol, interval, start, end) for symbol in symbols]
+    return heapq.merge(*streams, key=lambda bar: bar[0])
+
+
+def run_backtest(
+    config: AppConfig,
+    bars: Iterable[Bar],
+    storage: Storage,
+    clock: SimulatedClock,
+    equity_every: int = 60,
+    commit_every: int = 50_000,
+) -> BacktestResult:
+    config = replace(
+        config,
+        market_data=replace(config.market_data, store_path=""),
+        state=replace(config.state, journal_path=""),
+    )
+    engine: TradingEngine = build_engine(config, storage, None, clock=clock, mode="backtest")
+    risk = engine.risk
+    prices = engine.prices
+    on_price = engine.on_price
+    symbols = engine.symbols
+    set_timestamp = clock.set_timestamp
+
+    storage.record_event("INFO", "BACKTEST_START", "Backtest started", {"symbols": sorted(symbols)})
+    started = time.perf_counter()
+    count = 0
+    blocked = False
+    iterator = iter(bars)
+    while True:
+        chunk = list(islice(iterator, commit_every))
+        if not chunk:
+            break
+        with storage.batch():
+            for timestamp, symbol, price in chunk:
+                if symbol not in symbols:
+                    continue
+                set_timestamp(timestamp)
+                engine.can_trade, engine.block_reason = risk.can_trade()
+                if blocked == engine.can_trade:
+                    blocked = not engine.can_trade
+                    if blocked:
+                        storage.record_event("WARN", "RISK_BLOCK", engine.block_reason, {})
+                prices[symbol] = price
+                on_price(symbol, timestamp, price)
+                count += 1
+                if count % equity_every == 0:
+                    engine.record_snapshot()
+    engine.record_snapshot()
+
+    elapsed = time.perf_counter() - started
+    result = BacktestResult(
+        bars=count,
+        trades=engine.trade_count,
+        final_equity=engine.portfolio.total_equity(prices),
+        realized_pnl=engine.portfolio.realized_pnl,
+        elapsed_seconds=elapsed,
+    )
+    storage.record_event(
+        "INFO",
+        "BACKTEST_END",
+        "Backtest finished",
+        {
+            "bars": result.bars,
+            "trades": result.trades,
+            "final_equity": result.final_equity,
+            "realized_pnl": result.realized_pnl,
+            "bars_per_minute": round(result.bars_per_minute),
+        },
+    )
+    return result
+
+
+def parse_sources(values: List[str]) -> Dict[str, str]:
+    sources: Dict[str, str] = {}
+    for value in values:
+        symbol, sep, path = value.partition("=")
+        if not sep:
+            symbol, path = symbol_from_path(value), value
+        sources[symbol.upper()] = path
+    return sources
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay historical klines through the trading engine")
+    parser.add_argument("--config", default="config.yaml", help="Path to config.yaml")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "--data",
+        nargs="+",
+        help="Kline CSV/Parquet files, as SYMBOL=path or a path named like BTCUSDT-1m-2024-01.csv",
+    )
+    source.add_argument("--store", help="Market-data store directory (see src/ingest.py) to read bars from")
+    parser.add_argument("--symbols", nargs="+", help="Symbols read from --store (default: config symbols)")
+    parser.add_argument("--interval", default="1m", help="Store interval read with --store")
+    parser.add_argument("--start", type=float, default=None, help="Epoch seconds to start from (--store only)")
+    parser.add_argument("--end", type=float, default=None, help="Epoch seconds to stop before (--store only)")
+    parser.add_argument("--db", default="data/backtest.db", help="SQLite file the results are written to")
+    parser.add_argument("--equity-every", type=int, default=60, help="Record an equity snapshot every N bars")
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    if args.store:
+        config.symbols = [symbol.upper() for symbol in args.symbols or config.symbols]
+        bars = merge_store_bars(MarketDataStore(args.store), config.symbols, args.interval, args.start, args.end)
+    else:
+        sources = parse_sources(args.data)
+        config.symbols = list(sources)
+        bars = merge_bars(sources)
+    logger = setup_logger("backtest", config.logging.level, config.logging.dir)
+
+    clock = SimulatedClock()
+    storage = Storage.from_config(replace(config.storage, path=args.db, write_behind=False), clock=clock)
+    try:
+        result = run_backtest(config, bars, storage, clock, equity_every=args.equity_every)
+    finally:
+        storage.close()
+
+    logger.info(
+        "Backtest: %d bars, %d trades, final equity %.2f, realized PnL %.2f (%.0f bars/min)",
+        result.bars,
+        result.trades,
+        result.final_equity,
+        result.realized_pnl,
+        result.bars_per_minute,
+    )
+
+
+if __name__ == "__main__":
+    main()
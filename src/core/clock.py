@@ -6,3 +6,22 @@ from datetime import datetime, timezone
 class Clock:
     def now(self) -> datetime:
         return datetime.now(timezone.utc)
+
+
+class SimulatedClock(Clock):
+    def __init__(self, start: datetime | None = None) -> None:
+        self._now = start or datetime.fromtimestamp(0, tz=timezone.utc)
+        self._timestamp = self._now.timestamp()
+
+    def now(self) -> datetime:
+        if self._now is None:
+            self._now = datetime.fromtimestamp(self._timestamp, tz=timezone.utc)
+        return self._now
+
+    def set_timestamp(self, timestamp: float) -> None:
+        if timestamp != self._timestamp:
+            self._timestamp = timestamp
+            self._now = None
+
+    def advance(self, seconds: float) -> None:
+        self.set_timestamp(self._timestamp + seconds)
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import ast
+import json
+from typing import Any, Dict, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def encode_metadata(metadata: Dict[str, Any]) -> str:
+    if orjson is not None:
+        return orjson.dumps(metadata, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(metadata, default=str, separators=(",", ":"))
+
+
+def decode_metadata(text: Optional[str]) -> Dict[str, Any]:
+    if not text:
+        return {}
+    try:
+        value = orjson.loads(text) if orjson is not None else json.loads(text)
+    except ValueError:
+        try:
+            value = ast.literal_eval(text)
+        except (ValueError, SyntaxError):
+            return {"raw": text}
+    return value if isinstance(value, dict) else {"value": value}
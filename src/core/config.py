@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List
 
@@ -12,6 +12,7 @@ class StrategyConfig:
     name: str
     fast_period: int
     slow_period: int
+    symbols: List[str] = field(default_factory=list)
 
 
 @dataclass
@@ -23,6 +24,14 @@ class LoggingConfig:
 @dataclass
 class StorageConfig:
     path: str
+    write_behind: bool = False
+    flush_interval_ms: int = 200
+    flush_max_batch: int = 500
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    mmap_size_mb: int = 256
+    cache_size_mb: int = 64
+    busy_timeout_ms: int = 5000
 
 
 @dataclass
@@ -30,6 +39,93 @@ class RiskConfig:
     kill_switch_close_positions: bool
 
 
+@dataclass
+class MarketDataConfig:
+    feed: str = "poll"
+    stream: str = "bookTicker"
+    replay_path: str = ""
+    replay_speed: float = 0.0
+    record_path: str = ""
+    store_path: str = ""
+    store_interval: str = "1m"
+
+
+@dataclass
+class BarsConfig:
+    intervals: List[str] = field(default_factory=list)
+    signal_interval: str = ""
+    persist: bool = True
+
+
+@dataclass
+class StateConfig:
+    snapshot_path: str = "data/engine_state.json"
+    snapshot_interval_seconds: float = 60
+    max_snapshot_age_seconds: float = 900
+    warmup_klines: int = 500
+    journal_path: str = ""
+    journal_fsync: bool = True
+
+
+@dataclass
+class FillsConfig:
+    model: str = "slippage"
+    fee_rate: float = 0.0
+    latency_ms: float = 0.0
+    queue_ahead_pct: float = 0.0
+    book_path: str = ""
+    spread_bps: float = 1.0
+    depth_levels: int = 20
+    level_step_bps: float = 1.0
+    level_notional: float = 50_000.0
+    depth_growth: float = 0.1
+
+
+@dataclass
+class OrdersConfig:
+    client_id_prefix: str = "mvp"
+    user_stream: bool = True
+    reconcile_seconds: float = 10.0
+
+
+@dataclass
+class DashboardConfig:
+    refresh_seconds: float = 5.0
+    min_refresh_seconds: float = 1.0
+    max_rows: int = 5000
+    chart_points: int = 1500
+
+
+DEFAULT_EVENT_POLICIES = {"RISK_BLOCK": 300.0, "SIGNAL": 0.0, "TRADE": 0.0, "KILL_SWITCH_CLOSE": 0.0}
+
+
+@dataclass
+class EventsConfig:
+    window_seconds: float = 60.0
+    policies: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_EVENT_POLICIES))
+
+
+@dataclass
+class MetricsConfig:
+    enabled: bool = True
+    host: str = "127.0.0.1"
+    port: int = 9108
+
+
+@dataclass
+class RetentionConfig:
+    enabled: bool = False
+    interval_seconds: float = 300.0
+    batch_rows: int = 2000
+    pause_ms: int = 50
+    equity_raw_days: float = 7.0
+    equity_minute_days: float = 90.0
+    events_days: float = 30.0
+    event_span_seconds: float = 300.0
+    event_dedup_after_seconds: float = 3600.0
+    archive_dir: str = "data/archive"
+
+
 @dataclass
 class AppConfig:
     mode: str
@@ -46,11 +142,23 @@ class AppConfig:
     max_consecutive_losses: int
     cooldown_minutes: int
     poll_interval_seconds: int
+    max_price_age_seconds: float
+    strategy_shards: int
     initial_equity: float
     strategy: StrategyConfig
+    strategies: List[StrategyConfig]
     logging: LoggingConfig
     storage: StorageConfig
     risk: RiskConfig
+    market_data: MarketDataConfig
+    bars: BarsConfig
+    state: StateConfig
+    fills: FillsConfig
+    orders: OrdersConfig
+    dashboard: DashboardConfig
+    retention: RetentionConfig
+    events: EventsConfig
+    metrics: MetricsConfig
 
     def ensure_safe_mode(self) -> None:
         if self.mode not in {"paper", "testnet", "live"}:
@@ -69,9 +177,22 @@ def load_config(path: Path | str = DEFAULT_CONFIG_PATH) -> AppConfig:
 
     raw: Dict[str, Any] = yaml.safe_load(config_path.read_text())
     strategy = StrategyConfig(**raw.get("strategy", {}))
+    strategies = [StrategyConfig(**item) for item in raw.get("strategies") or []] or [strategy]
     logging_cfg = LoggingConfig(**raw.get("logging", {}))
     storage_cfg = StorageConfig(**raw.get("storage", {}))
     risk_cfg = RiskConfig(**raw.get("risk", {}))
+    market_data_cfg = MarketDataConfig(**raw.get("market_data", {}))
+    bars_cfg = BarsConfig(**raw.get("bars", {}))
+    state_cfg = StateConfig(**raw.get("state", {}))
+    fills_cfg = FillsConfig(**raw.get("fills", {}))
+    orders_cfg = OrdersConfig(**raw.get("orders", {}))
+    dashboard_cfg = DashboardConfig(**raw.get("dashboard", {}))
+    retention_cfg = RetentionConfig(**raw.get("retention", {}))
+    events_raw = raw.get("events", {})
+    events_cfg = EventsConfig(
+        **{**events_raw, "policies": {**DEFAULT_EVENT_POLICIES, **(events_raw.get("policies") or {})}}
+    )
+    metrics_cfg = MetricsConfig(**raw.get("metrics", {}))
 
     cfg = AppConfig(
         mode=raw.get("mode", "paper"),
@@ -88,10 +209,22 @@ def load_config(path: Path | str = DEFAULT_CONFIG_PATH) -> AppConfig:
         max_consecutive_losses=int(raw.get("max_consecutive_losses", 3)),
         cooldown_minutes=int(raw.get("cooldown_minutes", 30)),
         poll_interval_seconds=int(raw.get("poll_interval_seconds", 5)),
+        max_price_age_seconds=float(raw.get("max_price_age_seconds", 30)),
+        strategy_shards=int(raw.get("strategy_shards", 0)),
         initial_equity=float(raw.get("initial_equity", 10000)),
         strategy=strategy,
+        strategies=strategies,
         logging=logging_cfg,
         storage=storage_cfg,
         risk=risk_cfg,
+        market_data=market_data_cfg,
+        bars=bars_cfg,
+        state=state_cfg,
+        fills=fills_cfg,
+        orders=orders_cfg,
+        dashboard=dashboard_cfg,
+        retention=retention_cfg,
+        events=events_cfg,
+        metrics=metrics_cfg,
     )
     return cfg
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+from core.codec import encode_metadata
+
+
+class TradeJournal:
+    def __init__(self, path: Path | str, fsync: bool = True) -> None:
+        self.path = Path(path)
+        self.fsync = fsync
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.seq = max((entry["seq"] for entry in self.read()), default=0)
+        self._handle = self._open()
+
+    def _open(self):
+        handle = self.path.open("a+b")
+        if handle.tell():
+            handle.seek(-1, os.SEEK_END)
+            if handle.read(1) != b"\n":
+                handle.write(b"\n")
+        return handle
+
+    def append(self, entry: Dict[str, Any]) -> int:
+        self.seq += 1
+        self._handle.write(encode_metadata({"seq": self.seq, **entry}).encode() + b"\n")
+        self._handle.flush()
+        if self.fsync:
+            os.fsync(self._handle.fileno())
+        return self.seq
+
+    def read(self, after: int = 0) -> List[Dict[str, Any]]:
+        if not self.path.exists():
+            return []
+        entries: List[Dict[str, Any]] = []
+        with self.path.open("rb") as handle:
+            for line in handle:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(entry, dict) and entry.get("seq", 0) > after:
+                    entries.append(entry)
+        return entries
+
+    def compact(self, upto: int) -> None:
+        keep = self.read(after=upto)
+        self._handle.close()
+        temporary = self.path.with_name(f".{self.path.name}.tmp")
+        with temporary.open("wb") as handle:
+            for entry in keep:
+                handle.write(encode_metadata(entry).encode() + b"\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary, self.path)
+        self._handle = self._open()
+
+    def close(self) -> None:
+        self._handle.close()
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+COLUMNS = ("open", "high", "low", "close", "volume", "timestamp")
+DTYPE = np.dtype("<f8")
+
+Columns = Dict[str, np.ndarray]
+
+
+class MarketDataStore:
+    def __init__(self, root: Path | str) -> None:
+        self.root = Path(root)
+
+    def path(self, symbol: str, interval: str) -> Path:
+        return self.root / symbol.upper() / interval
+
+    def symbols(self) -> List[str]:
+        if not self.root.exists():
+            return []
+        return sorted(entry.name for entry in self.root.iterdir() if entry.is_dir())
+
+    def intervals(self, symbol: str) -> List[str]:
+        directory = self.root / symbol.upper()
+        if not directory.exists():
+            return []
+        return sorted(entry.name for entry in directory.iterdir() if entry.is_dir())
+
+    def length(self, symbol: str, interval: str) -> int:
+        files = [self.path(symbol, interval) / f"{column}.f64" for column in COLUMNS]
+        if not all(path.exists() for path in files):
+            return 0
+        return min(path.stat().st_size for path in files) // DTYPE.itemsize
+
+    def last_timestamp(self, symbol: str, interval: str) -> Optional[float]:
+        n = self.length(symbol, interval)
+        if not n:
+            return None
+        return float(self._column(symbol, interval, "timestamp", n)[-1])
+
+    def append(self, symbol: str, interval: str, columns: Mapping[str, Sequence[float]]) -> int:
+        timestamps = np.asarray(columns["timestamp"], dtype=DTYPE)
+        timestamps, index = np.unique(timestamps, return_index=True)
+        last = self.last_timestamp(symbol, interval)
+        if last is not None:
+            keep = timestamps > last
+            timestamps, index = timestamps[keep], index[keep]
+        if not len(index):
+            return 0
+
+        directory = self.path(symbol, interval)
+        directory.mkdir(parents=True, exist_ok=True)
+        n = self.length(symbol, interval)
+        for column in COLUMNS:
+            values = timestamps if column == "timestamp" else np.asarray(columns[column], dtype=DTYPE)[index]
+            with (directory / f"{column}.f64").open("r+b" if n else "wb") as handle:
+                handle.seek(n * DTYPE.itemsize)
+                handle.truncate()
+                handle.write(values.tobytes())
+        return len(index)
+
+    def read(
+        self,
+        symbol: str,
+        interval: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> Columns:
+        n = self.length(symbol, interval)
+        if not n:
+            return {column: np.empty(0, dtype=DTYPE) for column in COLUMNS}
+        lo, hi = self._bounds(symbol, interval, n, start, end)
+        return {column: self._column(symbol, interval, column, n)[lo:hi] for column in COLUMNS}
+
+    def tail(self, symbol: str, interval: str, count: int, end: Optional[float] = None) -> Columns:
+        n = self.length(symbol, interval)
+        if not n:
+            return {column: np.empty(0, dtype=DTYPE) for column in COLUMNS}
+        _, hi = self._bounds(symbol, interval, n, None, end)
+        lo = max(0, hi - count)
+        return {column: self._column(symbol, interval, column, n)[lo:hi] for column in COLUMNS}
+
+    def iter_closes(
+        self,
+        symbol: str,
+        interval: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        chunksize: int = 250_000,
+    ) -> Iterator[Tuple[float, str, float]]:
+        columns = self.read(symbol, interval, start, end)
+        timestamps, closes = columns["timestamp"], columns["close"]
+        for offset in range(0, len(timestamps), chunksize):
+            chunk = slice(offset, offset + chunksize)
+            for timestamp, close in zip(timestamps[chunk].tolist(), closes[chunk].tolist()):
+                yield timestamp, symbol, close
+
+    def _bounds(
+        self, symbol: str, interval: str, n: int, start: Optional[float], end: Optional[float]
+    ) -> Tuple[int, int]:
+        timestamps = self._column(symbol, interval, "timestamp", n)
+        lo = 0 if start is None else int(np.searchsorted(timestamps, start, side="left"))
+        hi = n if end is None else int(np.searchsorted(timestamps, end, side="left"))
+        return lo, max(lo, hi)
+
+    def _column(self, symbol: str, interval: str, column: str, n: int) -> np.ndarray:
+        return np.memmap(self.path(symbol, interval) / f"{column}.f64", dtype=DTYPE, mode="r", shape=(n,))
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter
+from typing import Any, Dict, Iterator, List, Optional
+
+from core.config import MetricsConfig
+
+logger = logging.getLogger(__name__)
+
+BUCKET_BOUNDS: List[float] = [1e-6 * 2 ** (i / 4) for i in range(112)]
+QUANTILES = (0.5, 0.99)
+COUNTERS = ("loops", "overruns", "ticks", "orders")
+
+
+class LatencyHistogram:
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(BUCKET_BOUNDS[index], self.max) if index < len(BUCKET_BOUNDS) else self.max
+        return self.max
+
+
+class EngineMetrics:
+    def __init__(self, poll_interval_seconds: float = 0.0) -> None:
+        self.poll_interval_seconds = poll_interval_seconds
+        self.stages: Dict[str, LatencyHistogram] = {}
+        self.counters: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = LatencyHistogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, perf_counter() - started)
+
+    def increment(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def loop_finished(self, busy_seconds: float) -> None:
+        self.observe("loop", busy_seconds)
+        self.increment("loops")
+        if self.poll_interval_seconds and busy_seconds > self.poll_interval_seconds:
+            self.increment("overruns")
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            stages = {
+                name: {
+                    "count": histogram.count,
+                    "sum": histogram.total,
+                    "max": histogram.max,
+                    **{f"p{int(q * 100)}": histogram.quantile(q) for q in QUANTILES},
+                }
+                for name, histogram in self.stages.items()
+            }
+            counters = dict(self.counters)
+        return {"poll_interval_seconds": self.poll_interval_seconds, "stages": stages, "counters": counters}
+
+    def render_prometheus(self) -> str:
+        snapshot = self.snapshot()
+        lines = [
+            "# HELP engine_stage_seconds Time spent in each engine stage.",
+            "# TYPE engine_stage_seconds summary",
+        ]
+        for name, stage in sorted(snapshot["stages"].items()):
+            for q in QUANTILES:
+                lines.append(f'engine_stage_seconds{{stage="{name}",quantile="{q}"}} {stage[f"p{int(q * 100)}"]:.9f}')
+            lines.append(f'engine_stage_seconds_sum{{stage="{name}"}} {stage["sum"]:.9f}')
+            lines.append(f'engine_stage_seconds_count{{stage="{name}"}} {stage["count"]}')
+        for name, value in snapshot["counters"].items():
+            lines.append(f"# TYPE engine_{name}_total counter")
+            lines.append(f"engine_{name}_total {value}")
+        lines.append("# TYPE engine_poll_interval_seconds gauge")
+        lines.append(f"engine_poll_interval_seconds {snapshot['poll_interval_seconds']}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    def __init__(self, metrics: EngineMetrics, host: str = "127.0.0.1", port: int = 9108) -> None:
+        self.metrics = metrics
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics", daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def _handler(self) -> type:
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path == "/metrics":
+                    body = metrics.render_prometheus().encode()
+                    content_type = "text/plain; version=0.0.4; charset=utf-8"
+                elif self.path == "/metrics.json":
+                    body = json.dumps(metrics.snapshot()).encode()
+                    content_type = "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+    def start(self) -> None:
+        self._thread.start()
+        logger.info("Metrics endpoint on port %d", self.port)
+
+    def stop(self) -> None:
+        if self._thread.is_alive():
+            self._server.shutdown()
+        self._server.server_close()
+
+
+def build_metrics_server(config: MetricsConfig, metrics: EngineMetrics) -> Optional[MetricsServer]:
+    if not config.enabled:
+        return None
+    try:
+        return MetricsServer(metrics, config.host, config.port)
+    except OSError as exc:
+        logger.warning("Metrics endpoint disabled, cannot bind %s:%d: %s", config.host, config.port, exc)
+        return None
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.clock import Clock
+from core.config import AppConfig, RetentionConfig
+from core.storage import PNL_EVENT_TYPES, ROLLUP_RESOLUTIONS, Storage, StorageProfile, connect
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_DAY_COLUMN = {"events": "timestamp", "equity_curve": "timestamp"}
+PRUNE_KEEP = {"events": ("event_type", PNL_EVENT_TYPES)}
+
+
+@dataclass
+class EventSpan:
+    id: int
+    repeat_count: int
+    last_timestamp: str
+
+
+@dataclass
+class RetentionStats:
+    archived: Dict[str, int] = field(default_factory=dict)
+    deleted: Dict[str, int] = field(default_factory=dict)
+    merged_events: int = 0
+
+    def count(self, counter: Dict[str, int], table: str, rows: int) -> None:
+        if rows:
+            counter[table] = counter.get(table, 0) + rows
+
+
+def archive_rows(archive_dir: Path, table: str, columns: List[str], rows: List[Tuple[Any, ...]]) -> None:
+    day_index = columns.index(ARCHIVE_DAY_COLUMN[table])
+    days: Dict[str, List[str]] = {}
+    for row in rows:
+        days.setdefault(str(row[day_index])[:10], []).append(json.dumps(dict(zip(columns, row))))
+    directory = archive_dir / table
+    directory.mkdir(parents=True, exist_ok=True)
+    for day, lines in days.items():
+        with gzip.open(directory / f"{day}.jsonl.gz", "at", encoding="utf-8") as handle:
+            handle.write("\n".join(lines) + "\n")
+
+
+def _within(earlier: str, later: str, span: timedelta) -> bool:
+    return datetime.fromisoformat(later) - datetime.fromisoformat(earlier) <= span
+
+
+class Retention:
+    def __init__(self, conn: sqlite3.Connection, config: RetentionConfig, clock: Optional[Clock] = None) -> None:
+        self.conn = conn
+        self.config = config
+        self.clock = clock or Clock()
+        self.archive_dir = Path(config.archive_dir) if config.archive_dir else None
+        self._spans: Dict[Tuple[str, str, str, str], EventSpan] = {}
+
+    def cutoff(self, seconds: float) -> str:
+        return (self.clock.now() - timedelta(seconds=seconds)).isoformat()
+
+    def run_once(self, stop: Optional[threading.Event] = None) -> RetentionStats:
+        stats = RetentionStats()
+        stop = stop or threading.Event()
+        settings = self.config
+        tasks = [
+            lambda: self.dedup_events(self.cutoff(settings.event_dedup_after_seconds), stats),
+            lambda: self.prune("events", self.cutoff(settings.events_days * 86400), stats),
+            lambda: self.prune("equity_curve", self.cutoff(settings.equity_raw_days * 86400), stats),
+            lambda: self.prune_rollup("minute", self.cutoff(settings.equity_minute_days * 86400), stats),
+        ]
+        for task in tasks:
+            while task():
+                if stop.wait(settings.pause_ms / 1000):
+                    return stats
+        return stats
+
+    def dedup_events(self, cutoff: str, stats: RetentionStats) -> bool:
+        rows = self.conn.execute(
+            """
+            SELECT id, timestamp, level, event_type, message, metadata, repeat_count, last_timestamp FROM events
+            WHERE id > ? AND timestamp < ? ORDER BY id LIMIT ?
+            """,
+            (self._progress("dedup_events"), cutoff, self.config.batch_rows),
+        ).fetchall()
+        if not rows:
+            return False
+        span = timedelta(seconds=self.config.event_span_seconds)
+        merged: List[int] = []
+        heads: Dict[int, EventSpan] = {}
+        for event_id, timestamp, level, event_type, message, metadata, repeat_count, last_timestamp in rows:
+            key = (level, event_type, message, metadata or "")
+            head = self._spans.get(key)
+            if head is not None and _within(head.last_timestamp, timestamp, span):
+                head.repeat_count += repeat_count
+                head.last_timestamp = last_timestamp or timestamp
+                heads[head.id] = head
+                merged.append(event_id)
+            else:
+                self._spans[key] = EventSpan(event_id, repeat_count, last_timestamp or timestamp)
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE events SET repeat_count = ?, last_timestamp = ? WHERE id = ?",
+                [(head.repeat_count, head.last_timestamp, head.id) for head in heads.values()],
+            )
+            self.conn.executemany("DELETE FROM events WHERE id = ?", [(event_id,) for event_id in merged])
+            self._set_progress("dedup_events", rows[-1][0])
+        stats.merged_events += len(merged)
+        latest = rows[-1][1]
+        self._spans = {key: head for key, head in self._spans.items() if _within(head.last_timestamp, latest, span)}
+        return len(rows) == self.config.batch_rows
+
+    def prune(self, table: str, cutoff: str, stats: RetentionStats) -> bool:
+        keep, params = "", ()
+        if table in PRUNE_KEEP:
+            column, values = PRUNE_KEEP[table]
+            keep, params = f" AND {column} NOT IN ({', '.join('?' for _ in values)})", tuple(values)
+        cursor = self.conn.execute(
+            f"SELECT * FROM {table} WHERE id <= (SELECT MAX(id) FROM {table} WHERE timestamp < ?){keep} "
+            "ORDER BY id LIMIT ?",
+            (cutoff, *params, self.config.batch_rows),
+        )
+        rows = cursor.fetchall()
+        if not rows:
+            return False
+        if self.archive_dir is not None:
+            archive_rows(self.archive_dir, table, [column[0] for column in cursor.description], rows)
+            stats.count(stats.archived, table, len(rows))
+        with self.conn:
+            self.conn.execute(
+                f"DELETE FROM {table} WHERE id BETWEEN ? AND ?{keep}", (rows[0][0], rows[-1][0], *params)
+            )
+        stats.count(stats.deleted, table, len(rows))
+        return len(rows) == self.config.batch_rows
+
+    def prune_rollup(self, resolution: str, cutoff: str, stats: RetentionStats) -> bool:
+        with self.conn:
+            deleted = self.conn.execute(
+                """
+                DELETE FROM equity_rollup WHERE resolution = ? AND bucket IN (
+                    SELECT bucket FROM equity_rollup WHERE resolution = ? AND bucket < ? ORDER BY bucket LIMIT ?
+                )
+                """,
+                (resolution, resolution, cutoff[: ROLLUP_RESOLUTIONS[resolution]], self.config.batch_rows),
+            ).rowcount
+        stats.count(stats.deleted, f"equity_rollup_{resolution}", deleted)
+        return deleted == self.config.batch_rows
+
+    def _progress(self, task: str) -> int:
+        row = self.conn.execute("SELECT last_id FROM retention_state WHERE task = ?", (task,)).fetchone()
+        return row[0] if row else 0
+
+    def _set_progress(self, task: str, last_id: int) -> None:
+        self.conn.execute(
+            "INSERT INTO retention_state (task, last_id) VALUES (?, ?) "
+            "ON CONFLICT(task) DO UPDATE SET last_id = excluded.last_id",
+            (task, last_id),
+        )
+
+
+class RetentionWorker:
+    def __init__(
+        self, path: Path, profile: StorageProfile, config: RetentionConfig, clock: Optional[Clock] = None
+    ) -> None:
+        self.path = path
+        self.profile = profile
+        self.config = config
+        self.clock = clock or Clock()
+        self.runs = 0
+        self.errors = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="retention", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _run(self) -> None:
+        conn = connect(self.path, self.profile)
+        retention = Retention(conn, self.config, self.clock)
+        try:
+            while not self._stop.is_set():
+                try:
+                    stats = retention.run_once(self._stop)
+                except (sqlite3.Error, OSError):
+                    self.errors += 1
+                    logger.exception("Retention pass failed")
+                else:
+                    self.runs += 1
+                    if stats.deleted or stats.merged_events:
+                        logger.info(
+                            "Retention pass: deleted %s, archived %s, merged %d events",
+                            stats.deleted,
+                            stats.archived,
+                            stats.merged_events,
+                        )
+                self._stop.wait(self.config.interval_seconds)
+        finally:
+            conn.close()
+
+
+def build_retention_worker(config: AppConfig, storage: Storage) -> Optional[RetentionWorker]:
+    if not config.retention.enabled:
+        return None
+    return RetentionWorker(storage.path, storage.profile, config.retention)
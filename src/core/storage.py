@@ -1,10 +1,29 @@
 from __future__ import annotations
 
+import logging
+import math
+import queue
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from dataclasses import asdict, dataclass
-from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from core.clock import Clock
+from core.codec import decode_metadata, encode_metadata
+from core.config import DEFAULT_EVENT_POLICIES, EventsConfig, StorageConfig
+from core.metrics import EngineMetrics
+
+Statement = Tuple[str, Any, bool]
+MigrationStep = Union[str, Callable[[sqlite3.Connection], None]]
+
+EVENT_SYMBOL_EXPR = "(CASE WHEN json_valid(metadata) THEN json_extract(metadata, '$.symbol') END)"
+ROLLUP_RESOLUTIONS = {"minute": 16, "hour": 13}
+PNL_EVENT_TYPES = ("TRADE", "KILL_SWITCH_CLOSE")
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -14,6 +33,8 @@ class EventRecord:
     event_type: str
     message: str
     metadata: Dict[str, Any]
+    repeat_count: int = 1
+    last_timestamp: Optional[str] = None
 
 
 @dataclass
@@ -44,6 +65,33 @@ class TradeRecord:
     metadata: Dict[str, Any]
 
 
+@dataclass
+class SweepResultRecord:
+    run_id: str
+    timestamp: str
+    symbol: str
+    strategy: str
+    fast_period: int
+    slow_period: int
+    trades: int
+    pnl: float
+    sharpe: float
+    max_drawdown: float
+
+
+@dataclass
+class BarRecord:
+    symbol: str
+    interval: int
+    start: float
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float = 0.0
+    ticks: int = 1
+
+
 @dataclass
 class EquityRecord:
     timestamp: str
@@ -52,13 +100,371 @@ class EquityRecord:
     unrealized_pnl: float
 
 
+@dataclass
+class StorageProfile:
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    mmap_size_mb: int = 256
+    cache_size_mb: int = 64
+    busy_timeout_ms: int = 5000
+
+    def apply(self, conn: sqlite3.Connection) -> None:
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        conn.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+        conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size_mb) * 1024 * 1024}")
+        conn.execute(f"PRAGMA cache_size = {-int(self.cache_size_mb) * 1024}")
+
+
+def connect(path: Path, profile: StorageProfile) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    profile.apply(conn)
+    return conn
+
+
+def connect_readonly(path: Path, profile: StorageProfile) -> sqlite3.Connection:
+    conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+    conn.execute(f"PRAGMA busy_timeout = {int(profile.busy_timeout_ms)}")
+    conn.execute(f"PRAGMA mmap_size = {int(profile.mmap_size_mb) * 1024 * 1024}")
+    conn.execute(f"PRAGMA cache_size = {-int(profile.cache_size_mb) * 1024}")
+    conn.execute("PRAGMA query_only = ON")
+    return conn
+
+
+def convert_legacy_metadata(conn: sqlite3.Connection, batch_size: int = 1000) -> None:
+    for table in ("events", "orders", "trades"):
+        last_id = 0
+        while True:
+            rows = conn.execute(
+                f"SELECT id, metadata FROM {table} WHERE id > ? AND NOT json_valid(metadata) ORDER BY id LIMIT ?",
+                (last_id, batch_size),
+            ).fetchall()
+            if not rows:
+                break
+            conn.executemany(
+                f"UPDATE {table} SET metadata = ? WHERE id = ?",
+                [(encode_metadata(decode_metadata(row[1])), row[0]) for row in rows],
+            )
+            last_id = rows[-1][0]
+
+
+def query_events(
+    conn: sqlite3.Connection,
+    event_type: Optional[str] = None,
+    level: Optional[str] = None,
+    symbol: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+    limit: int = 50,
+) -> sqlite3.Cursor:
+    clauses: List[str] = []
+    params: List[Any] = []
+    if event_type:
+        clauses.append("event_type = ?")
+        params.append(event_type)
+    if level:
+        clauses.append("level = ?")
+        params.append(level)
+    if symbol:
+        clauses.append(f"{EVENT_SYMBOL_EXPR} = ?")
+        params.append(symbol)
+    for key, value in (metadata or {}).items():
+        clauses.append("(CASE WHEN json_valid(metadata) THEN json_extract(metadata, ?) END) = ?")
+        params.extend([f"$.{key}", value])
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    return conn.execute(
+        "SELECT id, timestamp, level, event_type, message, metadata, repeat_count, last_timestamp FROM events "
+        f"{where} ORDER BY id DESC LIMIT ?",
+        (*params, limit),
+    )
+
+
+def backfill_equity_rollup(conn: sqlite3.Connection) -> None:
+    for resolution, width in ROLLUP_RESOLUTIONS.items():
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO equity_rollup (resolution, bucket, min, max, last, realized_pnl, unrealized_pnl, samples)
+            SELECT ?, g.bucket, g.lo, g.hi, e.equity, e.realized_pnl, e.unrealized_pnl, g.n
+            FROM (
+                SELECT substr(timestamp, 1, ?) AS bucket, MIN(equity) AS lo, MAX(equity) AS hi, COUNT(*) AS n,
+                       MAX(id) AS last_id
+                FROM equity_curve GROUP BY bucket
+            ) AS g
+            JOIN equity_curve AS e ON e.id = g.last_id
+            """,
+            (resolution, width),
+        )
+
+
+MIGRATIONS: List[Tuple[int, List[MigrationStep]]] = [
+    (
+        1,
+        [
+            "CREATE INDEX IF NOT EXISTS idx_events_timestamp ON events (timestamp)",
+            "CREATE INDEX IF NOT EXISTS idx_events_event_type ON events (event_type, id)",
+            "CREATE INDEX IF NOT EXISTS idx_orders_order_id ON orders (order_id)",
+            "CREATE INDEX IF NOT EXISTS idx_orders_symbol_timestamp ON orders (symbol, timestamp)",
+            "CREATE INDEX IF NOT EXISTS idx_trades_order_id ON trades (order_id)",
+            "CREATE INDEX IF NOT EXISTS idx_trades_symbol_timestamp ON trades (symbol, timestamp)",
+            "CREATE INDEX IF NOT EXISTS idx_equity_curve_timestamp ON equity_curve (timestamp)",
+            "CREATE INDEX IF NOT EXISTS idx_positions_symbol ON positions (symbol)",
+        ],
+    ),
+    (
+        2,
+        [
+            convert_legacy_metadata,
+            f"CREATE INDEX IF NOT EXISTS idx_events_symbol ON events ({EVENT_SYMBOL_EXPR}, id)",
+        ],
+    ),
+    (
+        3,
+        [
+            """
+            CREATE TABLE IF NOT EXISTS sweep_results (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id TEXT,
+                timestamp TEXT,
+                symbol TEXT,
+                strategy TEXT,
+                fast_period INTEGER,
+                slow_period INTEGER,
+                trades INTEGER,
+                pnl REAL,
+                sharpe REAL,
+                max_drawdown REAL
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_sweep_results_run ON sweep_results (run_id, sharpe)",
+        ],
+    ),
+    (
+        4,
+        [
+            """
+            CREATE TABLE IF NOT EXISTS bars (
+                symbol TEXT NOT NULL,
+                interval INTEGER NOT NULL,
+                start REAL NOT NULL,
+                open REAL,
+                high REAL,
+                low REAL,
+                close REAL,
+                volume REAL,
+                ticks INTEGER,
+                PRIMARY KEY (symbol, interval, start)
+            ) WITHOUT ROWID
+            """,
+        ],
+    ),
+    (
+        5,
+        [
+            """
+            CREATE TABLE IF NOT EXISTS equity_rollup (
+                resolution TEXT NOT NULL,
+                bucket TEXT NOT NULL,
+                min REAL,
+                max REAL,
+                last REAL,
+                realized_pnl REAL,
+                unrealized_pnl REAL,
+                samples INTEGER,
+                PRIMARY KEY (resolution, bucket)
+            ) WITHOUT ROWID
+            """,
+            backfill_equity_rollup,
+        ],
+    ),
+    (
+        6,
+        [
+            "ALTER TABLE events ADD COLUMN repeat_count INTEGER NOT NULL DEFAULT 1",
+            "ALTER TABLE events ADD COLUMN last_timestamp TEXT",
+            "CREATE TABLE IF NOT EXISTS retention_state (task TEXT PRIMARY KEY, last_id INTEGER NOT NULL)",
+        ],
+    ),
+]
+
+
+def apply_statements(conn: sqlite3.Connection, statements: Sequence[Statement]) -> None:
+    for sql, params, many in statements:
+        if many:
+            conn.executemany(sql, params)
+        else:
+            conn.execute(sql, params)
+
+
+class StorageWriter:
+    _STOP = object()
+
+    def __init__(self, path: Path, profile: StorageProfile, flush_interval: float, max_batch: int) -> None:
+        self.path = path
+        self.profile = profile
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.errors = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="storage-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, statements: List[Statement]) -> None:
+        self._queue.put(statements)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def stop(self) -> None:
+        self._queue.put(self._STOP)
+        self._thread.join()
+
+    def _run(self) -> None:
+        conn = connect(self.path, self.profile)
+        try:
+            stopping = False
+            while not stopping:
+                pending: List[Statement] = []
+                waiters: List[threading.Event] = []
+                item = self._queue.get()
+                deadline = time.monotonic() + self.flush_interval
+                while True:
+                    if item is self._STOP:
+                        stopping = True
+                        break
+                    if isinstance(item, threading.Event):
+                        waiters.append(item)
+                        break
+                    pending.extend(item)
+                    remaining = deadline - time.monotonic()
+                    if len(pending) >= self.max_batch or remaining <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                self._commit(conn, pending)
+                for waiter in waiters:
+                    waiter.set()
+        finally:
+            conn.close()
+
+    def _commit(self, conn: sqlite3.Connection, statements: List[Statement]) -> None:
+        if not statements:
+            return
+        try:
+            with conn:
+                apply_statements(conn, statements)
+        except sqlite3.Error:
+            self.errors += 1
+            logger.exception("Write-behind batch of %d statements failed", len(statements))
+
+
+@dataclass
+class EventSpan:
+    closes_at: float
+    record: Optional[EventRecord] = None
+
+
+class EventCoalescer:
+    def __init__(self, config: EventsConfig, clock: Optional[Clock] = None) -> None:
+        self.window_seconds = config.window_seconds
+        self.policies = {**DEFAULT_EVENT_POLICIES, **config.policies}
+        self.clock = clock or Clock()
+        self.suppressed = 0
+        self._spans: Dict[Tuple[str, str, str, Any], EventSpan] = {}
+        self._closed: List[EventRecord] = []
+        self._next_close = math.inf
+        self._lock = threading.Lock()
+
+    def admit(self, record: EventRecord) -> bool:
+        window = self.policies.get(record.event_type, self.window_seconds)
+        if window <= 0:
+            return True
+        key = (record.level, record.event_type, record.message, record.metadata.get("symbol"))
+        now = self.clock.now().timestamp()
+        with self._lock:
+            span = self._spans.get(key)
+            if span is None or now >= span.closes_at:
+                if span is not None and span.record is not None:
+                    self._closed.append(span.record)
+                self._spans[key] = EventSpan(now + window)
+                self._next_close = min(self._next_close, now + window)
+                return True
+            if span.record is None:
+                span.record = record
+            else:
+                span.record.repeat_count += 1
+                span.record.last_timestamp = record.timestamp
+            self.suppressed += 1
+            return False
+
+    def due(self, flush: bool = False) -> List[EventRecord]:
+        now = math.inf if flush else self.clock.now().timestamp()
+        if now < self._next_close and not self._closed:
+            return []
+        with self._lock:
+            closed, self._closed = self._closed, []
+            for key, span in list(self._spans.items()):
+                if span.closes_at <= now:
+                    del self._spans[key]
+                    if span.record is not None:
+                        closed.append(span.record)
+            self._next_close = min((span.closes_at for span in self._spans.values()), default=math.inf)
+        return sorted(closed, key=lambda record: record.timestamp)
+
+
+def build_event_coalescer(config: EventsConfig, clock: Optional[Clock] = None) -> Optional[EventCoalescer]:
+    if config.window_seconds <= 0 and all(window <= 0 for window in config.policies.values()):
+        return None
+    return EventCoalescer(config, clock)
+
+
 class Storage:
-    def __init__(self, path: str) -> None:
+    def __init__(
+        self,
+        path: str,
+        write_behind: bool = False,
+        flush_interval: float = 0.2,
+        flush_max_batch: int = 500,
+        profile: Optional[StorageProfile] = None,
+        clock: Optional[Clock] = None,
+        events: Optional[EventsConfig] = None,
+    ) -> None:
         self.path = Path(path)
+        self.clock = clock or Clock()
+        self.events = build_event_coalescer(events, self.clock) if events else None
+        self.metrics: Optional[EngineMetrics] = None
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(self.path)
+        self.profile = profile or StorageProfile()
+        self.conn = connect(self.path, self.profile)
         self.conn.row_factory = sqlite3.Row
         self._init_schema()
+        self._migrate()
+        self._batch: Optional[List[Statement]] = None
+        self._writer: Optional[StorageWriter] = None
+        if write_behind:
+            self._writer = StorageWriter(self.path, self.profile, flush_interval, flush_max_batch)
+
+    @classmethod
+    def from_config(
+        cls, config: StorageConfig, clock: Optional[Clock] = None, events: Optional[EventsConfig] = None
+    ) -> "Storage":
+        return cls(
+            config.path,
+            clock=clock,
+            events=events,
+            write_behind=config.write_behind,
+            flush_interval=config.flush_interval_ms / 1000,
+            flush_max_batch=config.flush_max_batch,
+            profile=StorageProfile(
+                journal_mode=config.journal_mode,
+                synchronous=config.synchronous,
+                mmap_size_mb=config.mmap_size_mb,
+                cache_size_mb=config.cache_size_mb,
+                busy_timeout_ms=config.busy_timeout_ms,
+            ),
+        )
 
     def _init_schema(self) -> None:
         cursor = self.conn.cursor()
@@ -142,82 +548,212 @@ class Storage:
             )
             """
         )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                applied_at TEXT
+            )
+            """
+        )
         self.conn.commit()
 
-    @staticmethod
-    def _utc_now() -> str:
-        return datetime.now(timezone.utc).isoformat()
+    def schema_version(self) -> int:
+        row = self.conn.execute("SELECT MAX(version) AS version FROM schema_version").fetchone()
+        return row["version"] or 0
+
+    def _migrate(self) -> None:
+        current = self.schema_version()
+        for version, steps in MIGRATIONS:
+            if version <= current:
+                continue
+            with self.conn:
+                for step in steps:
+                    if callable(step):
+                        step(self.conn)
+                    else:
+                        self.conn.execute(step)
+                self.conn.execute(
+                    "INSERT INTO schema_version (version, applied_at) VALUES (?, ?)",
+                    (version, self._utc_now()),
+                )
+
+    def _utc_now(self) -> str:
+        return self.clock.now().isoformat()
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        if self._batch is not None:
+            yield
+            return
+        self._batch = []
+        try:
+            yield
+        finally:
+            statements, self._batch = self._batch, None
+            if statements:
+                self._submit(statements)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        if self._writer is None:
+            return True
+        return self._writer.flush(timeout)
+
+    def _write(self, *statements: Statement) -> None:
+        if self._batch is not None:
+            self._batch.extend(statements)
+            return
+        self._submit(list(statements))
+
+    def _submit(self, statements: List[Statement]) -> None:
+        if self._writer is not None:
+            self._writer.put(statements)
+            return
+        started = time.perf_counter()
+        with self.conn:
+            apply_statements(self.conn, statements)
+        if self.metrics is not None:
+            self.metrics.observe("commit", time.perf_counter() - started)
 
-    def record_event(self, level: str, event_type: str, message: str, metadata: Dict[str, Any]) -> None:
+    def record_event(self, level: str, event_type: str, message: str, metadata: Dict[str, Any]) -> bool:
         record = EventRecord(self._utc_now(), level, event_type, message, metadata)
-        self.conn.execute(
-            "INSERT INTO events (timestamp, level, event_type, message, metadata) VALUES (?, ?, ?, ?, ?)",
+        if self.events is None:
+            self.record_events([record])
+            return True
+        admitted = self.events.admit(record)
+        self.flush_events()
+        if admitted:
+            self.record_events([record])
+        return admitted
+
+    def record_events(self, records: Iterable[EventRecord]) -> None:
+        self._write(
             (
-                record.timestamp,
-                record.level,
-                record.event_type,
-                record.message,
-                str(record.metadata),
-            ),
+                """
+                INSERT INTO events (timestamp, level, event_type, message, metadata, repeat_count, last_timestamp)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        record.timestamp,
+                        record.level,
+                        record.event_type,
+                        record.message,
+                        encode_metadata(record.metadata),
+                        record.repeat_count,
+                        record.last_timestamp,
+                    )
+                    for record in records
+                ],
+                True,
+            )
         )
-        self.conn.commit()
+
+    def flush_events(self, force: bool = False) -> None:
+        if self.events is not None:
+            records = self.events.due(force)
+            if records:
+                self.record_events(records)
 
     def record_order(self, record: OrderRecord) -> None:
-        self.conn.execute(
-            """
-            INSERT INTO orders (timestamp, order_id, symbol, side, status, price, quantity, filled_qty, mode, metadata)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+        self._write(
             (
-                record.timestamp,
-                record.order_id,
-                record.symbol,
-                record.side,
-                record.status,
-                record.price,
-                record.quantity,
-                record.filled_qty,
-                record.mode,
-                str(record.metadata),
-            ),
+                """
+                INSERT INTO orders (timestamp, order_id, symbol, side, status, price, quantity, filled_qty, mode, metadata)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    record.timestamp,
+                    record.order_id,
+                    record.symbol,
+                    record.side,
+                    record.status,
+                    record.price,
+                    record.quantity,
+                    record.filled_qty,
+                    record.mode,
+                    encode_metadata(record.metadata),
+                ),
+                False,
+            )
         )
-        self.conn.commit()
 
     def record_trade(self, record: TradeRecord) -> None:
-        self.conn.execute(
-            """
-            INSERT INTO trades (timestamp, trade_id, order_id, symbol, side, price, quantity, pnl, mode, metadata)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+        self._write(
             (
-                record.timestamp,
-                record.trade_id,
-                record.order_id,
-                record.symbol,
-                record.side,
-                record.price,
-                record.quantity,
-                record.pnl,
-                record.mode,
-                str(record.metadata),
-            ),
+                """
+                INSERT INTO trades (timestamp, trade_id, order_id, symbol, side, price, quantity, pnl, mode, metadata)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    record.timestamp,
+                    record.trade_id,
+                    record.order_id,
+                    record.symbol,
+                    record.side,
+                    record.price,
+                    record.quantity,
+                    record.pnl,
+                    record.mode,
+                    encode_metadata(record.metadata),
+                ),
+                False,
+            )
         )
-        self.conn.commit()
 
     def record_equity(self, record: EquityRecord) -> None:
-        self.conn.execute(
-            "INSERT INTO equity_curve (timestamp, equity, realized_pnl, unrealized_pnl) VALUES (?, ?, ?, ?)",
-            (record.timestamp, record.equity, record.realized_pnl, record.unrealized_pnl),
+        self._write(
+            (
+                "INSERT INTO equity_curve (timestamp, equity, realized_pnl, unrealized_pnl) VALUES (?, ?, ?, ?)",
+                (record.timestamp, record.equity, record.realized_pnl, record.unrealized_pnl),
+                False,
+            ),
+            (
+                """
+                INSERT INTO equity_rollup (resolution, bucket, min, max, last, realized_pnl, unrealized_pnl, samples)
+                VALUES (?, ?, ?, ?, ?, ?, ?, 1)
+                ON CONFLICT (resolution, bucket) DO UPDATE SET
+                    min = MIN(min, excluded.min),
+                    max = MAX(max, excluded.max),
+                    last = excluded.last,
+                    realized_pnl = excluded.realized_pnl,
+                    unrealized_pnl = excluded.unrealized_pnl,
+                    samples = samples + 1
+                """,
+                [
+                    (
+                        resolution,
+                        record.timestamp[:width],
+                        record.equity,
+                        record.equity,
+                        record.equity,
+                        record.realized_pnl,
+                        record.unrealized_pnl,
+                    )
+                    for resolution, width in ROLLUP_RESOLUTIONS.items()
+                ],
+                True,
+            ),
         )
-        self.conn.commit()
 
     def fetch_recent_events(self, limit: int = 50) -> List[sqlite3.Row]:
         cursor = self.conn.execute(
-            "SELECT timestamp, level, event_type, message, metadata FROM events ORDER BY id DESC LIMIT ?",
+            "SELECT timestamp, level, event_type, message, metadata, repeat_count, last_timestamp FROM events "
+            "ORDER BY id DESC LIMIT ?",
             (limit,),
         )
         return cursor.fetchall()
 
+    def fetch_events(
+        self,
+        event_type: Optional[str] = None,
+        level: Optional[str] = None,
+        symbol: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        limit: int = 50,
+    ) -> List[sqlite3.Row]:
+        return query_events(self.conn, event_type, level, symbol, metadata, limit).fetchall()
+
     def fetch_latest_equity(self) -> Optional[sqlite3.Row]:
         cursor = self.conn.execute(
             "SELECT timestamp, equity, realized_pnl, unrealized_pnl FROM equity_curve ORDER BY id DESC LIMIT 1"
@@ -225,27 +761,119 @@ class Storage:
         return cursor.fetchone()
 
     def replace_positions(self, timestamp: str, positions: Iterable[Dict[str, Any]]) -> None:
-        self.conn.execute("DELETE FROM positions")
-        self.conn.executemany(
+        self._write(
+            ("DELETE FROM positions", (), False),
+            (
+                """
+                INSERT INTO positions (timestamp, symbol, side, entry_price, quantity, leverage, mark_price, unrealized_pnl)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        timestamp,
+                        position["symbol"],
+                        position["side"],
+                        position["entry_price"],
+                        position["quantity"],
+                        position["leverage"],
+                        position["mark_price"],
+                        position["unrealized_pnl"],
+                    )
+                    for position in positions
+                ],
+                True,
+            ),
+        )
+
+    def record_sweep_results(self, records: Iterable[SweepResultRecord]) -> None:
+        self._write(
+            (
+                """
+                INSERT INTO sweep_results (
+                    run_id, timestamp, symbol, strategy, fast_period, slow_period, trades, pnl, sharpe, max_drawdown
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        record.run_id,
+                        record.timestamp,
+                        record.symbol,
+                        record.strategy,
+                        record.fast_period,
+                        record.slow_period,
+                        record.trades,
+                        record.pnl,
+                        record.sharpe,
+                        record.max_drawdown,
+                    )
+                    for record in records
+                ],
+                True,
+            )
+        )
+
+    def fetch_sweep_results(self, run_id: str, limit: int = 20) -> List[sqlite3.Row]:
+        cursor = self.conn.execute(
             """
-            INSERT INTO positions (timestamp, symbol, side, entry_price, quantity, leverage, mark_price, unrealized_pnl)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            SELECT symbol, strategy, fast_period, slow_period, trades, pnl, sharpe, max_drawdown
+            FROM sweep_results WHERE run_id = ? ORDER BY sharpe DESC LIMIT ?
             """,
-            [
-                (
-                    timestamp,
-                    position["symbol"],
-                    position["side"],
-                    position["entry_price"],
-                    position["quantity"],
-                    position["leverage"],
-                    position["mark_price"],
-                    position["unrealized_pnl"],
-                )
-                for position in positions
-            ],
+            (run_id, limit),
         )
-        self.conn.commit()
+        return cursor.fetchall()
+
+    def record_bars(self, records: Iterable[BarRecord]) -> None:
+        self._write(
+            (
+                """
+                INSERT OR REPLACE INTO bars (symbol, interval, start, open, high, low, close, volume, ticks)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        record.symbol,
+                        record.interval,
+                        record.start,
+                        record.open,
+                        record.high,
+                        record.low,
+                        record.close,
+                        record.volume,
+                        record.ticks,
+                    )
+                    for record in records
+                ],
+                True,
+            )
+        )
+
+    def fetch_bars(
+        self,
+        symbol: str,
+        interval: int,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[BarRecord]:
+        clauses = ["symbol = ?", "interval = ?"]
+        params: List[Any] = [symbol, interval]
+        if start is not None:
+            clauses.append("start >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("start < ?")
+            params.append(end)
+        query = (
+            "SELECT symbol, interval, start, open, high, low, close, volume, ticks FROM bars "
+            f"WHERE {' AND '.join(clauses)}"
+        )
+        if limit is not None:
+            query = f"SELECT * FROM ({query} ORDER BY start DESC LIMIT ?) ORDER BY start"
+            params.append(limit)
+        else:
+            query += " ORDER BY start"
+        return [BarRecord(*row) for row in self.conn.execute(query, params)]
 
     def fetch_positions(self) -> List[sqlite3.Row]:
         cursor = self.conn.execute(
@@ -254,19 +882,26 @@ class Storage:
         return cursor.fetchall()
 
     def record_heartbeat(self, timestamp: str) -> None:
-        self.conn.execute(
-            """
-            INSERT INTO engine_status (id, timestamp)
-            VALUES (1, ?)
-            ON CONFLICT(id) DO UPDATE SET timestamp=excluded.timestamp
-            """,
-            (timestamp,),
+        self.flush_events()
+        self._write(
+            (
+                """
+                INSERT INTO engine_status (id, timestamp)
+                VALUES (1, ?)
+                ON CONFLICT(id) DO UPDATE SET timestamp=excluded.timestamp
+                """,
+                (timestamp,),
+                False,
+            )
         )
-        self.conn.commit()
 
     def fetch_latest_heartbeat(self) -> Optional[sqlite3.Row]:
         cursor = self.conn.execute("SELECT timestamp FROM engine_status WHERE id = 1")
         return cursor.fetchone()
 
     def close(self) -> None:
+        self.flush_events(force=True)
+        if self._writer is not None:
+            self._writer.stop()
+            self._writer = None
         self.conn.close()
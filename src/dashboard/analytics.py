@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import sqlite3
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.storage import EVENT_SYMBOL_EXPR, PNL_EVENT_TYPES, ROLLUP_RESOLUTIONS
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[hi:next_hi].mean() if next_hi > hi else x[-1]
+        avg_y = y[hi:next_hi].mean() if next_hi > hi else y[-1]
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def _range_clauses(column: str, start: Optional[str], end: Optional[str]) -> Tuple[str, List[Any]]:
+    clauses: List[str] = []
+    params: List[Any] = []
+    if start:
+        clauses.append(f"{column} >= ?")
+        params.append(start)
+    if end:
+        clauses.append(f"{column} < ?")
+        params.append(end)
+    return "".join(f" AND {clause}" for clause in clauses), params
+
+
+def equity_buckets(
+    conn: sqlite3.Connection, start: Optional[str] = None, end: Optional[str] = None, points: int = 1500
+) -> pd.DataFrame:
+    def rollup_range(resolution: str) -> Tuple[str, List[Any]]:
+        return _range_clauses("bucket", start[: ROLLUP_RESOLUTIONS[resolution]] if start else None, end)
+
+    def covers(first: Optional[str]) -> bool:
+        return first is not None and first_hour is not None and first[: ROLLUP_RESOLUTIONS["hour"]] <= first_hour
+
+    where, params = rollup_range("hour")
+    first_hour = conn.execute(
+        f"SELECT MIN(bucket) FROM equity_rollup WHERE resolution = 'hour'{where}", params
+    ).fetchone()[0]
+    where, params = rollup_range("minute")
+    minutes, first_minute = conn.execute(
+        f"SELECT COUNT(*), MIN(bucket) FROM equity_rollup WHERE resolution = 'minute'{where}", params
+    ).fetchone()
+    first_raw = conn.execute("SELECT MIN(timestamp) FROM equity_curve").fetchone()[0]
+    if minutes <= points and covers(first_raw):
+        where, params = _range_clauses("timestamp", start, end)
+        query = (
+            "SELECT timestamp, equity AS min, equity AS max, equity AS last, realized_pnl, unrealized_pnl "
+            f"FROM equity_curve WHERE 1{where} ORDER BY id"
+        )
+    else:
+        resolution = "minute" if minutes <= points * 60 and covers(first_minute) else "hour"
+        where, params = rollup_range(resolution)
+        query = (
+            "SELECT bucket AS timestamp, min, max, last, realized_pnl, unrealized_pnl FROM equity_rollup "
+            f"WHERE resolution = ?{where} ORDER BY bucket"
+        )
+        params = [resolution, *params]
+    cursor = conn.execute(query, params)
+    return pd.DataFrame.from_records(cursor.fetchall(), columns=[column[0] for column in cursor.description])
+
+
+def equity_series(
+    conn: sqlite3.Connection, start: Optional[str] = None, end: Optional[str] = None, points: int = 1500
+) -> pd.DataFrame:
+    frame = equity_buckets(conn, start, end, points)
+    if frame.empty:
+        return frame
+    peak = np.maximum.accumulate(frame["max"].to_numpy())
+    frame["drawdown_pct"] = (frame["min"].to_numpy() / peak - 1) * 100
+    x = np.arange(len(frame), dtype=np.float64)
+    keep = np.union1d(
+        lttb(x, frame["last"].to_numpy(dtype=np.float64), points),
+        lttb(x, frame["drawdown_pct"].to_numpy(dtype=np.float64), points),
+    )
+    frame = frame.iloc[keep].reset_index(drop=True)
+    frame["timestamp"] = pd.to_datetime(frame["timestamp"], utc=True, format="ISO8601")
+    return frame
+
+
+def symbol_pnl(conn: sqlite3.Connection, start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
+    where, params = _range_clauses("timestamp", start, end)
+    placeholders = ", ".join("?" for _ in PNL_EVENT_TYPES)
+    cursor = conn.execute(
+        f"""
+        SELECT substr(timestamp, 1, {ROLLUP_RESOLUTIONS['hour']}) AS bucket, {EVENT_SYMBOL_EXPR} AS symbol,
+               SUM(json_extract(metadata, '$.pnl') * repeat_count) AS pnl, SUM(repeat_count) AS trades
+        FROM events
+        WHERE event_type IN ({placeholders}){where}
+        GROUP BY bucket, symbol ORDER BY bucket
+        """,
+        (*PNL_EVENT_TYPES, *params),
+    )
+    frame = pd.DataFrame.from_records(cursor.fetchall(), columns=[column[0] for column in cursor.description])
+    if frame.empty:
+        return frame
+    frame["timestamp"] = pd.to_datetime(frame["bucket"], utc=True, format="ISO8601")
+    cumulative = frame.pivot_table(index="timestamp", columns="symbol", values="pnl", aggfunc="sum").fillna(0.0)
+    return cumulative.cumsum()
@@ -3,16 +3,38 @@ from __future__ import annotations
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
-import pandas as pd
 import streamlit as st
 from dotenv import load_dotenv
 
-from core.config import load_config
-from core.storage import Storage
+from core.config import AppConfig, load_config
+from core.storage import StorageProfile
+from dashboard.data import DashboardData, fetch_engine_metrics, latency_frame
 
 CONTROL_DIR = Path("control")
 KILL_SWITCH_FILE = CONTROL_DIR / "kill_switch.flag"
 STOP_FILE = CONTROL_DIR / "stop.flag"
+CHART_RANGES = {
+    "1 hour": timedelta(hours=1),
+    "1 day": timedelta(days=1),
+    "7 days": timedelta(days=7),
+    "30 days": timedelta(days=30),
+    "1 year": timedelta(days=365),
+    "All": None,
+}
+
+
+@st.cache_resource
+def dashboard_data(config: AppConfig) -> DashboardData:
+    return DashboardData(
+        config.storage.path,
+        config.dashboard.max_rows,
+        config.dashboard.min_refresh_seconds,
+        StorageProfile(
+            mmap_size_mb=config.storage.mmap_size_mb,
+            cache_size_mb=config.storage.cache_size_mb,
+            busy_timeout_ms=config.storage.busy_timeout_ms,
+        ),
+    )
 
 
 st.set_page_config(page_title="Trading Dashboard", layout="wide")
@@ -26,25 +48,30 @@ except Exception as exc:
     st.error(f"Failed to load config: {exc}")
     st.stop()
 
-storage = Storage(config.storage.path)
+data = dashboard_data(config)
 CONTROL_DIR.mkdir(parents=True, exist_ok=True)
 
-col1, col2, col3 = st.columns(3)
 
-mode = config.mode
-heartbeat = storage.fetch_latest_heartbeat()
-is_fresh = False
-if heartbeat:
-    last_ts = datetime.fromisoformat(heartbeat["timestamp"])
-    is_fresh = datetime.now(timezone.utc) - last_ts < timedelta(seconds=config.poll_interval_seconds * 2)
-status = "STOPPED"
-if not STOP_FILE.exists() and is_fresh:
-    status = "RUNNING"
-last_updated = datetime.now(timezone.utc).isoformat()
+@st.fragment(run_every=config.dashboard.refresh_seconds or None)
+def status_panel(config: AppConfig) -> None:
+    data.refresh()
+    col1, col2, col3 = st.columns(3)
+
+    is_fresh = False
+    if data.heartbeat:
+        last_ts = datetime.fromisoformat(data.heartbeat)
+        is_fresh = datetime.now(timezone.utc) - last_ts < timedelta(seconds=config.poll_interval_seconds * 2)
+    status = "STOPPED"
+    if not STOP_FILE.exists() and is_fresh:
+        status = "RUNNING"
+    last_updated = datetime.now(timezone.utc).isoformat()
+
+    col1.metric("Mode", config.mode)
+    col2.metric("Status", status)
+    col3.metric("Last Update (UTC)", last_updated)
 
-col1.metric("Mode", mode)
-col2.metric("Status", status)
-col3.metric("Last Update (UTC)", last_updated)
+
+status_panel(config)
 
 st.subheader("Controls")
 control_col1, control_col2, control_col3 = st.columns(3)
@@ -70,37 +97,98 @@ if st.button("Disable Kill Switch"):
         KILL_SWITCH_FILE.unlink()
         st.success("Kill switch disabled")
 
-st.subheader("Account Summary")
-latest_equity = storage.fetch_latest_equity()
-if latest_equity:
-    equity = latest_equity["equity"]
-    realized = latest_equity["realized_pnl"]
-    unrealized = latest_equity["unrealized_pnl"]
-    return_pct = (equity - config.initial_equity) / config.initial_equity * 100
-    st.write(
-        {
-            "initial_equity": config.initial_equity,
-            "equity": equity,
-            "return_pct": round(return_pct, 2),
-            "realized_pnl": realized,
-            "unrealized_pnl": unrealized,
-        }
+
+@st.fragment(run_every=config.dashboard.refresh_seconds or None)
+def account_panel(config: AppConfig) -> None:
+    data.refresh()
+    st.subheader("Account Summary")
+    latest_equity = data.latest_equity()
+    if latest_equity:
+        equity = latest_equity["equity"]
+        realized = latest_equity["realized_pnl"]
+        unrealized = latest_equity["unrealized_pnl"]
+        return_pct = (equity - config.initial_equity) / config.initial_equity * 100
+        st.write(
+            {
+                "initial_equity": config.initial_equity,
+                "equity": equity,
+                "return_pct": round(return_pct, 2),
+                "realized_pnl": realized,
+                "unrealized_pnl": unrealized,
+            }
+        )
+    else:
+        st.info("No equity data yet.")
+
+    st.subheader("Positions")
+    if not data.positions.empty:
+        st.dataframe(data.positions)
+    else:
+        st.info("No positions found.")
+
+    st.subheader("Recent Events")
+    filter_col1, filter_col2 = st.columns(2)
+    event_type_filter = filter_col1.text_input("Event type", "")
+    symbol_filter = filter_col2.text_input("Symbol", "")
+    events = data.events(
+        event_type=event_type_filter.strip().upper() or None,
+        symbol=symbol_filter.strip().upper() or None,
+        limit=100,
     )
-else:
-    st.info("No equity data yet.")
-
-st.subheader("Positions")
-positions = storage.fetch_positions()
-if positions:
-    positions_df = pd.DataFrame(positions)
-    st.dataframe(positions_df)
-else:
-    st.info("No positions found.")
-
-st.subheader("Recent Events")
-events = storage.fetch_recent_events(100)
-if events:
-    df = pd.DataFrame(events)
-    st.dataframe(df)
-else:
-    st.info("No events found.")
+    if not events.empty:
+        st.dataframe(events)
+    else:
+        st.info("No events found.")
+
+
+account_panel(config)
+
+
+@st.fragment(run_every=config.dashboard.refresh_seconds or None)
+def charts_panel(config: AppConfig) -> None:
+    data.refresh()
+    st.subheader("Performance")
+    label = st.selectbox("Range", list(CHART_RANGES), index=1)
+    span = CHART_RANGES[label]
+    now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    start = (now - span).isoformat() if span else None
+
+    curve = data.equity_series(start, config.dashboard.chart_points)
+    if curve.empty:
+        st.info("No equity data in range.")
+    else:
+        curve = curve.set_index("timestamp")
+        equity_col, drawdown_col = st.columns(2)
+        equity_col.caption("Equity")
+        equity_col.line_chart(curve[["last"]].rename(columns={"last": "equity"}))
+        drawdown_col.caption("Drawdown (%)")
+        drawdown_col.area_chart(curve[["drawdown_pct"]])
+
+    pnl = data.symbol_pnl(start)
+    st.caption("Cumulative realized PnL by symbol")
+    if pnl.empty:
+        st.info("No closed trades in range.")
+    else:
+        st.line_chart(pnl)
+
+
+charts_panel(config)
+
+
+@st.fragment(run_every=config.dashboard.refresh_seconds or None)
+def latency_panel(config: AppConfig) -> None:
+    st.subheader("Engine Latency")
+    snapshot = fetch_engine_metrics(config.metrics.host, config.metrics.port) if config.metrics.enabled else None
+    if snapshot is None:
+        st.info("Metrics endpoint not reachable.")
+        return
+    counters = snapshot["counters"]
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Loops", counters.get("loops", 0))
+    col2.metric(f"Overruns (> {snapshot['poll_interval_seconds']}s)", counters.get("overruns", 0))
+    col3.metric("Ticks", counters.get("ticks", 0))
+    col4.metric("Orders", counters.get("orders", 0))
+    st.dataframe(latency_frame(snapshot), hide_index=True)
+
+
+latency_panel(config)
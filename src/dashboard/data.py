@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+import urllib.request
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from core.storage import EVENT_SYMBOL_EXPR, StorageProfile, connect_readonly, query_events
+from dashboard.analytics import equity_series, symbol_pnl
+
+TAIL_TABLES: Dict[str, str] = {
+    "events": (
+        f"timestamp, level, event_type, message, metadata, {EVENT_SYMBOL_EXPR} AS symbol, repeat_count, last_timestamp"
+    ),
+    "orders": "timestamp, order_id, symbol, side, status, price, quantity, filled_qty, mode",
+    "trades": "timestamp, trade_id, order_id, symbol, side, price, quantity, pnl, mode",
+    "equity_curve": "timestamp, equity, realized_pnl, unrealized_pnl",
+}
+
+
+def filtered_events(
+    conn: sqlite3.Connection, event_type: Optional[str], symbol: Optional[str], limit: int
+) -> pd.DataFrame:
+    cursor = query_events(conn, event_type=event_type, symbol=symbol, limit=limit)
+    return pd.DataFrame.from_records(cursor.fetchall(), columns=[column[0] for column in cursor.description])
+
+
+class TailFrame:
+    def __init__(self, table: str, columns: str, max_rows: int) -> None:
+        self.table = table
+        self.columns = columns
+        self.max_rows = max_rows
+        self.last_id = 0
+        self.frame = pd.DataFrame()
+
+    def refresh(self, conn: sqlite3.Connection) -> int:
+        cursor = conn.execute(
+            f"SELECT * FROM (SELECT id, {self.columns} FROM {self.table} WHERE id > ? ORDER BY id DESC LIMIT ?) "
+            "ORDER BY id",
+            (self.last_id, self.max_rows),
+        )
+        rows = cursor.fetchall()
+        if not rows:
+            return 0
+        new = pd.DataFrame.from_records(rows, columns=[column[0] for column in cursor.description])
+        frame = new if self.frame.empty or len(new) >= self.max_rows else pd.concat([self.frame, new])
+        self.frame = frame.iloc[-self.max_rows :].reset_index(drop=True)
+        self.last_id = int(new["id"].iloc[-1])
+        return len(rows)
+
+    def reset(self) -> None:
+        self.last_id = 0
+        self.frame = pd.DataFrame()
+
+
+class DashboardData:
+    def __init__(
+        self,
+        path: str,
+        max_rows: int = 5000,
+        min_refresh_seconds: float = 1.0,
+        profile: Optional[StorageProfile] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.min_refresh_seconds = min_refresh_seconds
+        self.profile = profile or StorageProfile()
+        self.tables = {table: TailFrame(table, columns, max_rows) for table, columns in TAIL_TABLES.items()}
+        self.positions = pd.DataFrame()
+        self.heartbeat: Optional[str] = None
+        self.refreshed_at = 0.0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._views: Dict[Tuple[Any, ...], pd.DataFrame] = {}
+
+    def refresh(self, force: bool = False) -> Dict[str, int]:
+        with self._lock:
+            if not force and time.monotonic() - self.refreshed_at < self.min_refresh_seconds:
+                return {}
+            conn = self._connection()
+            if conn is None:
+                return {}
+            counts: Dict[str, int] = {}
+            for table, tail in self.tables.items():
+                try:
+                    if tail.last_id > self._max_id(conn, table):
+                        tail.reset()
+                    counts[table] = tail.refresh(conn)
+                except sqlite3.OperationalError:
+                    counts[table] = 0
+            self._refresh_status(conn)
+            self.refreshed_at = time.monotonic()
+            if any(counts.values()):
+                self._views.clear()
+            return counts
+
+    def frame(self, table: str) -> pd.DataFrame:
+        return self.tables[table].frame
+
+    def events(
+        self, event_type: Optional[str] = None, symbol: Optional[str] = None, limit: int = 100
+    ) -> pd.DataFrame:
+        if event_type or symbol:
+            return self._view(filtered_events, event_type, symbol, limit)
+        frame = self.frame("events")
+        if frame.empty:
+            return frame
+        return frame.iloc[::-1].head(limit).drop(columns=["symbol"])
+
+    def latest_equity(self) -> Optional[Dict[str, float]]:
+        frame = self.frame("equity_curve")
+        if frame.empty:
+            return None
+        return frame.iloc[-1].to_dict()
+
+    def equity_series(self, start: Optional[str] = None, points: int = 1500) -> pd.DataFrame:
+        return self._view(equity_series, start, None, points)
+
+    def symbol_pnl(self, start: Optional[str] = None) -> pd.DataFrame:
+        return self._view(symbol_pnl, start, None)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _view(self, query: Callable[..., pd.DataFrame], *args: Any) -> pd.DataFrame:
+        with self._lock:
+            key = (query.__name__, *args)
+            if key not in self._views:
+                for stale in [view for view in self._views if view[0] == query.__name__]:
+                    del self._views[stale]
+                conn = self._connection()
+                try:
+                    self._views[key] = pd.DataFrame() if conn is None else query(conn, *args)
+                except sqlite3.OperationalError:
+                    self._views[key] = pd.DataFrame()
+            return self._views[key]
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if self._conn is None and self.path.exists():
+            self._conn = connect_readonly(self.path, self.profile)
+        return self._conn
+
+    @staticmethod
+    def _max_id(conn: sqlite3.Connection, table: str) -> int:
+        row = conn.execute(f"SELECT MAX(id) FROM {table}").fetchone()
+        return row[0] or 0
+
+    def _refresh_status(self, conn: sqlite3.Connection) -> None:
+        try:
+            cursor = conn.execute(
+                "SELECT symbol, side, entry_price, quantity, leverage, mark_price, unrealized_pnl FROM positions"
+            )
+            rows: List[Tuple] = cursor.fetchall()
+            self.positions = pd.DataFrame.from_records(rows, columns=[column[0] for column in cursor.description])
+            row = conn.execute("SELECT timestamp FROM engine_status WHERE id = 1").fetchone()
+            self.heartbeat = row[0] if row else None
+        except sqlite3.OperationalError:
+            pass
+
+
+def fetch_engine_metrics(host: str, port: int, timeout: float = 1.0) -> Optional[Dict[str, Any]]:
+    try:
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics.json", timeout=timeout) as response:
+            return json.load(response)
+    except (OSError, ValueError):
+        return None
+
+
+def latency_frame(snapshot: Dict[str, Any]) -> pd.DataFrame:
+    rows = [
+        {
+            "stage": name,
+            "count": stage["count"],
+            "p50_ms": stage["p50"] * 1000,
+            "p99_ms": stage["p99"] * 1000,
+            "max_ms": stage["max"] * 1000,
+        }
+        for name, stage in sorted(snapshot["stages"].items())
+    ]
+    return pd.DataFrame(rows, columns=["stage", "count", "p50_ms", "p99_ms", "max_ms"])
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from binance.client import Client
 from tenacity import retry, stop_after_attempt, wait_exponential
@@ -12,15 +13,18 @@ from tenacity import retry, stop_after_attempt, wait_exponential
 class MarketPrice:
     symbol: str
     price: float
+    timestamp: Optional[datetime] = None
 
 
 class BinanceClient:
-    def __init__(self, mode: str) -> None:
+    def __init__(self, mode: str, client: Optional[Any] = None) -> None:
         self.mode = mode
         api_key = os.getenv("BINANCE_API_KEY")
         api_secret = os.getenv("BINANCE_API_SECRET")
 
-        if mode == "testnet":
+        if client is not None:
+            self.client = client
+        elif mode == "testnet":
             self.client = Client(api_key, api_secret, testnet=True)
         elif mode == "live":
             self.client = Client(api_key, api_secret)
@@ -30,7 +34,37 @@ class BinanceClient:
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=5))
     def get_latest_price(self, symbol: str) -> MarketPrice:
         ticker = self.client.futures_symbol_ticker(symbol=symbol)
-        return MarketPrice(symbol=symbol, price=float(ticker["price"]))
+        return MarketPrice(symbol=symbol, price=float(ticker["price"]), timestamp=self._ticker_time(ticker))
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=5))
+    def get_latest_prices(self, symbols: Iterable[str]) -> Dict[str, MarketPrice]:
+        wanted = set(symbols)
+        prices: Dict[str, MarketPrice] = {}
+        for ticker in self.client.futures_symbol_ticker():
+            symbol = ticker["symbol"]
+            if symbol not in wanted:
+                continue
+            prices[symbol] = MarketPrice(
+                symbol=symbol, price=float(ticker["price"]), timestamp=self._ticker_time(ticker)
+            )
+        missing = wanted - prices.keys()
+        if missing:
+            raise ValueError(f"No ticker returned for: {', '.join(sorted(missing))}")
+        return prices
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=5))
+    def get_klines(
+        self, symbol: str, interval: str, limit: int, now: Optional[datetime] = None
+    ) -> List[Tuple[float, float]]:
+        cutoff = (now or datetime.now(timezone.utc)).timestamp() * 1000
+        rows = self.client.futures_klines(symbol=symbol, interval=interval, limit=limit)
+        return [(int(row[6]) / 1000, float(row[4])) for row in rows if int(row[6]) < cutoff]
+
+    @staticmethod
+    def _ticker_time(ticker: Dict[str, Any]) -> datetime:
+        if ticker.get("time"):
+            return datetime.fromtimestamp(int(ticker["time"]) / 1000, tz=timezone.utc)
+        return datetime.now(timezone.utc)
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=5))
     def fetch_positions(self) -> List[Dict[str, str]]:
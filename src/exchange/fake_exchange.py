@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import itertools
+import json
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from binance.exceptions import BinanceAPIException
+
+from exchange.user_data import TERMINAL_STATUSES, MessageCallback
+
+
+@dataclass
+class FakeOrder:
+    order_id: int
+    client_order_id: str
+    symbol: str
+    side: str
+    quantity: float
+    status: str = "NEW"
+    filled_qty: float = 0.0
+    avg_price: float = 0.0
+    update_time: int = 0
+
+
+@dataclass
+class FakeExchange:
+    prices: Dict[str, float] = field(default_factory=dict)
+    auto_fill: bool = True
+    fill_chunks: int = 1
+    commission_rate: float = 0.0004
+    drop_events: bool = False
+    time_ms: int = 1_700_000_000_000
+    orders: Dict[str, FakeOrder] = field(default_factory=dict)
+    _callbacks: List[MessageCallback] = field(default_factory=list, repr=False)
+    _reject: Optional[str] = field(default=None, repr=False)
+    _ids: Any = field(default_factory=lambda: itertools.count(1), repr=False)
+    _trade_ids: Any = field(default_factory=lambda: itertools.count(1), repr=False)
+    _lock: threading.RLock = field(default_factory=threading.RLock, repr=False)
+
+    def start(self, callback: MessageCallback) -> None:
+        self._callbacks.append(callback)
+
+    def stop(self) -> None:
+        self._callbacks.clear()
+
+    def reject_next(self, message: str = "Margin is insufficient.") -> None:
+        self._reject = message
+
+    def futures_create_order(
+        self, symbol: str, side: str, type: str, quantity: float, newClientOrderId: str = "", **kwargs: Any
+    ) -> Dict[str, Any]:
+        with self._lock:
+            if self._reject is not None:
+                message, self._reject = self._reject, None
+                raise BinanceAPIException(None, 400, json.dumps({"code": -2019, "msg": message}))
+            order_id = next(self._ids)
+            order = FakeOrder(order_id, newClientOrderId or f"fake-{order_id}", symbol, side, float(quantity))
+            order.update_time = self.time_ms
+            self.orders[order.client_order_id] = order
+            self._emit(order, "NEW")
+            response = self._response(order)
+            if self.auto_fill:
+                chunk = order.quantity / self.fill_chunks
+                for _ in range(self.fill_chunks - 1):
+                    self.fill(order.client_order_id, chunk)
+                self.fill(order.client_order_id, order.quantity - order.filled_qty)
+            return response
+
+    def futures_get_order(self, symbol: str, origClientOrderId: str, **kwargs: Any) -> Dict[str, Any]:
+        with self._lock:
+            order = self.orders.get(origClientOrderId)
+            if order is None or order.symbol != symbol:
+                raise BinanceAPIException(None, 400, json.dumps({"code": -2013, "msg": "Order does not exist."}))
+            return self._response(order)
+
+    def fill(self, client_order_id: str, quantity: float, price: Optional[float] = None) -> None:
+        with self._lock:
+            order = self.orders[client_order_id]
+            if order.status in TERMINAL_STATUSES:
+                return
+            quantity = min(quantity, order.quantity - order.filled_qty)
+            price = self.prices.get(order.symbol, 0.0) if price is None else price
+            total = order.filled_qty + quantity
+            order.avg_price = (order.avg_price * order.filled_qty + price * quantity) / total
+            order.filled_qty = total
+            order.status = "FILLED" if total >= order.quantity - 1e-12 else "PARTIALLY_FILLED"
+            order.update_time = self.time_ms
+            self._emit(order, "TRADE", price, quantity)
+
+    def cancel(self, client_order_id: str, status: str = "CANCELED") -> None:
+        with self._lock:
+            order = self.orders[client_order_id]
+            if order.status in TERMINAL_STATUSES:
+                return
+            order.status = status
+            order.update_time = self.time_ms
+            self._emit(order, status)
+
+    def _response(self, order: FakeOrder) -> Dict[str, Any]:
+        return {
+            "orderId": order.order_id,
+            "clientOrderId": order.client_order_id,
+            "symbol": order.symbol,
+            "side": order.side,
+            "type": "MARKET",
+            "status": order.status,
+            "origQty": str(order.quantity),
+            "executedQty": str(order.filled_qty),
+            "avgPrice": str(order.avg_price),
+            "updateTime": order.update_time,
+        }
+
+    def _emit(self, order: FakeOrder, execution: str, last_price: float = 0.0, last_qty: float = 0.0) -> None:
+        if self.drop_events:
+            return
+        message = {
+            "e": "ORDER_TRADE_UPDATE",
+            "E": self.time_ms,
+            "T": self.time_ms,
+            "o": {
+                "s": order.symbol,
+                "c": order.client_order_id,
+                "S": order.side,
+                "o": "MARKET",
+                "q": str(order.quantity),
+                "ap": str(order.avg_price),
+                "x": execution,
+                "X": order.status,
+                "i": order.order_id,
+                "l": str(last_qty),
+                "z": str(order.filled_qty),
+                "L": str(last_price),
+                "n": str(last_price * last_qty * self.commission_rate),
+                "N": "USDT",
+                "T": order.update_time,
+                "t": next(self._trade_ids) if execution == "TRADE" else 0,
+            },
+        }
+        for callback in list(self._callbacks):
+            callback(message)
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import csv
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, List, Optional, Protocol
+
+from core.config import AppConfig
+from exchange.binance_client import BinanceClient
+
+STREAM_SUFFIXES = {"bookTicker": "@bookTicker", "markPrice": "@markPrice@1s"}
+TICK_COLUMNS = ["timestamp", "symbol", "price"]
+RECORD_FLUSH_SECONDS = 1.0
+REPLAY_QUEUE_SIZE = 10_000
+
+
+@dataclass
+class Tick:
+    symbol: str
+    price: float
+    timestamp: datetime
+
+
+class MarketDataFeed(Protocol):
+    @property
+    def closed(self) -> bool:
+        ...
+
+    def start(self) -> None:
+        ...
+
+    def stop(self) -> None:
+        ...
+
+    def next_ticks(self, timeout: float) -> List[Tick]:
+        ...
+
+
+class PollingFeed:
+    def __init__(self, client: BinanceClient, symbols: List[str], interval_seconds: float) -> None:
+        self.client = client
+        self.symbols = symbols
+        self.interval_seconds = interval_seconds
+        self._next_poll = 0.0
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def start(self) -> None:
+        self._next_poll = time.monotonic()
+
+    def stop(self) -> None:
+        self._closed = True
+
+    def next_ticks(self, timeout: float) -> List[Tick]:
+        delay = self._next_poll - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        self._next_poll = time.monotonic() + self.interval_seconds
+        quotes = self.client.get_latest_prices(self.symbols)
+        now = datetime.now(timezone.utc)
+        return [
+            Tick(symbol=symbol, price=quotes[symbol].price, timestamp=quotes[symbol].timestamp or now)
+            for symbol in self.symbols
+        ]
+
+
+class QueueFeed:
+    def __init__(self, record_path: Optional[str] = None, maxsize: int = 0) -> None:
+        self._queue: "queue.Queue[Tick]" = queue.Queue(maxsize)
+        self._closed = threading.Event()
+        self._record_path = Path(record_path) if record_path else None
+        self._record_lock = threading.Lock()
+        self._record_file: Optional[IO[str]] = None
+        self._record_writer: Any = None
+        self._next_flush = 0.0
+
+    @property
+    def closed(self) -> bool:
+        return self._closed.is_set() and self._queue.empty()
+
+    def start(self) -> None:
+        self._closed.clear()
+        if self._record_path is not None and self._record_file is None:
+            self._record_path.parent.mkdir(parents=True, exist_ok=True)
+            self._record_file = self._record_path.open("a", newline="")
+            self._record_writer = csv.writer(self._record_file)
+            if self._record_file.tell() == 0:
+                self._record_writer.writerow(TICK_COLUMNS)
+            self._next_flush = time.monotonic() + RECORD_FLUSH_SECONDS
+
+    def stop(self) -> None:
+        self._closed.set()
+        with self._record_lock:
+            if self._record_file is not None:
+                self._record_file.close()
+                self._record_file = None
+                self._record_writer = None
+
+    def push(self, tick: Tick) -> None:
+        self._queue.put(tick)
+        if self._record_writer is not None:
+            with self._record_lock:
+                if self._record_writer is None:
+                    return
+                self._record_writer.writerow(tick_row(tick))
+                if time.monotonic() >= self._next_flush:
+                    self._record_file.flush()
+                    self._next_flush = time.monotonic() + RECORD_FLUSH_SECONDS
+
+    def next_ticks(self, timeout: float) -> List[Tick]:
+        try:
+            ticks = [self._queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        limit = self._queue.maxsize or None
+        while limit is None or len(ticks) < limit:
+            try:
+                ticks.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return ticks
+
+
+class BinanceStreamFeed(QueueFeed):
+    def __init__(self, mode: str, symbols: List[str], stream: str = "bookTicker", record_path: Optional[str] = None) -> None:
+        super().__init__(record_path)
+        if stream not in STREAM_SUFFIXES:
+            raise ValueError(f"Unsupported stream: {stream}")
+        self.mode = mode
+        self.symbols = symbols
+        self.stream = stream
+        self._manager = None
+
+    def start(self) -> None:
+        from binance import ThreadedWebsocketManager
+
+        super().start()
+        self._manager = ThreadedWebsocketManager(testnet=self.mode == "testnet")
+        self._manager.start()
+        streams = [symbol.lower() + STREAM_SUFFIXES[self.stream] for symbol in self.symbols]
+        self._manager.start_futures_multiplex_socket(callback=self._on_message, streams=streams)
+
+    def stop(self) -> None:
+        if self._manager is not None:
+            self._manager.stop()
+            self._manager = None
+        super().stop()
+
+    def _on_message(self, message: Dict[str, Any]) -> None:
+        tick = self.parse_message(message)
+        if tick is not None:
+            self.push(tick)
+
+    @staticmethod
+    def parse_message(message: Dict[str, Any]) -> Optional[Tick]:
+        data = message.get("data", message)
+        event = data.get("e")
+        if event == "markPriceUpdate":
+            price = float(data["p"])
+        elif event == "bookTicker" or ("b" in data and "a" in data):
+            price = (float(data["b"]) + float(data["a"])) / 2
+        else:
+            return None
+        event_ms = data.get("E") or data.get("T")
+        timestamp = (
+            datetime.fromtimestamp(int(event_ms) / 1000, tz=timezone.utc) if event_ms else datetime.now(timezone.utc)
+        )
+        return Tick(symbol=data["s"], price=price, timestamp=timestamp)
+
+
+class ReplayFeed(QueueFeed):
+    def __init__(self, ticks: Iterable[Tick], speed: float = 0.0, maxsize: int = REPLAY_QUEUE_SIZE) -> None:
+        super().__init__(maxsize=maxsize)
+        self._ticks = ticks
+        self.speed = speed
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        super().start()
+        self._thread = threading.Thread(target=self._run, name="replay-feed", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        previous: Optional[datetime] = None
+        for tick in self._ticks:
+            if self._closed.is_set():
+                return
+            if self.speed > 0 and previous is not None:
+                gap = (tick.timestamp - previous).total_seconds() / self.speed
+                if gap > 0:
+                    time.sleep(gap)
+            previous = tick.timestamp
+            while not self._closed.is_set():
+                try:
+                    self._queue.put(tick, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+        self._closed.set()
+
+
+def read_ticks(path: Path | str) -> Iterable[Tick]:
+    with Path(path).open(newline="") as handle:
+        for row in csv.DictReader(handle):
+            yield Tick(
+                symbol=row["symbol"],
+                price=float(row["price"]),
+                timestamp=datetime.fromisoformat(row["timestamp"]),
+            )
+
+
+def write_ticks(path: Path | str, ticks: Iterable[Tick], append: bool = False) -> None:
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    write_header = not append or not target.exists() or target.stat().st_size == 0
+    with target.open("a" if append else "w", newline="") as handle:
+        writer = csv.writer(handle)
+        if write_header:
+            writer.writerow(TICK_COLUMNS)
+        for tick in ticks:
+            writer.writerow(tick_row(tick))
+
+
+def tick_row(tick: Tick) -> List[Any]:
+    return [tick.timestamp.isoformat(), tick.symbol, tick.price]
+
+
+def build_feed(config: AppConfig, client: BinanceClient) -> MarketDataFeed:
+    settings = config.market_data
+    if settings.feed == "poll":
+        return PollingFeed(client, config.symbols, config.poll_interval_seconds)
+    if settings.feed == "stream":
+        return BinanceStreamFeed(config.mode, config.symbols, settings.stream, settings.record_path or None)
+    if settings.feed == "replay":
+        if not settings.replay_path:
+            raise ValueError("market_data.replay_path is required for the replay feed")
+        return ReplayFeed(read_ticks(settings.replay_path), settings.replay_speed)
+    raise ValueError(f"Unsupported market data feed: {settings.feed}")
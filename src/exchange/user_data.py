@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Protocol
+
+TERMINAL_STATUSES = {"FILLED", "CANCELED", "EXPIRED", "REJECTED"}
+
+MessageCallback = Callable[[Dict[str, Any]], None]
+
+
+@dataclass
+class OrderUpdate:
+    client_order_id: str
+    symbol: str
+    side: str
+    status: str
+    filled_qty: float
+    avg_price: float
+    order_id: str = ""
+    last_price: float = 0.0
+    commission: float = 0.0
+    trade_id: str = ""
+    timestamp: Optional[datetime] = None
+    reason: str = ""
+
+
+class UserDataStream(Protocol):
+    def start(self, callback: MessageCallback) -> None:
+        ...
+
+    def stop(self) -> None:
+        ...
+
+
+def _timestamp(value: Any) -> Optional[datetime]:
+    return datetime.fromtimestamp(int(value) / 1000, tz=timezone.utc) if value else None
+
+
+def parse_order_update(message: Dict[str, Any]) -> Optional[OrderUpdate]:
+    data = message.get("data", message)
+    if data.get("e") != "ORDER_TRADE_UPDATE":
+        return None
+    order = data["o"]
+    return OrderUpdate(
+        client_order_id=order["c"],
+        symbol=order["s"],
+        side=order["S"],
+        status=order["X"],
+        filled_qty=float(order.get("z", 0)),
+        avg_price=float(order.get("ap", 0)),
+        order_id=str(order.get("i", "")),
+        last_price=float(order.get("L", 0)),
+        commission=float(order.get("n", 0)),
+        trade_id=str(order["t"]) if order.get("t") else "",
+        timestamp=_timestamp(order.get("T") or data.get("E")),
+    )
+
+
+def parse_order_response(response: Dict[str, Any]) -> OrderUpdate:
+    return OrderUpdate(
+        client_order_id=response["clientOrderId"],
+        symbol=response["symbol"],
+        side=response["side"],
+        status=response.get("status", "NEW"),
+        filled_qty=float(response.get("executedQty", 0)),
+        avg_price=float(response.get("avgPrice", 0)),
+        order_id=str(response.get("orderId", "")),
+        timestamp=_timestamp(response.get("updateTime")),
+    )
+
+
+class BinanceUserStream:
+    def __init__(self, mode: str) -> None:
+        self.mode = mode
+        self._manager = None
+
+    def start(self, callback: MessageCallback) -> None:
+        from binance import ThreadedWebsocketManager
+
+        self._manager = ThreadedWebsocketManager(
+            api_key=os.getenv("BINANCE_API_KEY"),
+            api_secret=os.getenv("BINANCE_API_SECRET"),
+            testnet=self.mode == "testnet",
+        )
+        self._manager.start()
+        self._manager.start_futures_user_socket(callback=callback)
+
+    def stop(self) -> None:
+        if self._manager is not None:
+            self._manager.stop()
+            self._manager = None
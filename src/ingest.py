@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from backtest import frame_timestamps, parse_sources, read_kline_frames
+from core.config import load_config
+from core.logger import setup_logger
+from core.market_store import MarketDataStore
+
+
+def ingest_klines(store: MarketDataStore, symbol: str, interval: str, path: Path | str) -> int:
+    appended = 0
+    for frame in read_kline_frames(path):
+        appended += store.append(
+            symbol,
+            interval,
+            {
+                "timestamp": frame_timestamps(frame).to_numpy(),
+                "open": frame["open"].astype("float64").to_numpy(),
+                "high": frame["high"].astype("float64").to_numpy(),
+                "low": frame["low"].astype("float64").to_numpy(),
+                "close": frame["close"].astype("float64").to_numpy(),
+                "volume": frame["volume"].astype("float64").to_numpy(),
+            },
+        )
+    return appended
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Append historical klines to the memory-mapped market-data store")
+    parser.add_argument("--config", default="config.yaml", help="Path to config.yaml")
+    parser.add_argument(
+        "--data",
+        nargs="+",
+        required=True,
+        help="Kline CSV/Parquet files, as SYMBOL=path or a path named like BTCUSDT-1m-2024-01.csv",
+    )
+    parser.add_argument("--store", default=None, help="Store directory (default: market_data.store_path)")
+    parser.add_argument("--interval", default="1m", help="Interval label the klines are stored under")
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    logger = setup_logger("ingest", config.logging.level, config.logging.dir)
+    root = args.store or config.market_data.store_path
+    if not root:
+        parser.error("--store is required when market_data.store_path is not set")
+
+    store = MarketDataStore(root)
+    for symbol, path in parse_sources(args.data).items():
+        appended = ingest_klines(store, symbol, args.interval, path)
+        logger.info(
+            "%s: appended %d %s bars from %s (%d total)",
+            symbol,
+            appended,
+            args.interval,
+            path,
+            store.length(symbol, args.interval),
+        )
+
+
+if __name__ == "__main__":
+    main()
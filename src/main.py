@@ -1,34 +1,32 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import List
 
 from dotenv import load_dotenv
 
-from core.clock import Clock
 from core.config import AppConfig, load_config
 from core.logger import setup_logger
-from core.storage import EquityRecord, Storage
+from core.metrics import EngineMetrics, build_metrics_server
+from core.retention import build_retention_worker
+from core.storage import Storage, build_event_coalescer
 from exchange.binance_client import BinanceClient
-from trading.execution import ExecutionEngine, OrderRequest
-from trading.portfolio import Portfolio
-from trading.risk import RiskLimits, RiskManager
-from trading.strategy_ema import EMAStrategy
+from exchange.market_data import build_feed
+from trading.async_engine import AsyncTradingEngine, StorageQueue, storage_writer
+from trading.engine import TradingEngine, build_engine
+from trading.risk import RiskManager
+from trading.sharding import ShardedTradingEngine
+from trading.warmup import recover, save_state, warm_start
 
 CONTROL_DIR = Path("control")
 KILL_SWITCH_FILE = CONTROL_DIR / "kill_switch.flag"
 STOP_FILE = CONTROL_DIR / "stop.flag"
 
 
-def load_prices(client: BinanceClient, symbols: List[str]) -> Dict[str, float]:
-    prices: Dict[str, float] = {}
-    for symbol in symbols:
-        prices[symbol] = client.get_latest_price(symbol).price
-    return prices
-
-
 def sync_positions_or_halt(config: AppConfig, client: BinanceClient, storage: Storage, logger) -> bool:
     if config.mode == "paper":
         return True
@@ -53,161 +51,243 @@ def update_kill_switch(risk: RiskManager) -> None:
         risk.disable_kill_switch()
 
 
+async def cancel_open_orders(
+    loop: asyncio.AbstractEventLoop, client: BinanceClient, symbols: List[str], storage: StorageQueue, logger
+) -> None:
+    results = await asyncio.gather(
+        *(loop.run_in_executor(None, client.cancel_open_orders, symbol) for symbol in symbols),
+        return_exceptions=True,
+    )
+    for symbol, result in zip(symbols, results):
+        if isinstance(result, Exception):
+            logger.error("Cancelling open orders failed for %s: %s", symbol, result)
+            storage.record_event("ERROR", "ORDER_CANCEL_FAIL", str(result), {"symbol": symbol})
+
+
 def should_stop() -> bool:
     return STOP_FILE.exists()
 
 
-def run_engine(config_path: str) -> None:
+def run_engine(config_path: str, use_async: bool = False) -> None:
     load_dotenv()
     config = load_config(config_path)
     config.ensure_safe_mode()
+    if config.market_data.feed == "replay":
+        config.max_price_age_seconds = 0
 
     logger = setup_logger("engine", config.logging.level, config.logging.dir)
-    storage = Storage(config.storage.path)
+    if use_async:
+        asyncio.run(run_engine_async(config, logger))
+        return
+
+    storage = Storage.from_config(config.storage, events=config.events)
     client = BinanceClient(config.mode)
 
     if not sync_positions_or_halt(config, client, storage, logger):
         return
 
-    risk = RiskManager(
-        RiskLimits(
-            daily_loss_limit_pct=config.daily_loss_limit_pct,
-            max_consecutive_losses=config.max_consecutive_losses,
-            cooldown_minutes=config.cooldown_minutes,
-        ),
-        initial_equity=config.initial_equity,
+    engine_cls = ShardedTradingEngine if config.strategy_shards > 1 else TradingEngine
+    metrics = EngineMetrics(config.poll_interval_seconds)
+    storage.metrics = metrics
+    engine = build_engine(config, storage, client, engine_cls, metrics=metrics)
+    replayed = recover(engine)
+    logger.info(
+        "Recovered state: realized PnL %.2f, %d positions, %d journal trades replayed",
+        engine.portfolio.realized_pnl,
+        len(engine.portfolio.positions),
+        replayed,
     )
-    strategy = EMAStrategy(config.strategy.fast_period, config.strategy.slow_period)
-    execution = ExecutionEngine(config.mode, config.slippage_pct, client, storage)
-    portfolio = Portfolio(config.initial_equity)
-
-    price_history: Dict[str, List[float]] = {symbol: [] for symbol in config.symbols}
-    clock = Clock()
+    warmed = warm_start(engine, client)
+    if warmed:
+        logger.info("Strategy state warmed: %s", warmed)
+    engine.start()
+    retention = build_retention_worker(config, storage)
+    if retention:
+        retention.start()
+    metrics_server = build_metrics_server(config.metrics, metrics)
+    if metrics_server:
+        metrics_server.start()
+    risk = engine.risk
+    feed = build_feed(config, client)
     CONTROL_DIR.mkdir(parents=True, exist_ok=True)
 
-    logger.info("Engine started in %s mode", config.mode)
+    logger.info("Engine started in %s mode (%s feed)", config.mode, config.market_data.feed)
     storage.record_event("INFO", "ENGINE_START", f"Engine started ({config.mode})", {})
+    feed.start()
+    last_saved = time.monotonic()
 
-    while True:
-        if should_stop():
-            logger.warning("Stop flag detected. Shutting down.")
-            storage.record_event("WARN", "ENGINE_STOP", "Stop flag detected", {})
-            break
+    try:
+        while True:
+            if should_stop():
+                logger.warning("Stop flag detected. Shutting down.")
+                storage.record_event("WARN", "ENGINE_STOP", "Stop flag detected", {})
+                break
 
-        update_kill_switch(risk)
+            started = time.perf_counter()
+            with metrics.stage("risk"):
+                update_kill_switch(risk)
+                engine.check_risk()
 
-        can_trade, reason = risk.can_trade()
-        if not can_trade:
-            storage.record_event("WARN", "RISK_BLOCK", reason, {})
+            waited = time.perf_counter()
+            try:
+                ticks = feed.next_ticks(timeout=config.poll_interval_seconds)
+            except Exception as exc:
+                if storage.record_event("ERROR", "PRICE_FETCH", str(exc), {}):
+                    logger.error("Price fetch failed: %s", exc)
+                continue
+            waited = time.perf_counter() - waited
+            metrics.observe("fetch", waited)
 
-        try:
-            prices = load_prices(client, config.symbols)
-        except Exception as exc:
-            logger.error("Price fetch failed: %s", exc)
-            storage.record_event("ERROR", "PRICE_FETCH", str(exc), {})
-            time.sleep(config.poll_interval_seconds)
-            continue
+            if not ticks and feed.closed:
+                logger.info("Market data feed closed. Shutting down.")
+                storage.record_event("INFO", "ENGINE_STOP", "Market data feed closed", {})
+                break
 
-        if risk.state.kill_switch:
-            if config.mode != "paper":
+            if risk.state.kill_switch and config.mode != "paper":
                 for symbol in config.symbols:
                     client.cancel_open_orders(symbol)
-            if config.risk.kill_switch_close_positions and portfolio.positions:
-                for symbol, position in list(portfolio.positions.items()):
-                    close_side = "SELL" if position.side == "LONG" else "BUY"
-                    close_order = OrderRequest(
-                        symbol=symbol,
-                        side=close_side,
-                        quantity=position.quantity,
-                        price=prices.get(symbol, position.entry_price),
-                    )
-                    trade = execution.submit_order(close_order)
-                    if trade:
-                        pnl = portfolio.update_with_trade(
-                            symbol,
-                            "LONG" if close_side == "BUY" else "SHORT",
-                            trade.price,
-                            trade.quantity,
-                            config.leverage,
-                        )
-                        risk.record_trade_pnl(pnl)
-                        storage.record_event(
-                            "WARN",
-                            "KILL_SWITCH_CLOSE",
-                            f"Closed position {symbol}",
-                            {"price": trade.price, "qty": trade.quantity, "pnl": pnl},
-                        )
-
-        for symbol in config.symbols:
-            price_history[symbol].append(prices[symbol])
-            signals = strategy.generate_signals(symbol, price_history[symbol])
-            for signal in signals:
-                storage.record_event(
-                    "INFO",
-                    "SIGNAL",
-                    signal.reason,
-                    {"symbol": symbol, "side": signal.side, "price": prices[symbol]},
-                )
-                if not can_trade:
-                    storage.record_event(
-                        "INFO",
-                        "SIGNAL_SKIPPED",
-                        f"Signal skipped: {reason}",
-                        {"symbol": symbol, "side": signal.side},
-                    )
-                    continue
-
-                side = signal.side
-                notional = config.initial_equity * config.position_size_pct
-                quantity = round(notional / prices[symbol], 6)
-                order = OrderRequest(symbol=symbol, side=side, quantity=quantity, price=prices[symbol])
-                trade = execution.submit_order(order)
-                if trade:
-                    pnl = portfolio.update_with_trade(
-                        symbol,
-                        "LONG" if side == "BUY" else "SHORT",
-                        trade.price,
-                        trade.quantity,
-                        config.leverage,
-                    )
-                    risk.record_trade_pnl(pnl)
-                    storage.record_event(
-                        "INFO",
-                        "TRADE",
-                        f"Trade executed {side} {symbol}",
-                        {"price": trade.price, "qty": trade.quantity, "pnl": pnl},
-                    )
-
-        equity = portfolio.total_equity(prices)
-        heartbeat_timestamp = clock.now().isoformat()
-        positions_snapshot = [
-            {
-                "symbol": position.symbol,
-                "side": position.side,
-                "entry_price": position.entry_price,
-                "quantity": position.quantity,
-                "leverage": position.leverage,
-                "mark_price": prices.get(symbol, position.entry_price),
-                "unrealized_pnl": position.unrealized_pnl(prices.get(symbol, position.entry_price)),
-            }
-            for symbol, position in portfolio.positions.items()
-        ]
-        storage.record_equity(
-            EquityRecord(
-                timestamp=heartbeat_timestamp,
-                equity=equity,
-                realized_pnl=portfolio.realized_pnl,
-                unrealized_pnl=portfolio.unrealized_pnl(prices),
-            )
-        )
-        storage.replace_positions(heartbeat_timestamp, positions_snapshot)
-        storage.record_heartbeat(heartbeat_timestamp)
-        time.sleep(config.poll_interval_seconds)
+
+            with storage.batch():
+                engine.on_ticks(ticks)
+                with metrics.stage("snapshot"):
+                    engine.record_snapshot()
+
+            if time.monotonic() - last_saved >= config.state.snapshot_interval_seconds:
+                save_state(engine)
+                last_saved = time.monotonic()
+            metrics.loop_finished(time.perf_counter() - started - waited)
+    finally:
+        feed.stop()
+        save_state(engine)
+        engine.close()
+        if retention:
+            retention.stop()
+        if metrics_server:
+            metrics_server.stop()
+        storage.close()
+
+
+async def run_engine_async(config: AppConfig, logger) -> None:
+    loop = asyncio.get_running_loop()
+    storage_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="storage")
+    feed_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="market-data")
+    storage = await loop.run_in_executor(storage_executor, Storage.from_config, config.storage)
+    client = BinanceClient(config.mode)
+
+    if not await loop.run_in_executor(storage_executor, sync_positions_or_halt, config, client, storage, logger):
+        await loop.run_in_executor(storage_executor, storage.close)
+        return
+
+    writes: asyncio.Queue = asyncio.Queue()
+    ticks: asyncio.Queue = asyncio.Queue()
+    storage_queue = StorageQueue(loop, writes, build_event_coalescer(config.events))
+    metrics = EngineMetrics(config.poll_interval_seconds)
+    storage.metrics = metrics
+    engine = build_engine(config, storage_queue, client, AsyncTradingEngine, metrics=metrics)
+    replayed = recover(engine)
+    logger.info(
+        "Recovered state: realized PnL %.2f, %d positions, %d journal trades replayed",
+        engine.portfolio.realized_pnl,
+        len(engine.portfolio.positions),
+        replayed,
+    )
+    warmed = warm_start(engine, client)
+    if warmed:
+        logger.info("Strategy state warmed: %s", warmed)
+    engine.start()
+    retention = build_retention_worker(config, storage)
+    if retention:
+        retention.start()
+    metrics_server = build_metrics_server(config.metrics, metrics)
+    if metrics_server:
+        metrics_server.start()
+    feed = build_feed(config, client)
+    stopped = asyncio.Event()
+    CONTROL_DIR.mkdir(parents=True, exist_ok=True)
+
+    async def market_data() -> None:
+        while not stopped.is_set():
+            waited = time.perf_counter()
+            try:
+                batch = await loop.run_in_executor(feed_executor, feed.next_ticks, config.poll_interval_seconds)
+            except Exception as exc:
+                if storage_queue.record_event("ERROR", "PRICE_FETCH", str(exc), {}):
+                    logger.error("Price fetch failed: %s", exc)
+                continue
+            metrics.observe("fetch", time.perf_counter() - waited)
+            if not batch and feed.closed:
+                logger.info("Market data feed closed. Shutting down.")
+                storage_queue.record_event("INFO", "ENGINE_STOP", "Market data feed closed", {})
+                stopped.set()
+                return
+            await ticks.put(batch)
+
+    async def strategy() -> None:
+        last_saved = time.monotonic()
+        cancelled = False
+        while not stopped.is_set():
+            if should_stop():
+                logger.warning("Stop flag detected. Shutting down.")
+                storage_queue.record_event("WARN", "ENGINE_STOP", "Stop flag detected", {})
+                stopped.set()
+                return
+
+            started = time.perf_counter()
+            with metrics.stage("risk"):
+                update_kill_switch(engine.risk)
+                engine.check_risk()
+            waited = time.perf_counter()
+            try:
+                batch = await asyncio.wait_for(ticks.get(), timeout=config.poll_interval_seconds)
+            except asyncio.TimeoutError:
+                batch = []
+            waited = time.perf_counter() - waited
+            if not engine.risk.state.kill_switch:
+                cancelled = False
+            elif not cancelled and config.mode != "paper":
+                await cancel_open_orders(loop, client, config.symbols, storage_queue, logger)
+                cancelled = True
+            engine.on_ticks(batch)
+            with metrics.stage("snapshot"):
+                engine.record_snapshot()
+            if time.monotonic() - last_saved >= config.state.snapshot_interval_seconds:
+                save_state(engine)
+                last_saved = time.monotonic()
+            metrics.loop_finished(time.perf_counter() - started - waited)
+
+    logger.info("Async engine started in %s mode (%s feed)", config.mode, config.market_data.feed)
+    storage_queue.record_event("INFO", "ENGINE_START", f"Engine started ({config.mode}, async)", {})
+    feed.start()
+    writer = asyncio.create_task(storage_writer(loop, storage_executor, storage, writes))
+    dispatcher = asyncio.create_task(engine.dispatch_orders())
+    try:
+        await asyncio.gather(market_data(), strategy())
+        await engine.drain()
+    finally:
+        feed.stop()
+        save_state(engine)
+        engine.close()
+        dispatcher.cancel()
+        if retention:
+            await loop.run_in_executor(None, retention.stop)
+        if metrics_server:
+            metrics_server.stop()
+        storage_queue.close()
+        await writer
+        await loop.run_in_executor(storage_executor, storage.close)
+        storage_executor.shutdown()
+        feed_executor.shutdown(wait=False)
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Binance USDT-M Futures trading engine")
     parser.add_argument("--config", default="config.yaml", help="Path to config.yaml")
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Run market data, orders and storage writes as concurrent asyncio tasks",
+    )
     args = parser.parse_args()
 
-    run_engine(args.config)
+    run_engine(args.config, use_async=args.use_async)
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import argparse
+import itertools
+import os
+import random
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from multiprocessing import shared_memory
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backtest import read_klines, symbol_from_path
+from core.config import AppConfig, StrategyConfig, load_config
+from core.logger import setup_logger
+from core.storage import Storage, SweepResultRecord
+from trading.strategy_ema import EMAStrategy
+
+SECONDS_PER_YEAR = 365 * 24 * 3600
+
+
+@dataclass
+class SweepSettings:
+    initial_equity: float
+    position_size_pct: float
+    leverage: int
+    slippage_pct: float
+    periods_per_year: float
+    fee_rate: float = 0.0
+
+    @classmethod
+    def from_config(cls, config: AppConfig, periods_per_year: float) -> "SweepSettings":
+        return cls(
+            initial_equity=config.initial_equity,
+            position_size_pct=config.position_size_pct,
+            leverage=config.leverage,
+            slippage_pct=config.slippage_pct,
+            periods_per_year=periods_per_year,
+            fee_rate=config.fills.fee_rate,
+        )
+
+
+@dataclass
+class SweepResult:
+    strategy: StrategyConfig
+    trades: int
+    pnl: float
+    sharpe: float
+    max_drawdown: float
+
+
+def evaluate(prices: np.ndarray, strategy: StrategyConfig, settings: SweepSettings) -> SweepResult:
+    signals = EMAStrategy(strategy.fast_period, strategy.slow_period).generate_signals_bulk("", prices)
+    events = np.flatnonzero(signals)
+    entries, exits = events[0::2], events[1::2]
+    directions = signals[entries].astype(np.float64)
+    slippage = settings.slippage_pct
+
+    entry_fills = prices[entries] * (1 + slippage * directions)
+    notional = settings.initial_equity * settings.position_size_pct
+    quantity = np.round(notional / prices[entries], 6)
+    exposure = quantity * settings.leverage * directions
+    exit_fills = prices[exits] * (1 - slippage * directions[: len(exits)])
+    trade_pnl = (exit_fills - entry_fills[: len(exits)]) * exposure[: len(exits)]
+    entry_fees = settings.fee_rate * quantity * entry_fills
+    exit_fees = settings.fee_rate * quantity[: len(exits)] * exit_fills
+
+    n = len(prices)
+    held = np.zeros(n + 1)
+    cost = np.zeros(n + 1)
+    realized = np.zeros(n + 1)
+    np.add.at(held, entries, exposure)
+    np.add.at(held, exits, -exposure[: len(exits)])
+    np.add.at(cost, entries, exposure * entry_fills)
+    np.add.at(cost, exits, -(exposure * entry_fills)[: len(exits)])
+    np.add.at(realized, entries, -entry_fees)
+    np.add.at(realized, exits, trade_pnl - exit_fees)
+    held, cost, realized = np.cumsum(held)[:n], np.cumsum(cost)[:n], np.cumsum(realized)[:n]
+    equity = settings.initial_equity + realized + held * prices - cost
+
+    returns = np.diff(equity) / equity[:-1] if n > 1 else np.zeros(0)
+    deviation = returns.std() if len(returns) else 0.0
+    sharpe = float(returns.mean() / deviation * np.sqrt(settings.periods_per_year)) if deviation > 0 else 0.0
+    peaks = np.maximum.accumulate(equity)
+    max_drawdown = float(np.max((peaks - equity) / peaks)) if n else 0.0
+    return SweepResult(
+        strategy=strategy,
+        trades=len(entries) + len(exits),
+        pnl=float(equity[-1] - settings.initial_equity) if n else 0.0,
+        sharpe=sharpe,
+        max_drawdown=max_drawdown,
+    )
+
+
+_worker_memory: Optional[shared_memory.SharedMemory] = None
+_worker_prices: Optional[np.ndarray] = None
+
+
+def _attach(name: str, length: int) -> None:
+    global _worker_memory, _worker_prices
+    _worker_memory = shared_memory.SharedMemory(name=name)
+    _worker_prices = np.ndarray((length,), dtype=np.float64, buffer=_worker_memory.buf)
+
+
+def _evaluate_shared(task: Tuple[StrategyConfig, SweepSettings]) -> SweepResult:
+    strategy, settings = task
+    return evaluate(_worker_prices, strategy, settings)
+
+
+def grid(fast_periods: Sequence[int], slow_periods: Sequence[int], name: str = "ema_crossover") -> List[StrategyConfig]:
+    return [
+        StrategyConfig(name=name, fast_period=fast, slow_period=slow)
+        for fast, slow in itertools.product(fast_periods, slow_periods)
+        if fast < slow
+    ]
+
+
+def random_sample(candidates: List[StrategyConfig], samples: int, seed: Optional[int] = None) -> List[StrategyConfig]:
+    return random.Random(seed).sample(candidates, min(samples, len(candidates)))
+
+
+def run_sweep(
+    prices: np.ndarray,
+    candidates: List[StrategyConfig],
+    settings: SweepSettings,
+    workers: Optional[int] = None,
+) -> List[SweepResult]:
+    prices = np.ascontiguousarray(prices, dtype=np.float64)
+    memory = shared_memory.SharedMemory(create=True, size=max(prices.nbytes, 1))
+    try:
+        np.ndarray(prices.shape, dtype=np.float64, buffer=memory.buf)[:] = prices
+        workers = workers or os.cpu_count() or 1
+        chunksize = max(1, len(candidates) // (workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_attach, initargs=(memory.name, len(prices))
+        ) as executor:
+            results = list(
+                executor.map(_evaluate_shared, [(c, settings) for c in candidates], chunksize=chunksize)
+            )
+    finally:
+        memory.close()
+        memory.unlink()
+    return sorted(results, key=lambda result: result.sharpe, reverse=True)
+
+
+def parse_range(value: str) -> List[int]:
+    parts = [int(part) for part in value.split(":")]
+    if len(parts) == 1:
+        return parts
+    start, stop = parts[0], parts[1]
+    step = parts[2] if len(parts) > 2 else 1
+    return list(range(start, stop + 1, step))
+
+
+def periods_per_year(timestamps: np.ndarray) -> float:
+    if len(timestamps) < 2:
+        return 1.0
+    step = float(np.median(np.diff(timestamps)))
+    return SECONDS_PER_YEAR / step if step > 0 else 1.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sweep EMA fast/slow periods over historical klines")
+    parser.add_argument("--config", default="config.yaml", help="Path to config.yaml")
+    parser.add_argument("--data", required=True, help="Kline CSV/Parquet file, as SYMBOL=path or BTCUSDT-1m-*.csv")
+    parser.add_argument("--fast", default="5:30", help="Fast periods as start:stop[:step]")
+    parser.add_argument("--slow", default="10:100:5", help="Slow periods as start:stop[:step]")
+    parser.add_argument("--search", choices=["grid", "random"], default="grid")
+    parser.add_argument("--samples", type=int, default=50, help="Combinations evaluated by random search")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--db", default="data/backtest.db", help="SQLite file the results table is written to")
+    parser.add_argument("--top", type=int, default=10, help="Rows to print")
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    logger = setup_logger("optimize", config.logging.level, config.logging.dir)
+    if config.fills.model != "slippage":
+        logger.warning(
+            "Sweep fills at price * (1 ± slippage_pct) and ignores fills.model=%s; results will differ from backtests",
+            config.fills.model,
+        )
+    symbol, sep, path = args.data.partition("=")
+    if not sep:
+        symbol, path = symbol_from_path(args.data), args.data
+
+    bars = list(read_klines(path, symbol))
+    timestamps = np.fromiter((bar[0] for bar in bars), dtype=np.float64, count=len(bars))
+    prices = np.fromiter((bar[2] for bar in bars), dtype=np.float64, count=len(bars))
+    del bars
+
+    candidates = grid(parse_range(args.fast), parse_range(args.slow), config.strategy.name)
+    if args.search == "random":
+        candidates = random_sample(candidates, args.samples, args.seed)
+    settings = SweepSettings.from_config(config, periods_per_year(timestamps))
+    logger.info("Evaluating %d combinations over %d bars of %s", len(candidates), len(prices), symbol)
+    results = run_sweep(prices, candidates, settings, args.workers)
+
+    run_id = str(uuid.uuid4())
+    timestamp = datetime.now(timezone.utc).isoformat()
+    storage = Storage.from_config(replace(config.storage, path=args.db, write_behind=False))
+    try:
+        storage.record_sweep_results(
+            SweepResultRecord(
+                run_id=run_id,
+                timestamp=timestamp,
+                symbol=symbol,
+                strategy=result.strategy.name,
+                fast_period=result.strategy.fast_period,
+                slow_period=result.strategy.slow_period,
+                trades=result.trades,
+                pnl=result.pnl,
+                sharpe=result.sharpe,
+                max_drawdown=result.max_drawdown,
+            )
+            for result in results
+        )
+    finally:
+        storage.close()
+
+    logger.info("Sweep %s written to %s", run_id, args.db)
+    for result in results[: args.top]:
+        logger.info(
+            "fast=%d slow=%d trades=%d pnl=%.2f sharpe=%.3f max_drawdown=%.2f%%",
+            result.strategy.fast_period,
+            result.strategy.slow_period,
+            result.trades,
+            result.pnl,
+            result.sharpe,
+            result.max_drawdown * 100,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from core.storage import BarRecord, EquityRecord, EventCoalescer, EventRecord, OrderRecord, Storage, TradeRecord
+from trading.engine import TradingEngine
+from trading.execution import OrderRequest
+
+StorageWrite = Tuple[str, Tuple[Any, ...]]
+
+
+class StorageQueue:
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        queue: "asyncio.Queue[StorageWrite | None]",
+        events: Optional[EventCoalescer] = None,
+    ) -> None:
+        self._loop = loop
+        self._queue = queue
+        self.events = events
+
+    def _put(self, name: str, *args: Any) -> None:
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, (name, args))
+
+    def record_event(self, level: str, event_type: str, message: str, metadata: Dict[str, Any]) -> bool:
+        if self.events is None:
+            self._put("record_event", level, event_type, message, metadata)
+            return True
+        record = EventRecord(self.events.clock.now().isoformat(), level, event_type, message, metadata)
+        admitted = self.events.admit(record)
+        self.flush_events()
+        if admitted:
+            self._put("record_events", [record])
+        return admitted
+
+    def flush_events(self, force: bool = False) -> None:
+        if self.events is not None:
+            records = self.events.due(force)
+            if records:
+                self._put("record_events", records)
+
+    def record_order(self, record: OrderRecord) -> None:
+        self._put("record_order", record)
+
+    def record_trade(self, record: TradeRecord) -> None:
+        self._put("record_trade", record)
+
+    def record_equity(self, record: EquityRecord) -> None:
+        self._put("record_equity", record)
+
+    def replace_positions(self, timestamp: str, positions: Iterable[Dict[str, Any]]) -> None:
+        self._put("replace_positions", timestamp, list(positions))
+
+    def record_bars(self, records: Iterable[BarRecord]) -> None:
+        self._put("record_bars", list(records))
+
+    def record_heartbeat(self, timestamp: str) -> None:
+        self.flush_events()
+        self._put("record_heartbeat", timestamp)
+
+    def close(self) -> None:
+        self.flush_events(force=True)
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, None)
+
+
+def apply_writes(storage: Storage, writes: List[StorageWrite]) -> None:
+    with storage.batch():
+        for name, args in writes:
+            getattr(storage, name)(*args)
+
+
+async def storage_writer(
+    loop: asyncio.AbstractEventLoop, executor, storage: Storage, queue: "asyncio.Queue[StorageWrite | None]"
+) -> None:
+    while True:
+        item = await queue.get()
+        writes: List[StorageWrite] = []
+        done = item is None
+        if item is not None:
+            writes.append(item)
+        while not queue.empty():
+            item = queue.get_nowait()
+            if item is None:
+                done = True
+            else:
+                writes.append(item)
+        if writes:
+            await loop.run_in_executor(executor, apply_writes, storage, writes)
+        if done:
+            return
+
+
+class AsyncTradingEngine(TradingEngine):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.order_queue: "asyncio.Queue[Tuple[OrderRequest, bool]]" = asyncio.Queue()
+        self.pending: Dict[str, int] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._inflight: Set[asyncio.Task] = set()
+
+    def submit(self, order: OrderRequest, closing: bool = False) -> None:
+        if self.orders is not None:
+            super().submit(order, closing)
+            return
+        self.record_order_latency()
+        self.pending[order.symbol] = self.pending.get(order.symbol, 0) + 1
+        self.order_queue.put_nowait((order, closing))
+
+    def has_open_orders(self, symbol: str) -> bool:
+        return bool(self.pending.get(symbol)) or super().has_open_orders(symbol)
+
+    async def dispatch_orders(self) -> None:
+        while True:
+            order, closing = await self.order_queue.get()
+            task = asyncio.create_task(self.execute(order, closing))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def execute(self, order: OrderRequest, closing: bool) -> None:
+        lock = self._locks.setdefault(order.symbol, asyncio.Lock())
+        async with lock:
+            try:
+                trade = await asyncio.to_thread(self.execute_order, order)
+            except Exception as exc:
+                self.storage.record_event("ERROR", "ORDER_FAIL", str(exc), {"symbol": order.symbol})
+                trade = None
+            finally:
+                self.pending[order.symbol] -= 1
+        if trade:
+            self.apply_trade(order, trade, closing)
+
+    async def drain(self) -> None:
+        while not self.order_queue.empty() or self._inflight:
+            if self._inflight:
+                await asyncio.gather(*list(self._inflight), return_exceptions=True)
+            else:
+                await asyncio.sleep(0)
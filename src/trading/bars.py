@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.config import BarsConfig
+from core.market_store import MarketDataStore
+from core.storage import BarRecord
+
+INTERVAL_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_interval(value: str) -> int:
+    value = value.strip().lower()
+    unit = INTERVAL_UNITS.get(value[-1:])
+    if unit is None or not value[:-1].isdigit() or int(value[:-1]) <= 0:
+        raise ValueError(f"Unsupported bar interval: {value!r} (expected e.g. 1s, 1m, 5m, 1h)")
+    return int(value[:-1]) * unit
+
+
+def interval_label(seconds: int) -> str:
+    for unit, size in sorted(INTERVAL_UNITS.items(), key=lambda item: -item[1]):
+        if seconds % size == 0:
+            return f"{seconds // size}{unit}"
+    raise ValueError(f"Unsupported bar interval: {seconds} seconds")
+
+
+class BarAggregator:
+    def __init__(self, intervals: Iterable[int]) -> None:
+        self.intervals = sorted(set(intervals))
+        self._open: Dict[Tuple[str, int], BarRecord] = {}
+        self._closed: Dict[Tuple[str, int], float] = {}
+
+    def update(self, symbol: str, timestamp: float, price: float, volume: float = 0.0) -> List[BarRecord]:
+        closed: List[BarRecord] = []
+        for interval in self.intervals:
+            key = (symbol, interval)
+            start = timestamp - timestamp % interval
+            bar = self._open.get(key)
+            if bar is not None and bar.start == start:
+                if price > bar.high:
+                    bar.high = price
+                elif price < bar.low:
+                    bar.low = price
+                bar.close = price
+                bar.volume += volume
+                bar.ticks += 1
+                continue
+            if (bar is not None and start < bar.start) or start <= self._closed.get(key, float("-inf")):
+                continue
+            if bar is not None:
+                closed.append(bar)
+                self._closed[key] = bar.start
+            self._open[key] = BarRecord(symbol, interval, start, price, price, price, price, volume, 1)
+        return closed
+
+    def current(self, symbol: str, interval: int) -> Optional[BarRecord]:
+        return self._open.get((symbol, interval))
+
+
+def build_aggregator(config: BarsConfig) -> Optional[BarAggregator]:
+    intervals = [parse_interval(value) for value in config.intervals]
+    if config.signal_interval:
+        intervals.append(parse_interval(config.signal_interval))
+    return BarAggregator(intervals) if intervals else None
+
+
+def store_bars(store: MarketDataStore, bars: Iterable[BarRecord]) -> None:
+    groups: Dict[Tuple[str, int], List[BarRecord]] = {}
+    for bar in bars:
+        groups.setdefault((bar.symbol, bar.interval), []).append(bar)
+    for (symbol, interval), group in groups.items():
+        store.append(
+            symbol,
+            interval_label(interval),
+            {
+                "timestamp": [bar.start + bar.interval for bar in group],
+                "open": [bar.open for bar in group],
+                "high": [bar.high for bar in group],
+                "low": [bar.low for bar in group],
+                "close": [bar.close for bar in group],
+                "volume": [bar.volume for bar in group],
+            },
+        )
@@ -0,0 +1,404 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import Any, Dict, Iterable, List, Optional, Type
+
+from core.clock import Clock
+from core.config import AppConfig
+from core.journal import TradeJournal
+from core.market_store import MarketDataStore
+from core.metrics import EngineMetrics
+from core.storage import BarRecord, EquityRecord, Storage, TradeRecord
+from exchange.binance_client import BinanceClient
+from exchange.market_data import Tick
+from trading.bars import BarAggregator, build_aggregator, parse_interval, store_bars
+from trading.execution import SIMULATED_MODES, ExecutionEngine, OrderRequest
+from trading.fills import build_fill_model
+from trading.orders import OrderManager, build_order_manager
+from trading.portfolio import Portfolio, Position
+from trading.price_history import PriceHistory, capacity_for, load_history
+from trading.risk import RiskLimits, RiskManager, RiskState
+from trading.registry import build_strategy
+from trading.strategy_base import Signal, Strategy
+
+
+class TradingEngine:
+    def __init__(
+        self,
+        config: AppConfig,
+        storage: Storage,
+        execution: ExecutionEngine,
+        portfolio: Portfolio,
+        risk: RiskManager,
+        strategy: Strategy,
+        price_history: PriceHistory,
+        clock: Clock,
+        bars: Optional[BarAggregator] = None,
+        market_store: Optional[MarketDataStore] = None,
+        journal: Optional[TradeJournal] = None,
+        orders: Optional[OrderManager] = None,
+        metrics: Optional[EngineMetrics] = None,
+    ) -> None:
+        self.config = config
+        self.storage = storage
+        self.execution = execution
+        self.portfolio = portfolio
+        self.risk = risk
+        self.strategy = strategy
+        self.price_history = price_history
+        self.clock = clock
+        self.bars = bars
+        self.market_store = market_store
+        self.journal = journal
+        self.orders = orders
+        self.metrics = metrics
+        self._tick_started: Optional[float] = None
+        self.signal_interval = parse_interval(config.bars.signal_interval) if config.bars.signal_interval else 0
+        self.symbols = set(config.symbols)
+        self.prices: Dict[str, float] = {}
+        self.can_trade = True
+        self.block_reason = "OK"
+        self.trade_count = 0
+
+    def check_risk(self) -> None:
+        self.can_trade, self.block_reason = self.risk.can_trade()
+        if not self.can_trade:
+            self.storage.record_event("WARN", "RISK_BLOCK", self.block_reason, {})
+
+    def start(self) -> None:
+        if self.orders is not None:
+            self.orders.start()
+
+    def on_ticks(self, ticks: List[Tick]) -> None:
+        if self.metrics is not None:
+            self._tick_started = perf_counter()
+            self.metrics.increment("ticks", len(ticks))
+        self.apply_fills()
+        ticks = [tick for tick in ticks if tick.symbol in self.symbols]
+        for tick in ticks:
+            self.prices[tick.symbol] = tick.price
+
+        if self.risk.state.kill_switch and self.config.risk.kill_switch_close_positions:
+            self.close_positions()
+
+        now = self.clock.now()
+        max_age = self.config.max_price_age_seconds
+        fresh: List[Tick] = []
+        stale: List[str] = []
+        for tick in ticks:
+            if max_age > 0 and (now - tick.timestamp).total_seconds() > max_age:
+                stale.append(tick.symbol)
+            else:
+                fresh.append(tick)
+        if stale:
+            self.storage.record_event("WARN", "PRICE_STALE", "Stale prices skipped", {"symbols": stale})
+        self.evaluate(fresh)
+        self._tick_started = None
+
+    def evaluate(self, ticks: List[Tick]) -> None:
+        for tick in ticks:
+            self.on_price(tick.symbol, tick.timestamp.timestamp(), tick.price)
+
+    def on_price(self, symbol: str, timestamp: float, price: float) -> None:
+        if self.bars is not None:
+            closed = self.close_bars(symbol, timestamp, price)
+            if self.signal_interval:
+                for bar in closed:
+                    self.on_bar_close(bar, price)
+                return
+        self.price_history.append(symbol, timestamp, price)
+        for signal in self.signals_for(symbol, price):
+            self.handle_signal(signal, price)
+
+    def signals_for(self, symbol: str, price: float) -> List[Signal]:
+        if self.metrics is None:
+            return self.strategy.update(symbol, price)
+        with self.metrics.stage("strategy"):
+            return self.strategy.update(symbol, price)
+
+    def close_bars(self, symbol: str, timestamp: float, price: float) -> List[BarRecord]:
+        closed = self.bars.update(symbol, timestamp, price)
+        if not closed:
+            return closed
+        if self.config.bars.persist:
+            self.storage.record_bars(closed)
+        if self.market_store is not None:
+            store_bars(self.market_store, closed)
+        return [bar for bar in closed if bar.interval == self.signal_interval]
+
+    def on_bar_close(self, bar: BarRecord, price: float) -> None:
+        self.price_history.append(bar.symbol, bar.start + bar.interval, bar.close)
+        for signal in self.signals_for(bar.symbol, bar.close):
+            self.handle_signal(signal, price)
+
+    def handle_signal(self, signal: Signal, price: float) -> None:
+        symbol = signal.symbol
+        self.storage.record_event(
+            "INFO",
+            "SIGNAL",
+            signal.reason,
+            {"symbol": symbol, "side": signal.side, "price": price},
+        )
+        if not self.can_trade:
+            self.storage.record_event(
+                "INFO",
+                "SIGNAL_SKIPPED",
+                f"Signal skipped: {self.block_reason}",
+                {"symbol": symbol, "side": signal.side},
+            )
+            return
+
+        if self.has_open_orders(symbol):
+            self.storage.record_event(
+                "INFO",
+                "SIGNAL_SKIPPED",
+                "Signal skipped: order in flight",
+                {"symbol": symbol, "side": signal.side},
+            )
+            return
+
+        position = self.portfolio.positions.get(symbol)
+        if position is not None and position.side != ("LONG" if signal.side == "BUY" else "SHORT"):
+            quantity = position.quantity
+        else:
+            quantity = round(self.config.initial_equity * self.config.position_size_pct / price, 6)
+        self.submit(OrderRequest(symbol=symbol, side=signal.side, quantity=quantity, price=price))
+
+    def close_positions(self) -> None:
+        for symbol, position in list(self.portfolio.positions.items()):
+            if self.has_open_orders(symbol):
+                continue
+            self.submit(self.close_order(symbol, position), closing=True)
+
+    def has_open_orders(self, symbol: str) -> bool:
+        return self.orders is not None and self.orders.open_count(symbol) > 0
+
+    def close_order(self, symbol: str, position: Position) -> OrderRequest:
+        return OrderRequest(
+            symbol=symbol,
+            side="SELL" if position.side == "LONG" else "BUY",
+            quantity=position.quantity,
+            price=self.prices.get(symbol, position.entry_price),
+        )
+
+    def submit(self, order: OrderRequest, closing: bool = False) -> None:
+        self.record_order_latency()
+        if self.orders is not None:
+            self.orders.submit(order, closing)
+            return
+        trade = self.execute_order(order)
+        if trade:
+            self.apply_trade(order, trade, closing)
+
+    def execute_order(self, order: OrderRequest) -> Optional[TradeRecord]:
+        if self.metrics is None:
+            return self.execution.submit_order(order)
+        with self.metrics.stage("order"):
+            return self.execution.submit_order(order)
+
+    def record_order_latency(self) -> None:
+        if self.metrics is not None:
+            self.metrics.increment("orders")
+            if self._tick_started is not None:
+                self.metrics.observe("tick_to_order", perf_counter() - self._tick_started)
+
+    def apply_fills(self) -> int:
+        if self.orders is None:
+            return 0
+        completed = self.orders.poll()
+        for order, trade, closing in completed:
+            self.apply_trade(order, trade, closing)
+        return len(completed)
+
+    def apply_trade(self, order: OrderRequest, trade: TradeRecord, closing: bool = False) -> float:
+        side = "LONG" if order.side == "BUY" else "SHORT"
+        fee = float(trade.metadata.get("fee", 0.0))
+        gross = self.portfolio.update_with_trade(
+            order.symbol, side, trade.price, trade.quantity, self.config.leverage, fee
+        )
+        pnl = gross - fee
+        self.risk.record_trade_pnl(pnl)
+        if self.journal is not None:
+            self.journal.append(
+                {
+                    "timestamp": self.clock.now().timestamp(),
+                    "symbol": order.symbol,
+                    "side": side,
+                    "price": trade.price,
+                    "quantity": trade.quantity,
+                    "leverage": self.config.leverage,
+                    "fee": fee,
+                }
+            )
+        self.trade_count += 1
+        if closing:
+            self.storage.record_event(
+                "WARN",
+                "KILL_SWITCH_CLOSE",
+                f"Closed position {order.symbol}",
+                {"symbol": order.symbol, "price": trade.price, "qty": trade.quantity, "pnl": pnl, "fee": fee},
+            )
+        else:
+            self.storage.record_event(
+                "INFO",
+                "TRADE",
+                f"Trade executed {order.side} {order.symbol}",
+                {"symbol": order.symbol, "price": trade.price, "qty": trade.quantity, "pnl": pnl, "fee": fee},
+            )
+        return pnl
+
+    def replay(self, symbol: str, timestamps: Iterable[float], prices: Iterable[float]) -> None:
+        for timestamp, price in zip(timestamps, prices):
+            self.price_history.append(symbol, timestamp, price)
+            self.strategy.update(symbol, price)
+
+    def state_snapshot(self) -> Dict[str, Any]:
+        return {
+            "timestamp": self.clock.now().timestamp(),
+            "strategy": self.strategy_state(),
+            "account": {
+                "portfolio": self.portfolio.state(),
+                "risk": self.risk.state.to_dict(),
+                "journal_seq": self.journal.seq if self.journal is not None else 0,
+            },
+        }
+
+    def restore_state(self, snapshot: Dict[str, Any]) -> List[str]:
+        strategy = snapshot.get("strategy") or {}
+        history = {symbol: value for symbol, value in strategy.get("history", {}).items() if symbol in self.symbols}
+        indicators = {symbol: value for symbol, value in strategy.get("indicators", {}).items() if symbol in history}
+        self.restore_strategy(history, indicators)
+        return sorted(history)
+
+    def strategy_state(self) -> Dict[str, Any]:
+        return {"history": self.price_history.state(), "indicators": self.strategy.indicators.state()}
+
+    def restore_strategy(self, history: Dict[str, Any], indicators: Dict[str, Any]) -> None:
+        self.price_history.restore(history)
+        self.strategy.indicators.restore(indicators)
+
+    def recover(self, snapshot: Optional[Dict[str, Any]]) -> int:
+        account = (snapshot or {}).get("account") or {}
+        keep_positions = self.config.mode == "paper"
+        if account:
+            self.portfolio.restore(account["portfolio"], positions=keep_positions)
+            self.risk.state = RiskState.from_dict(account["risk"])
+        if self.journal is None:
+            return 0
+        seq = int(account.get("journal_seq", 0))
+        entries = self.journal.read(after=seq)
+        for entry in entries:
+            fee = entry.get("fee", 0.0)
+            gross = self.portfolio.update_with_trade(
+                entry["symbol"],
+                entry["side"],
+                entry["price"],
+                entry["quantity"],
+                entry["leverage"],
+                fee,
+            )
+            self.risk.record_trade_pnl(gross - fee, datetime.fromtimestamp(entry["timestamp"], tz=timezone.utc))
+        if not keep_positions:
+            self.portfolio.positions.clear()
+        self.journal.seq = max(self.journal.seq, seq)
+        return len(entries)
+
+    def close(self) -> None:
+        if self.orders is not None:
+            self.orders.stop()
+            self.apply_fills()
+        if self.journal is not None:
+            self.journal.close()
+
+    def record_snapshot(self) -> None:
+        prices = self.prices
+        equity = self.portfolio.total_equity(prices)
+        heartbeat_timestamp = self.clock.now().isoformat()
+        positions_snapshot = [
+            {
+                "symbol": position.symbol,
+                "side": position.side,
+                "entry_price": position.entry_price,
+                "quantity": position.quantity,
+                "leverage": position.leverage,
+                "mark_price": prices.get(symbol, position.entry_price),
+                "unrealized_pnl": position.unrealized_pnl(prices.get(symbol, position.entry_price)),
+            }
+            for symbol, position in self.portfolio.positions.items()
+        ]
+        self.storage.record_equity(
+            EquityRecord(
+                timestamp=heartbeat_timestamp,
+                equity=equity,
+                realized_pnl=self.portfolio.realized_pnl,
+                unrealized_pnl=self.portfolio.unrealized_pnl(prices),
+            )
+        )
+        self.storage.replace_positions(heartbeat_timestamp, positions_snapshot)
+        self.storage.record_heartbeat(heartbeat_timestamp)
+
+
+def build_engine(
+    config: AppConfig,
+    storage: Storage,
+    client: Optional[BinanceClient],
+    engine_cls: Type[TradingEngine] = TradingEngine,
+    clock: Optional[Clock] = None,
+    mode: Optional[str] = None,
+    metrics: Optional[EngineMetrics] = None,
+) -> TradingEngine:
+    clock = clock or Clock()
+    risk = RiskManager(
+        RiskLimits(
+            daily_loss_limit_pct=config.daily_loss_limit_pct,
+            max_consecutive_losses=config.max_consecutive_losses,
+            cooldown_minutes=config.cooldown_minutes,
+        ),
+        initial_equity=config.initial_equity,
+        clock=clock,
+    )
+    strategy = build_strategy(config.strategies, config.symbols)
+    execution = ExecutionEngine(
+        mode or config.mode,
+        config.slippage_pct,
+        client,
+        storage,
+        clock,
+        build_fill_model(config.fills, config.slippage_pct),
+    )
+    portfolio = Portfolio(config.initial_equity)
+    price_history = PriceHistory(config.symbols, capacity_for(strategy.lookback))
+    strategy.indicators.history = price_history
+    bars = build_aggregator(config.bars)
+    market_store = MarketDataStore(config.market_data.store_path) if config.market_data.store_path else None
+    journal = None
+    if config.state.journal_path:
+        journal = TradeJournal(config.state.journal_path, config.state.journal_fsync)
+    orders = None
+    if client is not None and (mode or config.mode) not in SIMULATED_MODES:
+        orders = build_order_manager(config, client, storage, clock, mode)
+    return engine_cls(
+        config,
+        storage,
+        execution,
+        portfolio,
+        risk,
+        strategy,
+        price_history,
+        clock,
+        bars,
+        market_store,
+        journal,
+        orders,
+        metrics,
+    )
+
+
+def warm_start_history(engine: TradingEngine, symbols: Optional[List[str]] = None) -> Dict[str, int]:
+    if engine.market_store is None:
+        return {}
+    interval = engine.config.bars.signal_interval or engine.config.market_data.store_interval
+    return load_history(
+        engine.price_history, engine.market_store, interval, engine.clock.now().timestamp(), symbols
+    )
@@ -2,13 +2,16 @@ from __future__ import annotations
 
 import uuid
 from dataclasses import dataclass
-from datetime import datetime, timezone
 from typing import Dict, Optional
 
 from binance.exceptions import BinanceAPIException
 
+from core.clock import Clock
 from core.storage import OrderRecord, TradeRecord, Storage
 from exchange.binance_client import BinanceClient
+from trading.fills import FillModel, SlippageFillModel
+
+SIMULATED_MODES = {"paper", "backtest"}
 
 
 @dataclass
@@ -20,45 +23,65 @@ class OrderRequest:
 
 
 class ExecutionEngine:
-    def __init__(self, mode: str, slippage_pct: float, client: BinanceClient, storage: Storage) -> None:
+    def __init__(
+        self,
+        mode: str,
+        slippage_pct: float,
+        client: Optional[BinanceClient],
+        storage: Storage,
+        clock: Optional[Clock] = None,
+        fill_model: Optional[FillModel] = None,
+    ) -> None:
         self.mode = mode
         self.slippage_pct = slippage_pct
         self.client = client
         self.storage = storage
+        self.clock = clock or Clock()
+        self.fill_model = fill_model or SlippageFillModel(slippage_pct)
 
-    @staticmethod
-    def _utc_now() -> str:
-        return datetime.now(timezone.utc).isoformat()
+    def _utc_now(self) -> str:
+        return self.clock.now().isoformat()
 
     def submit_order(self, order: OrderRequest) -> Optional[TradeRecord]:
         order_id = str(uuid.uuid4())
-        if self.mode == "paper":
-            filled_price = order.price * (1 + self.slippage_pct if order.side == "BUY" else 1 - self.slippage_pct)
+        if self.mode in SIMULATED_MODES:
+            fill = self.fill_model.fill(
+                order.symbol, order.side, order.quantity, order.price, self.clock.now().timestamp()
+            )
+            if fill.quantity >= order.quantity:
+                status = "FILLED"
+            elif fill.quantity > 0:
+                status = "PARTIALLY_FILLED"
+            else:
+                status = "EXPIRED"
+            metadata = {"fee": fill.fee, "levels": fill.levels} if fill.fee or fill.levels > 1 else {}
             self.storage.record_order(
                 OrderRecord(
                     timestamp=self._utc_now(),
                     order_id=order_id,
                     symbol=order.symbol,
                     side=order.side,
-                    status="FILLED",
-                    price=filled_price,
+                    status=status,
+                    price=fill.price,
                     quantity=order.quantity,
-                    filled_qty=order.quantity,
+                    filled_qty=fill.quantity,
                     mode=self.mode,
-                    metadata={},
+                    metadata=metadata,
                 )
             )
+            if not fill.quantity:
+                return None
             trade = TradeRecord(
                 timestamp=self._utc_now(),
                 trade_id=str(uuid.uuid4()),
                 order_id=order_id,
                 symbol=order.symbol,
                 side=order.side,
-                price=filled_price,
-                quantity=order.quantity,
+                price=fill.price,
+                quantity=fill.quantity,
                 pnl=0.0,
                 mode=self.mode,
-                metadata={},
+                metadata=metadata,
             )
             self.storage.record_trade(trade)
             return trade
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import json
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Protocol, Tuple
+
+from core.config import FillsConfig
+
+Level = Tuple[float, float]
+
+
+@dataclass
+class OrderBook:
+    timestamp: float
+    bids: List[Level]
+    asks: List[Level]
+
+
+@dataclass
+class Fill:
+    price: float
+    quantity: float
+    fee: float = 0.0
+    timestamp: float = 0.0
+    levels: int = 1
+
+
+class BookSource(Protocol):
+    def levels(self, symbol: str, side: str, mid: float, timestamp: float) -> Optional[Iterable[Level]]:
+        ...
+
+
+class FillModel(Protocol):
+    def fill(self, symbol: str, side: str, quantity: float, price: float, timestamp: float) -> Fill:
+        ...
+
+
+@dataclass
+class SlippageFillModel:
+    slippage_pct: float
+    fee_rate: float = 0.0
+
+    def fill(self, symbol: str, side: str, quantity: float, price: float, timestamp: float) -> Fill:
+        filled_price = price * (1 + self.slippage_pct if side == "BUY" else 1 - self.slippage_pct)
+        return Fill(filled_price, quantity, filled_price * quantity * self.fee_rate, timestamp)
+
+
+@dataclass
+class SyntheticBook:
+    spread_bps: float = 1.0
+    depth_levels: int = 20
+    level_step_bps: float = 1.0
+    level_notional: float = 50_000.0
+    depth_growth: float = 0.1
+    _asks: List[Level] = field(init=False, repr=False)
+    _bids: List[Level] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        offsets = [(self.spread_bps / 2 + i * self.level_step_bps) / 10_000 for i in range(self.depth_levels)]
+        notionals = [self.level_notional * (1 + self.depth_growth * i) for i in range(self.depth_levels)]
+        self._asks = [(1 + offset, notional / (1 + offset)) for offset, notional in zip(offsets, notionals)]
+        self._bids = [(1 - offset, notional / (1 - offset)) for offset, notional in zip(offsets, notionals)]
+
+    def levels(self, symbol: str, side: str, mid: float, timestamp: float) -> Iterator[Level]:
+        for factor, notional in self._asks if side == "BUY" else self._bids:
+            yield mid * factor, notional / mid
+
+    def book(self, symbol: str, mid: float, timestamp: float) -> OrderBook:
+        return OrderBook(
+            timestamp, list(self.levels(symbol, "SELL", mid, timestamp)), list(self.levels(symbol, "BUY", mid, timestamp))
+        )
+
+
+class RecordedBooks:
+    def __init__(self, books: Dict[str, List[OrderBook]]) -> None:
+        self._books = {symbol: sorted(items, key=lambda book: book.timestamp) for symbol, items in books.items()}
+        self._times = {symbol: [book.timestamp for book in items] for symbol, items in self._books.items()}
+
+    def book(self, symbol: str, mid: float, timestamp: float) -> Optional[OrderBook]:
+        times = self._times.get(symbol)
+        if not times:
+            return None
+        index = bisect_right(times, timestamp) - 1
+        return self._books[symbol][index] if index >= 0 else None
+
+    def levels(self, symbol: str, side: str, mid: float, timestamp: float) -> Optional[List[Level]]:
+        book = self.book(symbol, mid, timestamp)
+        if book is None:
+            return None
+        return book.asks if side == "BUY" else book.bids
+
+
+def read_books(path: Path | str) -> RecordedBooks:
+    books: Dict[str, List[OrderBook]] = {}
+    with Path(path).open() as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            book = OrderBook(
+                float(row["timestamp"]),
+                [(float(price), float(qty)) for price, qty in row["bids"]],
+                [(float(price), float(qty)) for price, qty in row["asks"]],
+            )
+            books.setdefault(row["symbol"], []).append(book)
+    return RecordedBooks(books)
+
+
+def walk_book(levels: Iterable[Level], quantity: float, queue_ahead_pct: float = 0.0) -> Tuple[float, float, int]:
+    remaining = quantity
+    cost = 0.0
+    used = 0
+    available_share = 1 - queue_ahead_pct
+    for price, size in levels:
+        available = size * available_share
+        if available <= 0:
+            continue
+        take = available if available < remaining else remaining
+        cost += take * price
+        remaining -= take
+        used += 1
+        if remaining <= 1e-12:
+            remaining = 0.0
+            break
+    filled = quantity - remaining
+    return (cost / filled if filled else 0.0), filled, used
+
+
+@dataclass
+class BookFillModel:
+    source: BookSource
+    fee_rate: float = 0.0004
+    latency_ms: float = 0.0
+    queue_ahead_pct: float = 0.0
+    fallback: Optional[SlippageFillModel] = None
+
+    def fill(self, symbol: str, side: str, quantity: float, price: float, timestamp: float) -> Fill:
+        arrival = timestamp + self.latency_ms / 1000
+        levels = self.source.levels(symbol, side, price, arrival)
+        if levels is None:
+            if self.fallback is not None:
+                return self.fallback.fill(symbol, side, quantity, price, arrival)
+            return Fill(price, 0.0, 0.0, arrival, 0)
+        average, filled, used = walk_book(levels, quantity, self.queue_ahead_pct)
+        return Fill(average, filled, average * filled * self.fee_rate, arrival, used)
+
+
+def build_fill_model(config: FillsConfig, slippage_pct: float) -> FillModel:
+    fallback = SlippageFillModel(slippage_pct, config.fee_rate)
+    if config.model == "slippage":
+        return fallback
+    if config.model == "book":
+        source: BookSource
+        if config.book_path:
+            source = read_books(config.book_path)
+        else:
+            source = SyntheticBook(
+                spread_bps=config.spread_bps,
+                depth_levels=config.depth_levels,
+                level_step_bps=config.level_step_bps,
+                level_notional=config.level_notional,
+                depth_growth=config.depth_growth,
+            )
+        return BookFillModel(source, config.fee_rate, config.latency_ms, config.queue_ahead_pct, fallback)
+    raise ValueError(f"Unsupported fill model: {config.model}")
@@ -0,0 +1,320 @@
+from __future__ import annotations
+
+import math
+from collections import deque
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Deque, Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+from .price_history import PriceHistory
+
+TIE_TOLERANCE = 1e-12
+RESUM_INTERVAL = 4096
+
+
+@dataclass
+class EMA:
+    period: int
+    value: Optional[float] = None
+    count: int = 0
+    previous: Optional[float] = None
+    multiplier: float = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.multiplier = 2 / (self.period + 1)
+
+    def update(self, price: float) -> float:
+        self.previous = self.value
+        if self.value is None:
+            self.value = price
+        else:
+            self.value = (price - self.value) * self.multiplier + self.value
+        self.count += 1
+        return self.value
+
+    def warm_start(self, prices: Iterable[float]) -> Optional[float]:
+        for price in prices:
+            self.update(price)
+        return self.value
+
+
+@dataclass
+class SMA:
+    period: int
+    value: Optional[float] = None
+    count: int = 0
+    previous: Optional[float] = None
+    prices: Deque[float] = field(default_factory=deque, repr=False)
+    total: float = field(default=0.0, repr=False)
+
+    def update(self, price: float) -> float:
+        self.previous = self.value
+        self.prices.append(price)
+        self.total += price
+        if len(self.prices) > self.period:
+            self.total -= self.prices.popleft()
+        self.count += 1
+        if self.count % RESUM_INTERVAL == 0:
+            self.total = math.fsum(self.prices)
+        self.value = self.total / len(self.prices)
+        return self.value
+
+
+@dataclass
+class RollingStd:
+    period: int
+    value: Optional[float] = None
+    count: int = 0
+    previous: Optional[float] = None
+    prices: Deque[float] = field(default_factory=deque, repr=False)
+    total: float = field(default=0.0, repr=False)
+    squares: float = field(default=0.0, repr=False)
+
+    def update(self, price: float) -> float:
+        self.previous = self.value
+        self.prices.append(price)
+        self.total += price
+        self.squares += price * price
+        if len(self.prices) > self.period:
+            dropped = self.prices.popleft()
+            self.total -= dropped
+            self.squares -= dropped * dropped
+        self.count += 1
+        if self.count % RESUM_INTERVAL == 0:
+            self.total = math.fsum(self.prices)
+            self.squares = math.fsum(p * p for p in self.prices)
+        n = len(self.prices)
+        mean = self.total / n
+        self.value = math.sqrt(max(self.squares / n - mean * mean, 0.0))
+        return self.value
+
+
+@dataclass
+class RSI:
+    period: int
+    value: Optional[float] = None
+    count: int = 0
+    previous: Optional[float] = None
+    last_price: Optional[float] = field(default=None, repr=False)
+    avg_gain: float = field(default=0.0, repr=False)
+    avg_loss: float = field(default=0.0, repr=False)
+
+    def update(self, price: float) -> Optional[float]:
+        self.previous = self.value
+        self.count += 1
+        if self.last_price is None:
+            self.last_price = price
+            return self.value
+        change = price - self.last_price
+        self.last_price = price
+        gain, loss = max(change, 0.0), max(-change, 0.0)
+        changes = self.count - 1
+        if changes <= self.period:
+            self.avg_gain += (gain - self.avg_gain) / changes
+            self.avg_loss += (loss - self.avg_loss) / changes
+        else:
+            self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+            self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+        if changes >= self.period:
+            self.value = 100.0 if self.avg_loss == 0 else 100 - 100 / (1 + self.avg_gain / self.avg_loss)
+        return self.value
+
+
+@dataclass
+class ATR:
+    period: int
+    value: Optional[float] = None
+    count: int = 0
+    previous: Optional[float] = None
+    last_close: Optional[float] = field(default=None, repr=False)
+
+    def update(self, price: float) -> Optional[float]:
+        return self.update_bar(price, price, price)
+
+    def update_bar(self, high: float, low: float, close: float) -> Optional[float]:
+        self.previous = self.value
+        self.count += 1
+        if self.last_close is None:
+            true_range = high - low
+        else:
+            true_range = max(high, self.last_close) - min(low, self.last_close)
+        self.last_close = close
+        if self.count <= self.period:
+            self.value = true_range if self.value is None else self.value + (true_range - self.value) / self.count
+        else:
+            self.value = (self.value * (self.period - 1) + true_range) / self.period
+        return self.value
+
+
+Indicator = Union[EMA, SMA, RollingStd, RSI, ATR]
+
+
+def ema_array(values: np.ndarray, period: int) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    if not len(values):
+        return values.copy()
+    multiplier = 2 / (period + 1)
+    decay = 1 - multiplier
+    if decay <= 0:
+        return values.copy()
+
+    block = int(max(1, min(1024, 200 / -np.log10(decay))))
+    rows = -(-len(values) // block)
+    padded = np.zeros(rows * block)
+    padded[: len(values)] = values
+    blocks = padded.reshape(rows, block)
+    offsets = np.arange(block)
+    partial = multiplier * np.cumsum(blocks * decay ** -offsets, axis=1) * decay**offsets
+
+    starts = np.empty(rows)
+    carry = values[0]
+    gain = decay**block
+    for row, end in enumerate(partial[:, -1].tolist()):
+        starts[row] = carry
+        carry = gain * carry + end
+    return (partial + starts[:, None] * decay ** (offsets + 1)).reshape(-1)[: len(values)]
+
+
+def exact_ema_array(values: np.ndarray, period: int) -> np.ndarray:
+    ema = EMA(period)
+    values = np.asarray(values, dtype=np.float64)
+    return np.fromiter((ema.update(value) for value in values.tolist()), dtype=np.float64, count=len(values))
+
+
+def near_ties(a: np.ndarray, b: np.ndarray, tolerance: float = TIE_TOLERANCE) -> np.ndarray:
+    return np.abs(a - b) <= tolerance * np.maximum(np.abs(a), np.abs(b))
+
+
+IndicatorKey = Tuple[Any, ...]
+
+INDICATORS: Dict[str, Callable[..., Indicator]] = {
+    "ema": EMA,
+    "sma": SMA,
+    "std": RollingStd,
+    "rsi": RSI,
+    "atr": ATR,
+}
+
+
+def indicator_state(indicator: Indicator) -> Dict[str, Any]:
+    state: Dict[str, Any] = {}
+    for item in fields(indicator):
+        if item.init:
+            value = getattr(indicator, item.name)
+            state[item.name] = list(value) if isinstance(value, deque) else value
+    return state
+
+
+def restore_indicator(name: str, state: Dict[str, Any]) -> Indicator:
+    factory = INDICATORS.get(name)
+    if factory is None:
+        raise ValueError(f"Unknown indicator: {name}")
+    return factory(**{key: deque(value) if isinstance(value, list) else value for key, value in state.items()})
+
+
+class IndicatorCache:
+    def __init__(self, history: Optional[PriceHistory] = None, max_idle_ticks: int = 1000) -> None:
+        self.history = history
+        self.max_idle_ticks = max_idle_ticks
+        self._indicators: Dict[str, Dict[IndicatorKey, Indicator]] = {}
+        self._used: Dict[str, Dict[IndicatorKey, int]] = {}
+        self._ticks: Dict[str, int] = {}
+        self._last: Dict[str, float] = {}
+
+    def advance(self, symbol: str, price: float) -> None:
+        tick = self._ticks.get(symbol, 0) + 1
+        self._ticks[symbol] = tick
+        self._last[symbol] = price
+        indicators = self._indicators.get(symbol)
+        if indicators:
+            for indicator in indicators.values():
+                indicator.update(price)
+            if self.max_idle_ticks and tick % self.max_idle_ticks == 0:
+                self.evict(symbol)
+
+    def get(self, symbol: str, name: str, *params: Any) -> Indicator:
+        key = (name, *params)
+        indicators = self._indicators.get(symbol)
+        if indicators is None:
+            indicators = self._indicators[symbol] = {}
+            self._used[symbol] = {}
+        indicator = indicators.get(key)
+        if indicator is None:
+            indicator = indicators[key] = self._create(symbol, name, params)
+        self._used[symbol][key] = self._ticks.get(symbol, 0)
+        return indicator
+
+    def ema(self, symbol: str, period: int) -> EMA:
+        return self.get(symbol, "ema", period)
+
+    def sma(self, symbol: str, period: int) -> SMA:
+        return self.get(symbol, "sma", period)
+
+    def std(self, symbol: str, period: int) -> RollingStd:
+        return self.get(symbol, "std", period)
+
+    def rsi(self, symbol: str, period: int) -> RSI:
+        return self.get(symbol, "rsi", period)
+
+    def atr(self, symbol: str, period: int) -> ATR:
+        return self.get(symbol, "atr", period)
+
+    def tick(self, symbol: str) -> int:
+        return self._ticks.get(symbol, 0)
+
+    def evict(self, symbol: str) -> int:
+        indicators = self._indicators.get(symbol)
+        if not indicators:
+            return 0
+        oldest = self._ticks.get(symbol, 0) - self.max_idle_ticks
+        used = self._used[symbol]
+        idle = [key for key, tick in used.items() if tick < oldest]
+        for key in idle:
+            del indicators[key]
+            del used[key]
+        return len(idle)
+
+    def state(self) -> Dict[str, Any]:
+        return {
+            symbol: {
+                "tick": self._ticks.get(symbol, 0),
+                "last": self._last.get(symbol),
+                "indicators": [[list(key), indicator_state(indicator)] for key, indicator in indicators.items()],
+            }
+            for symbol, indicators in self._indicators.items()
+        }
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        for symbol, entry in state.items():
+            self.reset(symbol)
+            tick = self._ticks[symbol] = int(entry.get("tick", 0))
+            if entry.get("last") is not None:
+                self._last[symbol] = entry["last"]
+            indicators = self._indicators[symbol] = {}
+            used = self._used[symbol] = {}
+            for key, fields_state in entry.get("indicators", []):
+                key = tuple(key)
+                indicators[key] = restore_indicator(key[0], fields_state)
+                used[key] = tick
+
+    def reset(self, symbol: str) -> None:
+        self._indicators.pop(symbol, None)
+        self._used.pop(symbol, None)
+        self._ticks.pop(symbol, None)
+        self._last.pop(symbol, None)
+
+    def _create(self, symbol: str, name: str, params: Tuple[Any, ...]) -> Indicator:
+        factory = INDICATORS.get(name)
+        if factory is None:
+            raise ValueError(f"Unknown indicator: {name}")
+        indicator = factory(*params)
+        if self.history is not None and symbol in self.history and len(self.history.ring(symbol)):
+            for price in self.history.window(symbol).tolist():
+                indicator.update(price)
+        elif symbol in self._last:
+            indicator.update(self._last[symbol])
+        return indicator
+
+    def __len__(self) -> int:
+        return sum(len(indicators) for indicators in self._indicators.values())
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import queue
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from binance.exceptions import BinanceAPIException
+
+from core.clock import Clock
+from core.config import AppConfig
+from core.storage import OrderRecord, Storage, TradeRecord
+from exchange.binance_client import BinanceClient
+from exchange.user_data import (
+    TERMINAL_STATUSES,
+    BinanceUserStream,
+    OrderUpdate,
+    UserDataStream,
+    parse_order_response,
+    parse_order_update,
+)
+from trading.execution import OrderRequest
+
+CompletedOrder = Tuple[OrderRequest, TradeRecord, bool]
+
+
+@dataclass
+class TrackedOrder:
+    client_order_id: str
+    request: OrderRequest
+    closing: bool
+    updated: float
+    status: str = "PENDING_NEW"
+    order_id: str = ""
+    filled_qty: float = 0.0
+    avg_price: float = 0.0
+    fee: float = 0.0
+    fills: int = 0
+
+
+class OrderManager:
+    def __init__(
+        self,
+        client: BinanceClient,
+        stream: Optional[UserDataStream],
+        storage: Storage,
+        clock: Clock,
+        mode: str,
+        client_id_prefix: str = "mvp",
+        reconcile_seconds: float = 10.0,
+    ) -> None:
+        self.client = client
+        self.stream = stream
+        self.storage = storage
+        self.clock = clock
+        self.mode = mode
+        self.client_id_prefix = client_id_prefix
+        self.reconcile_seconds = reconcile_seconds
+        self.orders: Dict[str, TrackedOrder] = {}
+        self._updates: "queue.Queue[OrderUpdate]" = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="orders")
+
+    def start(self) -> None:
+        if self.stream is not None:
+            self.stream.start(self.on_message)
+
+    def stop(self) -> None:
+        if self.stream is not None:
+            self.stream.stop()
+        self._executor.shutdown(wait=True)
+
+    def flush(self) -> None:
+        self._executor.submit(lambda: None).result()
+
+    def on_message(self, message: Dict) -> None:
+        update = parse_order_update(message)
+        if update is not None:
+            self._updates.put(update)
+
+    def open_count(self, symbol: str) -> int:
+        return sum(1 for tracked in self.orders.values() if tracked.request.symbol == symbol)
+
+    def submit(self, order: OrderRequest, closing: bool = False) -> str:
+        client_order_id = f"{self.client_id_prefix}-{uuid.uuid4().hex[:24]}"
+        tracked = TrackedOrder(client_order_id, order, closing, self.clock.now().timestamp())
+        self.orders[client_order_id] = tracked
+        self._record_order(tracked)
+        self._executor.submit(self._send, tracked)
+        return client_order_id
+
+    def poll(self) -> List[CompletedOrder]:
+        completed: List[CompletedOrder] = []
+        while True:
+            try:
+                update = self._updates.get_nowait()
+            except queue.Empty:
+                break
+            result = self.apply(update)
+            if result is not None:
+                completed.append(result)
+        self.reconcile()
+        return completed
+
+    def apply(self, update: OrderUpdate) -> Optional[CompletedOrder]:
+        tracked = self.orders.get(update.client_order_id)
+        if tracked is None:
+            return None
+        tracked.updated = self.clock.now().timestamp()
+        if update.order_id:
+            tracked.order_id = update.order_id
+        if update.filled_qty > tracked.filled_qty + 1e-12:
+            self._record_fill(tracked, update)
+        if update.status == tracked.status or (update.status == "NEW" and tracked.filled_qty):
+            return None
+
+        tracked.status = update.status
+        self._record_order(tracked, update.reason)
+        if update.status not in TERMINAL_STATUSES:
+            return None
+        del self.orders[tracked.client_order_id]
+        if update.status == "REJECTED":
+            self.storage.record_event(
+                "ERROR",
+                "ORDER_FAIL",
+                update.reason or "Order rejected",
+                {"symbol": tracked.request.symbol, "client_order_id": tracked.client_order_id},
+            )
+        if not tracked.filled_qty:
+            return None
+        request = tracked.request
+        trade = TradeRecord(
+            timestamp=self.clock.now().isoformat(),
+            trade_id=tracked.client_order_id,
+            order_id=tracked.client_order_id,
+            symbol=request.symbol,
+            side=request.side,
+            price=tracked.avg_price,
+            quantity=tracked.filled_qty,
+            pnl=0.0,
+            mode=self.mode,
+            metadata={"fee": tracked.fee, "fills": tracked.fills},
+        )
+        filled = OrderRequest(request.symbol, request.side, tracked.filled_qty, tracked.avg_price)
+        return filled, trade, tracked.closing
+
+    def reconcile(self) -> None:
+        now = self.clock.now().timestamp()
+        for tracked in self.orders.values():
+            if now - tracked.updated >= self.reconcile_seconds:
+                tracked.updated = now
+                self._executor.submit(self._query, tracked.request.symbol, tracked.client_order_id)
+
+    def _send(self, tracked: TrackedOrder) -> None:
+        request = tracked.request
+        try:
+            response = self.client.client.futures_create_order(
+                symbol=request.symbol,
+                side=request.side,
+                type="MARKET",
+                quantity=request.quantity,
+                newClientOrderId=tracked.client_order_id,
+            )
+        except BinanceAPIException as exc:
+            self._updates.put(
+                OrderUpdate(
+                    tracked.client_order_id, request.symbol, request.side, "REJECTED", 0.0, 0.0, reason=str(exc)
+                )
+            )
+            return
+        except Exception:
+            return
+        self._updates.put(parse_order_response(response))
+
+    def _query(self, symbol: str, client_order_id: str) -> None:
+        try:
+            response = self.client.client.futures_get_order(symbol=symbol, origClientOrderId=client_order_id)
+        except BinanceAPIException as exc:
+            if exc.code == -2013:
+                self._updates.put(OrderUpdate(client_order_id, symbol, "", "REJECTED", 0.0, 0.0, reason=str(exc)))
+            return
+        except Exception:
+            return
+        self._updates.put(parse_order_response(response))
+
+    def _record_fill(self, tracked: TrackedOrder, update: OrderUpdate) -> None:
+        quantity = update.filled_qty - tracked.filled_qty
+        if update.avg_price:
+            price = (update.filled_qty * update.avg_price - tracked.filled_qty * tracked.avg_price) / quantity
+        else:
+            price = update.last_price or tracked.request.price
+        tracked.fills += 1
+        tracked.fee += update.commission
+        tracked.avg_price = update.avg_price or (tracked.avg_price * tracked.filled_qty + price * quantity) / (
+            tracked.filled_qty + quantity
+        )
+        tracked.filled_qty = update.filled_qty
+        self.storage.record_trade(
+            TradeRecord(
+                timestamp=(update.timestamp or self.clock.now()).isoformat(),
+                trade_id=update.trade_id or f"{tracked.client_order_id}-{tracked.fills}",
+                order_id=tracked.client_order_id,
+                symbol=tracked.request.symbol,
+                side=tracked.request.side,
+                price=price,
+                quantity=quantity,
+                pnl=0.0,
+                mode=self.mode,
+                metadata={"fee": update.commission, "exchange_order_id": tracked.order_id},
+            )
+        )
+
+    def _record_order(self, tracked: TrackedOrder, reason: str = "") -> None:
+        metadata = {"exchange_order_id": tracked.order_id, "closing": tracked.closing}
+        if reason:
+            metadata["reason"] = reason
+        self.storage.record_order(
+            OrderRecord(
+                timestamp=self.clock.now().isoformat(),
+                order_id=tracked.client_order_id,
+                symbol=tracked.request.symbol,
+                side=tracked.request.side,
+                status=tracked.status,
+                price=tracked.avg_price or tracked.request.price,
+                quantity=tracked.request.quantity,
+                filled_qty=tracked.filled_qty,
+                mode=self.mode,
+                metadata=metadata,
+            )
+        )
+
+
+def build_order_manager(
+    config: AppConfig, client: BinanceClient, storage: Storage, clock: Clock, mode: Optional[str] = None
+) -> OrderManager:
+    settings = config.orders
+    stream = BinanceUserStream(mode or config.mode) if settings.user_stream else None
+    return OrderManager(
+        client, stream, storage, clock, mode or config.mode, settings.client_id_prefix, settings.reconcile_seconds
+    )
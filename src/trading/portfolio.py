@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+QUANTITY_EPSILON = 1e-9
 
 
 @dataclass
@@ -12,10 +14,11 @@ class Position:
     quantity: float
     leverage: int
 
-    def unrealized_pnl(self, mark_price: float) -> float:
+    def unrealized_pnl(self, mark_price: float, quantity: Optional[float] = None) -> float:
+        quantity = self.quantity if quantity is None else quantity
         if self.side == "LONG":
-            return (mark_price - self.entry_price) * self.quantity * self.leverage
-        return (self.entry_price - mark_price) * self.quantity * self.leverage
+            return (mark_price - self.entry_price) * quantity * self.leverage
+        return (self.entry_price - mark_price) * quantity * self.leverage
 
 
 class Portfolio:
@@ -24,14 +27,23 @@ class Portfolio:
         self.realized_pnl = 0.0
         self.positions: Dict[str, Position] = {}
 
-    def update_with_trade(self, symbol: str, side: str, price: float, quantity: float, leverage: int) -> float:
+    def update_with_trade(
+        self, symbol: str, side: str, price: float, quantity: float, leverage: int, fee: float = 0.0
+    ) -> float:
         pnl = 0.0
+        self.realized_pnl -= fee
         if symbol in self.positions:
             position = self.positions[symbol]
             if position.side != side:
-                pnl = position.unrealized_pnl(price)
+                closed = min(quantity, position.quantity)
+                pnl = position.unrealized_pnl(price, closed)
                 self.realized_pnl += pnl
-                del self.positions[symbol]
+                position.quantity -= closed
+                if position.quantity <= QUANTITY_EPSILON:
+                    del self.positions[symbol]
+                opened = quantity - closed
+                if opened > QUANTITY_EPSILON:
+                    self.positions[symbol] = Position(symbol, side, price, opened, leverage)
             else:
                 position.entry_price = (position.entry_price + price) / 2
                 position.quantity += quantity
@@ -45,6 +57,19 @@ class Portfolio:
             )
         return pnl
 
+    def state(self) -> Dict[str, Any]:
+        return {
+            "realized_pnl": self.realized_pnl,
+            "positions": [asdict(position) for position in self.positions.values()],
+        }
+
+    def restore(self, state: Dict[str, Any], positions: bool = True) -> None:
+        self.realized_pnl = float(state.get("realized_pnl", 0.0))
+        self.positions = {}
+        if positions:
+            for item in state.get("positions", []):
+                self.positions[item["symbol"]] = Position(**item)
+
     def total_equity(self, mark_prices: Dict[str, float]) -> float:
         unrealized = sum(
             position.unrealized_pnl(mark_prices.get(symbol, position.entry_price))
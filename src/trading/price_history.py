@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from array import array
+from typing import Any, Dict, Iterable, List, Optional
+
+from core.market_store import MarketDataStore
+
+LOOKBACK_MULTIPLE = 4
+
+
+def capacity_for(lookback: int, multiple: int = LOOKBACK_MULTIPLE) -> int:
+    if lookback <= 0:
+        raise ValueError(f"Lookback must be positive, got {lookback}")
+    return lookback * multiple
+
+
+class PriceRing:
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError(f"Capacity must be positive, got {capacity}")
+        self.capacity = capacity
+        self._prices = array("d", bytes(2 * capacity * 8))
+        self._timestamps = array("d", bytes(2 * capacity * 8))
+        self._head = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, timestamp: float, price: float) -> None:
+        head = self._head
+        mirror = head + self.capacity
+        self._prices[head] = self._prices[mirror] = price
+        self._timestamps[head] = self._timestamps[mirror] = timestamp
+        self._head = (head + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def window(self, n: Optional[int] = None) -> memoryview:
+        start, end = self._bounds(n)
+        return memoryview(self._prices)[start:end]
+
+    def timestamps(self, n: Optional[int] = None) -> memoryview:
+        start, end = self._bounds(n)
+        return memoryview(self._timestamps)[start:end]
+
+    def last(self) -> Optional[float]:
+        if not self._size:
+            return None
+        return self._prices[self._head + self.capacity - 1]
+
+    def _bounds(self, n: Optional[int]) -> tuple[int, int]:
+        size = self._size if n is None else max(0, min(n, self._size))
+        end = self._head + self.capacity
+        return end - size, end
+
+
+class PriceHistory:
+    def __init__(self, symbols: Iterable[str], capacity: int) -> None:
+        self.capacity = capacity
+        self._rings: Dict[str, PriceRing] = {symbol: PriceRing(capacity) for symbol in symbols}
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._rings
+
+    def ring(self, symbol: str) -> PriceRing:
+        ring = self._rings.get(symbol)
+        if ring is None:
+            ring = self._rings[symbol] = PriceRing(self.capacity)
+        return ring
+
+    def append(self, symbol: str, timestamp: float, price: float) -> None:
+        self.ring(symbol).append(timestamp, price)
+
+    def extend(self, symbol: str, timestamps: Iterable[float], prices: Iterable[float]) -> None:
+        ring = self.ring(symbol)
+        for timestamp, price in zip(timestamps, prices):
+            ring.append(timestamp, price)
+
+    def window(self, symbol: str, n: Optional[int] = None) -> memoryview:
+        return self.ring(symbol).window(n)
+
+    def symbols(self) -> list[str]:
+        return list(self._rings)
+
+    def state(self) -> Dict[str, Any]:
+        return {
+            symbol: [ring.timestamps().tolist(), ring.window().tolist()]
+            for symbol, ring in self._rings.items()
+            if len(ring)
+        }
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        for symbol, (timestamps, prices) in state.items():
+            self._rings[symbol] = PriceRing(self.capacity)
+            self.extend(symbol, timestamps, prices)
+
+
+def load_history(
+    history: PriceHistory,
+    store: MarketDataStore,
+    interval: str,
+    end: Optional[float] = None,
+    symbols: Optional[List[str]] = None,
+) -> Dict[str, int]:
+    loaded: Dict[str, int] = {}
+    for symbol in history.symbols() if symbols is None else symbols:
+        columns = store.tail(symbol, interval, history.capacity, end)
+        history.extend(symbol, columns["timestamp"].tolist(), columns["close"].tolist())
+        loaded[symbol] = len(columns["timestamp"])
+    return loaded
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.config import StrategyConfig
+from trading.indicators import IndicatorCache
+from trading.strategy_base import Signal, Strategy
+from trading.strategy_ema import EMAStrategy
+
+StrategyFactory = Callable[[StrategyConfig, IndicatorCache], Strategy]
+
+STRATEGIES: Dict[str, StrategyFactory] = {}
+
+
+def register_strategy(name: str, factory: StrategyFactory) -> None:
+    STRATEGIES[name] = factory
+
+
+def create_strategy(config: StrategyConfig, indicators: Optional[IndicatorCache] = None) -> Strategy:
+    factory = STRATEGIES.get(config.name)
+    if factory is None:
+        raise ValueError(f"Unknown strategy: {config.name} (available: {', '.join(sorted(STRATEGIES))})")
+    return factory(config, IndicatorCache() if indicators is None else indicators)
+
+
+register_strategy(
+    "ema_crossover",
+    lambda config, indicators: EMAStrategy(config.fast_period, config.slow_period, indicators),
+)
+
+
+@dataclass
+class StrategySet:
+    members: List[Tuple[Strategy, Optional[FrozenSet[str]]]]
+    indicators: IndicatorCache = field(default_factory=IndicatorCache, repr=False)
+
+    @property
+    def lookback(self) -> int:
+        return max((strategy.lookback for strategy, _ in self.members), default=0)
+
+    def strategies_for(self, symbol: str) -> List[Strategy]:
+        return [strategy for strategy, symbols in self.members if symbols is None or symbol in symbols]
+
+    def generate_signals(self, symbol: str, prices: Sequence[float]) -> List[Signal]:
+        signals: List[Signal] = []
+        for strategy in self.strategies_for(symbol):
+            signals.extend(strategy.generate_signals(symbol, prices))
+        return signals
+
+    def generate_signals_bulk(self, symbol: str, prices: Sequence[float]) -> np.ndarray:
+        combined = np.zeros(len(prices), dtype=np.int8)
+        for strategy in self.strategies_for(symbol):
+            signals = strategy.generate_signals_bulk(symbol, prices)
+            combined = np.where(combined != 0, combined, signals)
+        return combined
+
+    def update(self, symbol: str, price: float) -> List[Signal]:
+        self.indicators.advance(symbol, price)
+        return self.evaluate(symbol)
+
+    def evaluate(self, symbol: str) -> List[Signal]:
+        signals: List[Signal] = []
+        for strategy, symbols in self.members:
+            if symbols is None or symbol in symbols:
+                signals.extend(strategy.evaluate(symbol))
+        return signals
+
+    def warm_start(self, symbol: str, prices: Iterable[float]) -> None:
+        self.indicators.reset(symbol)
+        for price in prices:
+            self.update(symbol, price)
+
+
+def build_strategy(configs: List[StrategyConfig], symbols: Iterable[str]) -> Strategy:
+    universe = set(symbols)
+    if len(configs) == 1 and not configs[0].symbols:
+        return create_strategy(configs[0])
+
+    indicators = IndicatorCache()
+    members: List[Tuple[Strategy, Optional[FrozenSet[str]]]] = []
+    for config in configs:
+        assigned = frozenset(config.symbols) & universe if config.symbols else None
+        if assigned is not None and not assigned:
+            continue
+        members.append((create_strategy(config, indicators), assigned))
+    return StrategySet(members, indicators)
@@ -2,6 +2,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
+from typing import Any, Dict, Optional
+
+from core.clock import Clock
 
 
 @dataclass
@@ -19,8 +22,28 @@ class RiskState:
     daily_pnl: float = 0.0
     day_start: datetime = datetime.now(timezone.utc)
 
-    def reset_if_new_day(self) -> None:
-        now = datetime.now(timezone.utc)
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "kill_switch": self.kill_switch,
+            "consecutive_losses": self.consecutive_losses,
+            "last_loss_time": self.last_loss_time.isoformat() if self.last_loss_time else None,
+            "daily_pnl": self.daily_pnl,
+            "day_start": self.day_start.isoformat(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RiskState":
+        last_loss_time = data.get("last_loss_time")
+        return cls(
+            kill_switch=bool(data.get("kill_switch", False)),
+            consecutive_losses=int(data.get("consecutive_losses", 0)),
+            last_loss_time=datetime.fromisoformat(last_loss_time) if last_loss_time else None,
+            daily_pnl=float(data.get("daily_pnl", 0.0)),
+            day_start=datetime.fromisoformat(data["day_start"]),
+        )
+
+    def reset_if_new_day(self, now: Optional[datetime] = None) -> None:
+        now = now or datetime.now(timezone.utc)
         if now.date() != self.day_start.date():
             self.daily_pnl = 0.0
             self.consecutive_losses = 0
@@ -29,10 +52,11 @@ class RiskState:
 
 
 class RiskManager:
-    def __init__(self, limits: RiskLimits, initial_equity: float) -> None:
+    def __init__(self, limits: RiskLimits, initial_equity: float, clock: Optional[Clock] = None) -> None:
         self.limits = limits
         self.initial_equity = initial_equity
-        self.state = RiskState()
+        self.clock = clock or Clock()
+        self.state = RiskState(day_start=self.clock.now())
 
     def enable_kill_switch(self) -> None:
         self.state.kill_switch = True
@@ -40,12 +64,13 @@ class RiskManager:
     def disable_kill_switch(self) -> None:
         self.state.kill_switch = False
 
-    def record_trade_pnl(self, pnl: float) -> None:
-        self.state.reset_if_new_day()
+    def record_trade_pnl(self, pnl: float, now: Optional[datetime] = None) -> None:
+        now = now or self.clock.now()
+        self.state.reset_if_new_day(now)
         self.state.daily_pnl += pnl
         if pnl < 0:
             self.state.consecutive_losses += 1
-            self.state.last_loss_time = datetime.now(timezone.utc)
+            self.state.last_loss_time = now
         else:
             self.state.consecutive_losses = 0
 
@@ -53,13 +78,13 @@ class RiskManager:
         if not self.state.last_loss_time:
             return False
         cooldown = timedelta(minutes=self.limits.cooldown_minutes)
-        return datetime.now(timezone.utc) < self.state.last_loss_time + cooldown
+        return self.clock.now() < self.state.last_loss_time + cooldown
 
     def daily_loss_limit_hit(self) -> bool:
         return self.state.daily_pnl <= -(self.initial_equity * self.limits.daily_loss_limit_pct)
 
     def can_trade(self) -> tuple[bool, str]:
-        self.state.reset_if_new_day()
+        self.state.reset_if_new_day(self.clock.now())
         if self.state.kill_switch:
             return False, "Kill switch enabled"
         if self.daily_loss_limit_hit():
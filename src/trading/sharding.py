@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import multiprocessing
+import zlib
+from multiprocessing.connection import Connection
+from time import perf_counter
+from typing import Any, Dict, Iterable, List, Tuple
+
+from core.config import StrategyConfig
+from core.market_store import MarketDataStore
+from exchange.market_data import Tick
+from trading.engine import TradingEngine
+from trading.price_history import PriceHistory, capacity_for, load_history
+from trading.registry import build_strategy
+from trading.strategy_base import Signal
+
+TickMessage = Tuple[str, float, float]
+SignalMessage = Tuple[str, str, str, float]
+
+
+def shard_for(symbol: str, shards: int) -> int:
+    return zlib.crc32(symbol.encode()) % shards
+
+
+def partition_symbols(symbols: List[str], shards: int) -> List[List[str]]:
+    partitions: List[List[str]] = [[] for _ in range(shards)]
+    for symbol in symbols:
+        partitions[shard_for(symbol, shards)].append(symbol)
+    return partitions
+
+
+def _shard_main(
+    conn: Connection, symbols: List[str], strategies: List[StrategyConfig], store_path: str, interval: str
+) -> None:
+    strategy = build_strategy(strategies, symbols)
+    history = PriceHistory(symbols, capacity_for(strategy.lookback))
+    strategy.indicators.history = history
+    if store_path:
+        load_history(history, MarketDataStore(store_path), interval)
+    try:
+        while True:
+            message = conn.recv()
+            if message is None:
+                return
+            if isinstance(message, tuple):
+                conn.send(_shard_command(message, history, strategy))
+                continue
+            signals: List[SignalMessage] = []
+            for symbol, timestamp, price in message:
+                history.append(symbol, timestamp, price)
+                for signal in strategy.update(symbol, price):
+                    signals.append((signal.symbol, signal.side, signal.reason, price))
+            conn.send(signals)
+    except (EOFError, KeyboardInterrupt):
+        return
+    finally:
+        conn.close()
+
+
+def _shard_command(message: Tuple[Any, ...], history: PriceHistory, strategy: Any) -> Any:
+    command = message[0]
+    if command == "state":
+        return {"history": history.state(), "indicators": strategy.indicators.state()}
+    if command == "restore":
+        history.restore(message[1])
+        strategy.indicators.restore(message[2])
+        return None
+    raise ValueError(f"Unknown shard command: {command}")
+
+
+class StrategyShard:
+    def __init__(
+        self,
+        index: int,
+        symbols: List[str],
+        strategies: List[StrategyConfig],
+        store_path: str = "",
+        interval: str = "",
+    ) -> None:
+        self.index = index
+        self.symbols = symbols
+        self.conn, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=_shard_main,
+            args=(child, symbols, strategies, store_path, interval),
+            name=f"strategy-shard-{index}",
+            daemon=True,
+        )
+        self.process.start()
+        child.close()
+
+    def send(self, ticks: List[TickMessage]) -> None:
+        self.conn.send(ticks)
+
+    def receive(self) -> List[SignalMessage]:
+        return self.conn.recv()
+
+    def request(self, *message: Any) -> Any:
+        self.conn.send(message)
+        return self.conn.recv()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.conn.close()
+
+
+class ShardedTradingEngine(TradingEngine):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        shards = max(1, self.config.strategy_shards)
+        store_path = self.config.market_data.store_path
+        interval = self.config.bars.signal_interval or self.config.market_data.store_interval
+        self._shard_of: Dict[str, int] = {}
+        self.shards: List[StrategyShard] = []
+        for index, symbols in enumerate(partition_symbols(self.config.symbols, shards)):
+            if not symbols:
+                continue
+            for symbol in symbols:
+                self._shard_of[symbol] = len(self.shards)
+            self.shards.append(StrategyShard(index, symbols, self.config.strategies, store_path, interval))
+
+    def evaluate(self, ticks: List[Tick]) -> None:
+        batches: Dict[int, List[TickMessage]] = {}
+        for tick in ticks:
+            shard = self._shard_of.get(tick.symbol)
+            if shard is None:
+                continue
+            timestamp = tick.timestamp.timestamp()
+            batch = batches.setdefault(shard, [])
+            if self.bars is None:
+                batch.append((tick.symbol, timestamp, tick.price))
+                continue
+            closed = self.close_bars(tick.symbol, timestamp, tick.price)
+            if self.signal_interval:
+                batch.extend((bar.symbol, bar.start + bar.interval, bar.close) for bar in closed)
+            else:
+                batch.append((tick.symbol, timestamp, tick.price))
+        started = perf_counter()
+        for shard, batch in batches.items():
+            self.shards[shard].send(batch)
+        signals = [signal for shard in batches for signal in self.shards[shard].receive()]
+        if self.metrics is not None and batches:
+            self.metrics.observe("strategy", perf_counter() - started)
+        for symbol, side, reason, price in signals:
+            self.handle_signal(Signal(symbol=symbol, side=side, reason=reason), self.prices.get(symbol, price))
+
+    def replay(self, symbol: str, timestamps: Iterable[float], prices: Iterable[float]) -> None:
+        shard = self._shard_of.get(symbol)
+        if shard is not None:
+            self.shards[shard].send([(symbol, timestamp, price) for timestamp, price in zip(timestamps, prices)])
+            self.shards[shard].receive()
+
+    def strategy_state(self) -> Dict[str, Any]:
+        state: Dict[str, Dict[str, Any]] = {"history": {}, "indicators": {}}
+        for shard in self.shards:
+            for key, value in shard.request("state").items():
+                state[key].update(value)
+        return state
+
+    def restore_strategy(self, history: Dict[str, Any], indicators: Dict[str, Any]) -> None:
+        for index, shard in enumerate(self.shards):
+            owned = [symbol for symbol, owner in self._shard_of.items() if owner == index]
+            shard.request(
+                "restore",
+                {symbol: history[symbol] for symbol in owned if symbol in history},
+                {symbol: indicators[symbol] for symbol in owned if symbol in indicators},
+            )
+
+    def close(self) -> None:
+        for shard in self.shards:
+            shard.stop()
+        self.shards = []
+        super().close()
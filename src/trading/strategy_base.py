@@ -1,7 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Protocol
+from typing import Iterable, List, Protocol, Sequence
+
+import numpy as np
+
+from .indicators import IndicatorCache
+
+SIGNAL_BUY = 1
+SIGNAL_SELL = -1
 
 
 @dataclass
@@ -12,5 +19,23 @@ class Signal:
 
 
 class Strategy(Protocol):
-    def generate_signals(self, symbol: str, prices: List[float]) -> List[Signal]:
+    indicators: IndicatorCache
+
+    @property
+    def lookback(self) -> int:
+        ...
+
+    def generate_signals(self, symbol: str, prices: Sequence[float]) -> List[Signal]:
+        ...
+
+    def generate_signals_bulk(self, symbol: str, prices: Sequence[float]) -> np.ndarray:
+        ...
+
+    def update(self, symbol: str, price: float) -> List[Signal]:
+        ...
+
+    def evaluate(self, symbol: str) -> List[Signal]:
+        ...
+
+    def warm_start(self, symbol: str, prices: Iterable[float]) -> None:
         ...
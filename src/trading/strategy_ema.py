@@ -1,28 +1,79 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from typing import Iterable, List, Sequence
 
-from .strategy_base import Signal
+import numpy as np
+
+from .indicators import EMA, IndicatorCache, ema_array, exact_ema_array, near_ties
+from .strategy_base import SIGNAL_BUY, SIGNAL_SELL, Signal
 
 
 @dataclass
 class EMAStrategy:
     fast_period: int
     slow_period: int
+    indicators: IndicatorCache = field(default_factory=IndicatorCache, repr=False)
+
+    @property
+    def lookback(self) -> int:
+        return self.slow_period + 2
 
-    def generate_signals(self, symbol: str, prices: List[float]) -> List[Signal]:
-        if len(prices) < self.slow_period + 2:
+    def generate_signals(self, symbol: str, prices: Sequence[float]) -> List[Signal]:
+        if len(prices) < self.lookback:
             return []
 
-        fast = self._ema_series(prices, self.fast_period)
-        slow = self._ema_series(prices, self.slow_period)
+        cache = IndicatorCache()
+        fast, slow = cache.ema(symbol, self.fast_period), cache.ema(symbol, self.slow_period)
+        for price in prices:
+            cache.advance(symbol, price)
+        return self._evaluate(symbol, fast, slow)
+
+    def generate_signals_bulk(self, symbol: str, prices: Sequence[float]) -> np.ndarray:
+        values = np.asarray(prices, dtype=np.float64)
+        signals = np.zeros(len(values), dtype=np.int8)
+        if len(values) < self.lookback:
+            return signals
+
+        fast = ema_array(values, self.fast_period)
+        slow = ema_array(values, self.slow_period)
+        window = slice(self.lookback - 2, None)
+        if near_ties(fast[window], slow[window]).any():
+            fast = exact_ema_array(values, self.fast_period)
+            slow = exact_ema_array(values, self.slow_period)
+
+        prev_fast, curr_fast = fast[:-1], fast[1:]
+        prev_slow, curr_slow = slow[:-1], slow[1:]
+        buy = (prev_fast <= prev_slow) & (curr_fast > curr_slow)
+        sell = (prev_fast >= prev_slow) & (curr_fast < curr_slow) & ~buy
+        signals[1:] = np.where(buy, SIGNAL_BUY, np.where(sell, SIGNAL_SELL, 0))
+        signals[: self.lookback - 1] = 0
+        return signals
+
+    def update(self, symbol: str, price: float) -> List[Signal]:
+        self.indicators.advance(symbol, price)
+        return self.evaluate(symbol)
+
+    def evaluate(self, symbol: str) -> List[Signal]:
+        indicators = self.indicators
+        return self._evaluate(
+            symbol, indicators.ema(symbol, self.fast_period), indicators.ema(symbol, self.slow_period)
+        )
+
+    def warm_start(self, symbol: str, prices: Iterable[float]) -> None:
+        self.reset(symbol)
+        for price in prices:
+            self.update(symbol, price)
+
+    def reset(self, symbol: str) -> None:
+        self.indicators.reset(symbol)
 
-        if len(fast) < 2 or len(slow) < 2:
+    def _evaluate(self, symbol: str, fast: EMA, slow: EMA) -> List[Signal]:
+        if slow.count < self.lookback:
             return []
 
-        prev_fast, curr_fast = fast[-2], fast[-1]
-        prev_slow, curr_slow = slow[-2], slow[-1]
+        prev_fast, curr_fast = fast.previous, fast.value
+        prev_slow, curr_slow = slow.previous, slow.value
 
         if prev_fast <= prev_slow and curr_fast > curr_slow:
             return [Signal(symbol=symbol, side="BUY", reason="EMA bullish crossover")]
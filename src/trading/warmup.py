@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from core.snapshot import read_snapshot, write_snapshot
+from exchange.binance_client import BinanceClient
+from trading.engine import TradingEngine, warm_start_history
+
+logger = logging.getLogger(__name__)
+
+
+def warm_start(engine: TradingEngine, client: Optional[BinanceClient] = None) -> Dict[str, str]:
+    config = engine.config
+    sources: Dict[str, str] = {}
+    interval = config.bars.signal_interval or config.market_data.store_interval
+
+    snapshot = read_snapshot(config.state.snapshot_path) if config.state.snapshot_path else None
+    if snapshot is not None:
+        age = engine.clock.now().timestamp() - float(snapshot.get("timestamp", 0))
+        if age <= config.state.max_snapshot_age_seconds:
+            restored = engine.restore_state(snapshot)
+            sources.update(dict.fromkeys(restored, "snapshot"))
+            history = snapshot["strategy"]["history"]
+            replay_gap(engine, client, interval, {symbol: history[symbol][0][-1] for symbol in restored})
+
+    pending = [symbol for symbol in config.symbols if symbol not in sources]
+    for symbol, loaded in warm_start_history(engine, pending).items():
+        if loaded:
+            sources[symbol] = "store"
+
+    pending = [symbol for symbol in config.symbols if symbol not in sources]
+    if client is not None and config.state.warmup_klines > 0:
+        now = engine.clock.now()
+        for symbol in pending:
+            try:
+                klines = client.get_klines(symbol, interval, config.state.warmup_klines, now)
+            except Exception as exc:
+                logger.warning("Kline warm-up failed for %s: %s", symbol, exc)
+                continue
+            if klines:
+                timestamps, closes = zip(*klines)
+                engine.replay(symbol, timestamps, closes)
+                sources[symbol] = "klines"
+    return sources
+
+
+def replay_gap(
+    engine: TradingEngine, client: Optional[BinanceClient], interval: str, since: Dict[str, float]
+) -> Dict[str, int]:
+    now = engine.clock.now()
+    replayed: Dict[str, int] = {}
+    for symbol, last in since.items():
+        bars: List[Tuple[float, float]] = []
+        if engine.market_store is not None:
+            columns = engine.market_store.read(symbol, interval, last, now.timestamp())
+            bars = list(zip(columns["timestamp"].tolist(), columns["close"].tolist()))
+        elif client is not None and engine.config.state.warmup_klines > 0:
+            try:
+                bars = client.get_klines(symbol, interval, engine.config.state.warmup_klines, now)
+            except Exception as exc:
+                logger.warning("Kline gap replay failed for %s: %s", symbol, exc)
+        bars = [(timestamp, close) for timestamp, close in bars if timestamp > last]
+        if bars:
+            timestamps, closes = zip(*bars)
+            engine.replay(symbol, timestamps, closes)
+        replayed[symbol] = len(bars)
+    return replayed
+
+
+def recover(engine: TradingEngine) -> int:
+    path = engine.config.state.snapshot_path
+    return engine.recover(read_snapshot(path) if path else None)
+
+
+def save_state(engine: TradingEngine) -> None:
+    if not engine.config.state.snapshot_path:
+        return
+    snapshot = engine.state_snapshot()
+    write_snapshot(engine.config.state.snapshot_path, snapshot)
+    if engine.journal is not None:
+        engine.journal.compact(snapshot["account"]["journal_seq"])
@@ -0,0 +1,50 @@
+import pytest
+import yaml
+
+from core.clock import SimulatedClock
+from core.config import load_config
+from core.storage import Storage
+from trading.engine import TradingEngine, build_engine
+
+BASE_CONFIG = {
+    "symbols": ["BTCUSDT"],
+    "strategy": {"name": "ema_crossover", "fast_period": 2, "slow_period": 3},
+    "logging": {"level": "INFO", "dir": "logs"},
+    "storage": {"path": "data/test.db"},
+    "risk": {"kill_switch_close_positions": False},
+}
+
+
+@pytest.fixture
+def make_config(tmp_path):
+    def make(**overrides):
+        raw = dict(BASE_CONFIG)
+        for key, value in overrides.items():
+            raw[key] = {**raw[key], **value} if isinstance(raw.get(key), dict) and isinstance(value, dict) else value
+        path = tmp_path / "config.yaml"
+        path.write_text(yaml.safe_dump(raw))
+        return load_config(path)
+
+    return make
+
+
+@pytest.fixture
+def make_engine(tmp_path):
+    engines = []
+    storages = []
+
+    def make(config, name="engine", clock=None, storage=None, client=None, engine_cls=TradingEngine, **kwargs):
+        clock = clock or SimulatedClock()
+        if storage is None:
+            storage = Storage(str(tmp_path / f"{name}.db"), clock=clock)
+            storages.append(storage)
+        kwargs.setdefault("mode", "backtest")
+        engine = build_engine(config, storage, client, engine_cls, clock=clock, **kwargs)
+        engines.append(engine)
+        return engine
+
+    yield make
+    for engine in engines:
+        engine.close()
+    for storage in storages:
+        storage.close()
@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from core.storage import EquityRecord, Storage, backfill_equity_rollup
+from dashboard.analytics import equity_series, lttb, symbol_pnl
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    x = np.arange(10_000, dtype=float)
+    y = np.sin(x / 500)
+    y[4321] = 50.0
+    keep = lttb(x, y, 200)
+    assert len(keep) == 200
+    assert keep[0] == 0 and keep[-1] == 9_999
+    assert 4321 in keep
+    assert np.all(np.diff(keep) > 0)
+    assert len(lttb(x[:50], y[:50], 200)) == 50
+
+
+def test_equity_rollup_and_resolution_choice(tmp_path):
+    storage = Storage(str(tmp_path / "equity.db"))
+    with storage.batch():
+        for i in range(180):
+            equity = 1000.0 - (i % 60) if i < 120 else 900.0 + i
+            storage.record_equity(EquityRecord((START + timedelta(seconds=20 * i)).isoformat(), equity, 0.0, 0.0))
+
+    rows = storage.conn.execute(
+        "SELECT bucket, min, max, last, samples FROM equity_rollup WHERE resolution = 'minute' ORDER BY bucket"
+    ).fetchall()
+    assert len(rows) == 60
+    assert tuple(rows[0]) == ("2024-01-01T00:00", 998.0, 1000.0, 998.0, 3)
+    incremental = storage.conn.execute("SELECT * FROM equity_rollup ORDER BY resolution, bucket").fetchall()
+    storage.conn.execute("DELETE FROM equity_rollup")
+    backfill_equity_rollup(storage.conn)
+    assert storage.conn.execute("SELECT * FROM equity_rollup ORDER BY resolution, bucket").fetchall() == incremental
+
+    raw = equity_series(storage.conn, points=200)
+    assert len(raw) == 180
+    assert raw["drawdown_pct"].min() == pytest.approx((941.0 / 1000.0 - 1) * 100)
+
+    bucketed = equity_series(storage.conn, points=20)
+    assert len(bucketed) <= 40
+    assert bucketed["timestamp"].iloc[0] == START
+    assert bucketed["drawdown_pct"].min() == pytest.approx((941.0 / 1000.0 - 1) * 100)
+
+    later = equity_series(storage.conn, start=(START + timedelta(minutes=40)).isoformat(), points=100)
+    assert len(later) == 60
+    storage.close()
+
+
+def test_symbol_pnl_is_cumulative_per_symbol(tmp_path):
+    storage = Storage(str(tmp_path / "pnl.db"))
+    storage.record_event("INFO", "TRADE", "Trade executed", {"symbol": "BTCUSDT", "pnl": 5.0})
+    storage.record_event("INFO", "TRADE", "Trade executed", {"symbol": "ETHUSDT", "pnl": -2.0})
+    storage.record_event("WARN", "KILL_SWITCH_CLOSE", "Closed", {"symbol": "BTCUSDT", "pnl": 1.5})
+    storage.record_event("INFO", "SIGNAL", "ignored", {"symbol": "BTCUSDT", "pnl": 100.0})
+    pnl = symbol_pnl(storage.conn)
+    assert pnl.iloc[-1].to_dict() == {"BTCUSDT": 6.5, "ETHUSDT": -2.0}
+    storage.close()
@@ -0,0 +1,82 @@
+import asyncio
+import threading
+
+from core.clock import Clock
+from core.storage import TradeRecord
+from trading.async_engine import AsyncTradingEngine
+from trading.execution import OrderRequest
+from trading.portfolio import Portfolio
+from trading.price_history import PriceHistory
+from trading.risk import RiskLimits, RiskManager
+from trading.strategy_base import Signal
+from trading.strategy_ema import EMAStrategy
+
+
+class RecordingStorage:
+    def __init__(self):
+        self.events = []
+
+    def record_event(self, level, event_type, message, metadata):
+        self.events.append((event_type, message))
+
+
+class SlowExecution:
+    def __init__(self):
+        self.release = threading.Event()
+
+    def submit_order(self, order):
+        if order.symbol == "BTCUSDT":
+            self.release.wait(timeout=5)
+        return TradeRecord("", "t", "o", order.symbol, order.side, order.price, order.quantity, 0.0, "paper", {})
+
+
+def test_slow_order_does_not_block_other_symbols(make_config):
+    config = make_config(symbols=["BTCUSDT", "ETHUSDT"])
+
+    async def scenario():
+        storage = RecordingStorage()
+        execution = SlowExecution()
+        risk = RiskManager(RiskLimits(0.1, 3, 30), initial_equity=1000)
+        engine = AsyncTradingEngine(
+            config, storage, execution, Portfolio(1000), risk, EMAStrategy(2, 3), PriceHistory([], 8), Clock()
+        )
+        dispatcher = asyncio.create_task(engine.dispatch_orders())
+        engine.submit(OrderRequest("BTCUSDT", "BUY", 1.0, 100.0))
+        engine.submit(OrderRequest("ETHUSDT", "BUY", 1.0, 10.0))
+        for _ in range(100):
+            if "ETHUSDT" in engine.portfolio.positions:
+                break
+            await asyncio.sleep(0.01)
+        assert "ETHUSDT" in engine.portfolio.positions
+        assert "BTCUSDT" not in engine.portfolio.positions
+
+        execution.release.set()
+        await engine.drain()
+        dispatcher.cancel()
+        assert "BTCUSDT" in engine.portfolio.positions
+
+    asyncio.run(scenario())
+
+
+def test_queued_order_blocks_a_second_signal_for_the_symbol(make_config):
+    config = make_config()
+
+    async def scenario():
+        storage = RecordingStorage()
+        execution = SlowExecution()
+        risk = RiskManager(RiskLimits(0.1, 3, 30), initial_equity=1000)
+        engine = AsyncTradingEngine(
+            config, storage, execution, Portfolio(1000), risk, EMAStrategy(2, 3), PriceHistory([], 8), Clock()
+        )
+        dispatcher = asyncio.create_task(engine.dispatch_orders())
+        engine.handle_signal(Signal("BTCUSDT", "BUY", "cross up"), 100.0)
+        engine.handle_signal(Signal("BTCUSDT", "BUY", "cross up"), 100.0)
+        assert engine.has_open_orders("BTCUSDT")
+        execution.release.set()
+        await engine.drain()
+        dispatcher.cancel()
+        assert engine.trade_count == 1
+        assert not engine.has_open_orders("BTCUSDT")
+        assert ("SIGNAL_SKIPPED", "Signal skipped: order in flight") in storage.events
+
+    asyncio.run(scenario())
@@ -0,0 +1,42 @@
+import sys
+
+import pytest
+
+from backtest import parse_sources, read_klines, run_backtest
+from core.clock import SimulatedClock
+from core.storage import Storage
+
+
+def test_backtest_replays_klines_into_storage(tmp_path, make_config):
+    config = make_config(strategy={"fast_period": 3, "slow_period": 6})
+
+    start_ms = 1704067200000
+    closes = [100 + (i % 20 if (i // 20) % 2 == 0 else 20 - i % 20) for i in range(400)]
+    data_path = tmp_path / "BTCUSDT-1m-2024-01.csv"
+    data_path.write_text(
+        "\n".join(
+            f"{start_ms + i * 60000},{c},{c},{c},{c},1,{start_ms + i * 60000 + 59999},0,0,0,0,0"
+            for i, c in enumerate(closes)
+        )
+    )
+    sources = parse_sources([str(data_path)])
+    assert list(sources) == ["BTCUSDT"]
+
+    clock = SimulatedClock()
+    storage = Storage(str(tmp_path / "backtest.db"), clock=clock)
+    result = run_backtest(config, read_klines(data_path, "BTCUSDT"), storage, clock, equity_every=50)
+
+    assert result.bars == 400
+    assert result.trades > 0
+    trades = storage.conn.execute("SELECT mode, timestamp FROM trades").fetchall()
+    assert len(trades) == result.trades
+    assert {row["mode"] for row in trades} == {"backtest"}
+    assert trades[0]["timestamp"].startswith("2024-01-01")
+    assert storage.fetch_latest_equity()["timestamp"].startswith("2024-01-01")
+    storage.close()
+
+
+def test_parquet_without_pyarrow_names_the_missing_package(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyarrow.parquet", None)
+    with pytest.raises(RuntimeError, match="pip install pyarrow"):
+        list(read_klines(tmp_path / "klines.parquet", "BTCUSDT"))
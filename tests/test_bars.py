@@ -0,0 +1,42 @@
+import pytest
+
+from core.storage import BarRecord
+from trading.bars import BarAggregator, parse_interval
+
+
+def test_parse_interval():
+    assert [parse_interval(value) for value in ("1s", "1m", "5m", "1h")] == [1, 60, 300, 3600]
+    with pytest.raises(ValueError):
+        parse_interval("5x")
+
+
+def test_aggregator_closes_bars_per_interval():
+    aggregator = BarAggregator([60, 300])
+    closed = []
+    for ts, price in [(0, 10.0), (20, 12.0), (40, 9.0), (59, 11.0), (61, 11.5), (30, 50.0), (300, 8.0)]:
+        closed.extend(aggregator.update("BTCUSDT", ts, price, volume=1.0))
+    assert closed == [
+        BarRecord("BTCUSDT", 60, 0, 10.0, 12.0, 9.0, 11.0, 4.0, 4),
+        BarRecord("BTCUSDT", 60, 60, 11.5, 11.5, 11.5, 11.5, 1.0, 1),
+        BarRecord("BTCUSDT", 300, 0, 10.0, 50.0, 9.0, 50.0, 6.0, 6),
+    ]
+    assert aggregator.current("BTCUSDT", 60).start == 300
+
+
+def test_engine_trades_on_bar_closes_and_persists_bars(make_config, make_engine):
+    config = make_config(bars={"intervals": ["1m", "5m"], "signal_interval": "1m"})
+    engine = make_engine(config, "bars")
+    clock, storage = engine.clock, engine.storage
+
+    for minute, close in enumerate([1, 1, 1, 1, 1, 2, 3, 3]):
+        for second in range(0, 60, 10):
+            ts = 1_700_000_040 + minute * 60 + second
+            clock.set_timestamp(ts)
+            engine.on_price("BTCUSDT", ts, close + (0.5 if second == 30 else 0.0))
+
+    bars = storage.fetch_bars("BTCUSDT", 60)
+    assert [bar.close for bar in bars] == [1, 1, 1, 1, 1, 2, 3]
+    assert all(bar.high == bar.close + 0.5 and bar.ticks == 6 for bar in bars)
+    assert storage.fetch_bars("BTCUSDT", 60, start=bars[2].start, limit=2) == bars[-2:]
+    assert len(engine.price_history.window("BTCUSDT")) == 7
+    assert engine.trade_count == 1
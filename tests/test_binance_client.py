@@ -0,0 +1,33 @@
+from datetime import datetime, timedelta, timezone
+
+from exchange.binance_client import BinanceClient
+
+
+class FakeRestClient:
+    def __init__(self, tickers):
+        self.tickers = tickers
+        self.calls = 0
+
+    def futures_symbol_ticker(self, **params):
+        self.calls += 1
+        return self.tickers
+
+
+def test_get_latest_prices_single_request():
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    now_ms = int(now.timestamp() * 1000)
+    fake = FakeRestClient(
+        [
+            {"symbol": "BTCUSDT", "price": "42000.5", "time": now_ms},
+            {"symbol": "ETHUSDT", "price": "2200.1", "time": now_ms - 120_000},
+            {"symbol": "XRPUSDT", "price": "0.5", "time": now_ms},
+        ]
+    )
+    client = BinanceClient("paper", client=fake)
+
+    prices = client.get_latest_prices(["BTCUSDT", "ETHUSDT"])
+
+    assert fake.calls == 1
+    assert set(prices) == {"BTCUSDT", "ETHUSDT"}
+    assert prices["BTCUSDT"].price == 42000.5
+    assert prices["ETHUSDT"].timestamp == now - timedelta(minutes=2)
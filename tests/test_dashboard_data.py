@@ -0,0 +1,65 @@
+from core.storage import EquityRecord, Storage
+from dashboard.data import DashboardData
+
+
+def test_incremental_bounded_refresh(tmp_path):
+    path = tmp_path / "dash.db"
+    data = DashboardData(str(path), max_rows=5, min_refresh_seconds=0)
+    assert data.refresh() == {}
+    assert data.latest_equity() is None
+
+    storage = Storage(str(path))
+    for i in range(8):
+        storage.record_event("INFO", "SIGNAL", f"signal {i}", {"symbol": "BTCUSDT" if i % 2 else "ETHUSDT"})
+        storage.record_equity(EquityRecord(f"t{i}", 100.0 + i, 0.0, 0.0))
+    storage.record_heartbeat("2024-01-01T00:00:00+00:00")
+
+    counts = data.refresh()
+    assert counts["events"] == 5
+    assert list(data.frame("events")["message"]) == [f"signal {i}" for i in range(3, 8)]
+    assert data.latest_equity()["equity"] == 107.0
+    assert data.heartbeat == "2024-01-01T00:00:00+00:00"
+
+    storage.record_event("WARN", "RISK_BLOCK", "blocked", {"symbol": "BTCUSDT"})
+    assert data.refresh()["events"] == 1
+    assert data.refresh()["events"] == 0
+    assert len(data.frame("events")) == 5
+    assert list(data.events(symbol="BTCUSDT")["message"]) == ["blocked", "signal 7", "signal 5", "signal 3", "signal 1"]
+    assert list(data.events(event_type="SIGNAL", limit=2)["message"]) == ["signal 7", "signal 6"]
+    assert list(data.events(event_type="SIGNAL", symbol="ETHUSDT")["message"]) == [f"signal {i}" for i in (6, 4, 2, 0)]
+    assert list(data.events(event_type="RISK_BLOCK")["message"]) == ["blocked"]
+
+    storage.conn.execute("DELETE FROM events")
+    storage.conn.execute("DELETE FROM sqlite_sequence WHERE name = 'events'")
+    storage.conn.commit()
+    storage.record_event("INFO", "ENGINE_START", "restarted", {})
+    data.refresh()
+    assert list(data.frame("events")["message"]) == ["restarted"]
+    storage.close()
+    data.close()
+
+
+def test_refresh_is_throttled(tmp_path):
+    path = tmp_path / "dash.db"
+    storage = Storage(str(path))
+    data = DashboardData(str(path), min_refresh_seconds=60)
+    assert data.refresh()["events"] == 0
+    storage.record_event("INFO", "SIGNAL", "later", {})
+    assert data.refresh() == {}
+    assert data.refresh(force=True)["events"] == 1
+    storage.close()
+    data.close()
+
+
+def test_views_keep_one_entry_per_query(tmp_path):
+    path = tmp_path / "dash.db"
+    storage = Storage(str(path))
+    storage.record_equity(EquityRecord("2024-01-01T00:00:00+00:00", 100.0, 0.0, 0.0))
+    data = DashboardData(str(path), min_refresh_seconds=0)
+    for minute in range(10):
+        data.equity_series(f"2023-12-31T00:{minute:02d}:00+00:00")
+        data.symbol_pnl(f"2023-12-31T00:{minute:02d}:00+00:00")
+    assert len(data._views) == 2
+    assert data.equity_series("2023-12-31T00:09:00+00:00") is data.equity_series("2023-12-31T00:09:00+00:00")
+    storage.close()
+    data.close()
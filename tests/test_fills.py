@@ -0,0 +1,110 @@
+import json
+
+import pytest
+
+from core.clock import SimulatedClock
+from core.storage import Storage, TradeRecord
+from dashboard.analytics import symbol_pnl
+from trading.execution import ExecutionEngine, OrderRequest
+from trading.fills import BookFillModel, OrderBook, RecordedBooks, SlippageFillModel, SyntheticBook, read_books
+from trading.portfolio import Portfolio
+
+
+def test_slippage_model_matches_fixed_slippage():
+    fill = SlippageFillModel(0.001, fee_rate=0.0004).fill("BTCUSDT", "SELL", 2.0, 100.0, 0.0)
+    assert fill.price == pytest.approx(99.9)
+    assert fill.quantity == 2.0
+    assert fill.fee == pytest.approx(99.9 * 2.0 * 0.0004)
+
+
+def test_book_model_walks_levels_and_fills_partially():
+    book = OrderBook(0.0, bids=[(99.0, 1.0), (98.0, 1.0)], asks=[(101.0, 1.0), (102.0, 3.0)])
+    model = BookFillModel(RecordedBooks({"BTCUSDT": [book]}), fee_rate=0.001)
+
+    fill = model.fill("BTCUSDT", "BUY", 2.0, 100.0, 1.0)
+    assert fill.price == pytest.approx(101.5)
+    assert fill.quantity == 2.0
+    assert fill.levels == 2
+    assert fill.fee == pytest.approx(0.203)
+
+    fill = model.fill("BTCUSDT", "SELL", 5.0, 100.0, 1.0)
+    assert fill.quantity == 2.0
+    assert fill.price == pytest.approx(98.5)
+
+    queued = BookFillModel(RecordedBooks({"BTCUSDT": [book]}), fee_rate=0.0, queue_ahead_pct=0.5)
+    assert queued.fill("BTCUSDT", "BUY", 2.0, 100.0, 1.0).quantity == pytest.approx(2.0)
+    assert queued.fill("BTCUSDT", "SELL", 2.0, 100.0, 1.0).quantity == pytest.approx(1.0)
+
+
+def test_latency_selects_later_recorded_book(tmp_path):
+    path = tmp_path / "books.jsonl"
+    rows = [
+        {"timestamp": 10.0, "symbol": "BTCUSDT", "bids": [[99.0, 5.0]], "asks": [[101.0, 5.0]]},
+        {"timestamp": 10.5, "symbol": "BTCUSDT", "bids": [[104.0, 5.0]], "asks": [[106.0, 5.0]]},
+    ]
+    path.write_text("\n".join(json.dumps(row) for row in rows) + "\n")
+    books = read_books(path)
+
+    assert BookFillModel(books, fee_rate=0.0).fill("BTCUSDT", "BUY", 1.0, 100.0, 10.2).price == 101.0
+    assert BookFillModel(books, fee_rate=0.0, latency_ms=400).fill("BTCUSDT", "BUY", 1.0, 100.0, 10.2).price == 106.0
+    fallback = BookFillModel(books, fallback=SlippageFillModel(0.0))
+    assert fallback.fill("BTCUSDT", "BUY", 1.0, 100.0, 1.0).price == 100.0
+    assert BookFillModel(books).fill("ETHUSDT", "BUY", 1.0, 100.0, 10.2).quantity == 0.0
+
+
+def test_synthetic_book_depth_grows_away_from_mid():
+    book = SyntheticBook(spread_bps=2.0, depth_levels=3, level_step_bps=1.0, level_notional=1000.0).book("X", 100.0, 0.0)
+    assert [price for price, _ in book.asks] == pytest.approx([100.01, 100.02, 100.03])
+    assert [price for price, _ in book.bids] == pytest.approx([99.99, 99.98, 99.97])
+    assert book.asks[0][1] * book.asks[0][0] == pytest.approx(1000.0)
+    assert book.asks[2][1] * book.asks[2][0] == pytest.approx(1200.0)
+
+
+def test_execution_records_partial_fill_and_fee(tmp_path):
+    clock = SimulatedClock()
+    clock.set_timestamp(1_700_000_000)
+    storage = Storage(str(tmp_path / "fills.db"), clock=clock)
+    book = OrderBook(0.0, bids=[(99.0, 1.0)], asks=[(101.0, 1.0)])
+    model = BookFillModel(RecordedBooks({"BTCUSDT": [book]}), fee_rate=0.001)
+    execution = ExecutionEngine("paper", 0.0, None, storage, clock, model)
+
+    trade = execution.submit_order(OrderRequest("BTCUSDT", "BUY", 3.0, 100.0))
+    assert trade is not None
+    assert trade.quantity == 1.0
+    assert trade.metadata["fee"] == pytest.approx(0.101)
+    assert execution.submit_order(OrderRequest("ETHUSDT", "BUY", 1.0, 10.0)) is None
+    storage.close()
+
+    portfolio = Portfolio(1000.0)
+    portfolio.update_with_trade("BTCUSDT", "LONG", 100.0, 2.0, 1, fee=0.2)
+    pnl = portfolio.update_with_trade("BTCUSDT", "SHORT", 110.0, 2.0, 1, fee=0.22)
+    assert pnl == pytest.approx(20.0)
+    assert portfolio.realized_pnl == pytest.approx(19.58)
+
+
+def test_partial_fills_reduce_positions_by_filled_quantity():
+    portfolio = Portfolio(1000.0)
+    portfolio.update_with_trade("BTCUSDT", "LONG", 100.0, 1.0, 1)
+    assert portfolio.update_with_trade("BTCUSDT", "SHORT", 110.0, 0.25, 1) == pytest.approx(2.5)
+    position = portfolio.positions["BTCUSDT"]
+    assert position.side == "LONG" and position.quantity == pytest.approx(0.75) and position.entry_price == 100.0
+    assert portfolio.update_with_trade("BTCUSDT", "SHORT", 90.0, 0.75, 1) == pytest.approx(-7.5)
+    assert portfolio.positions == {}
+    assert portfolio.realized_pnl == pytest.approx(-5.0)
+
+    portfolio.update_with_trade("ETHUSDT", "LONG", 10.0, 1.0, 1)
+    assert portfolio.update_with_trade("ETHUSDT", "SHORT", 12.0, 1.5, 1) == pytest.approx(2.0)
+    flipped = portfolio.positions["ETHUSDT"]
+    assert (flipped.side, flipped.quantity, flipped.entry_price) == ("SHORT", pytest.approx(0.5), 12.0)
+
+
+def test_fees_turn_a_small_gross_win_into_a_loss(make_config, make_engine):
+    engine = make_engine(make_config(), "fees", mode="paper")
+    buy = OrderRequest("BTCUSDT", "BUY", 1.0, 100.0)
+    engine.apply_trade(buy, TradeRecord("", "t1", "o1", "BTCUSDT", "BUY", 100.0, 1.0, 0.0, "paper", {}))
+    sell = OrderRequest("BTCUSDT", "SELL", 1.0, 100.6)
+    trade = TradeRecord("", "t2", "o2", "BTCUSDT", "SELL", 100.6, 1.0, 0.0, "paper", {"fee": 0.7})
+    assert engine.apply_trade(sell, trade) == pytest.approx(-0.1)
+    assert engine.risk.state.consecutive_losses == 1
+    assert engine.risk.state.daily_pnl == pytest.approx(engine.portfolio.realized_pnl) == pytest.approx(-0.1)
+    assert symbol_pnl(engine.storage.conn)["BTCUSDT"].iloc[-1] == pytest.approx(-0.1)
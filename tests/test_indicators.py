@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from trading.indicators import ATR, RSI, IndicatorCache, RollingStd, SMA
+from trading.price_history import PriceHistory
+
+
+def test_rolling_indicators_match_reference():
+    rng = np.random.default_rng(11)
+    prices = 100 + np.cumsum(rng.normal(0, 1, 500))
+    sma, std = SMA(20), RollingStd(20)
+    for i, price in enumerate(prices.tolist()):
+        window = prices[max(0, i - 19) : i + 1]
+        assert sma.update(price) == pytest.approx(window.mean(), rel=1e-12)
+        assert std.update(price) == pytest.approx(window.std(), rel=1e-6, abs=1e-9)
+
+
+def test_rsi_and_atr():
+    rsi, atr = RSI(14), ATR(14)
+    for price in range(100, 130):
+        rsi.update(float(price))
+        atr.update(float(price))
+    assert rsi.value == 100.0
+    assert atr.value == pytest.approx(1.0, rel=0.1)
+
+    rsi = RSI(3)
+    for price in [10.0, 11.0, 10.0, 11.0]:
+        rsi.update(price)
+    assert rsi.value == pytest.approx(100 - 100 / (1 + 2 / 1))
+
+
+def test_cache_memoizes_and_evicts_idle_indicators():
+    history = PriceHistory(["BTCUSDT"], 64)
+    cache = IndicatorCache(history, max_idle_ticks=10)
+    prices = [100.0 + (i % 7) for i in range(40)]
+    for i, price in enumerate(prices):
+        history.append("BTCUSDT", float(i), price)
+        cache.advance("BTCUSDT", price)
+        assert cache.sma("BTCUSDT", 5) is cache.get("BTCUSDT", "sma", 5)
+        if i < 5:
+            cache.rsi("BTCUSDT", 3)
+    assert cache.sma("BTCUSDT", 5).value == pytest.approx(sum(prices[-5:]) / 5)
+    assert len(cache) == 1
+
+    rebuilt = cache.ema("BTCUSDT", 4)
+    assert rebuilt.count == len(prices)
+    with pytest.raises(ValueError):
+        cache.get("BTCUSDT", "macd", 1)
@@ -0,0 +1,60 @@
+from core.clock import SimulatedClock
+from core.journal import TradeJournal
+from core.storage import TradeRecord
+from trading.execution import OrderRequest
+from trading.warmup import recover, save_state
+
+
+def trade(engine, symbol, side, price):
+    order = OrderRequest(symbol, side, 1.0, price)
+    engine.apply_trade(order, TradeRecord("", "t", "o", symbol, side, price, 1.0, 0.0, "paper", {}))
+
+
+def test_journal_skips_torn_tail(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = TradeJournal(path, fsync=False)
+    journal.append({"symbol": "BTCUSDT"})
+    journal.close()
+    with path.open("ab") as handle:
+        handle.write(b'{"seq": 2, "sym')
+
+    journal = TradeJournal(path, fsync=False)
+    assert journal.seq == 1
+    assert journal.append({"symbol": "ETHUSDT"}) == 2
+    assert [entry["symbol"] for entry in journal.read()] == ["BTCUSDT", "ETHUSDT"]
+    journal.compact(1)
+    assert [entry["seq"] for entry in journal.read()] == [2]
+    journal.close()
+
+
+def test_portfolio_and_risk_survive_crash(tmp_path, make_config, make_engine):
+    config = make_config(
+        symbols=["BTCUSDT", "ETHUSDT"],
+        state={
+            "snapshot_path": str(tmp_path / "state.json"),
+            "journal_path": str(tmp_path / "journal.jsonl"),
+            "journal_fsync": False,
+        },
+    )
+    clock = SimulatedClock()
+    clock.set_timestamp(1_700_000_000)
+
+    engine = make_engine(config, "a", clock, mode="paper")
+    trade(engine, "BTCUSDT", "BUY", 100.0)
+    trade(engine, "BTCUSDT", "SELL", 90.0)
+    save_state(engine)
+    clock.advance(60)
+    trade(engine, "ETHUSDT", "BUY", 10.0)
+    trade(engine, "ETHUSDT", "SELL", 9.0)
+    trade(engine, "BTCUSDT", "SELL", 95.0)
+    engine.journal.close()
+
+    restarted = make_engine(config, "b", clock, mode="paper")
+    assert recover(restarted) == 3
+    assert restarted.portfolio.realized_pnl == engine.portfolio.realized_pnl == -11.0
+    assert restarted.portfolio.positions == engine.portfolio.positions
+    assert restarted.risk.state == engine.risk.state
+    assert restarted.risk.state.daily_pnl == -11.0
+
+    trade(restarted, "BTCUSDT", "BUY", 94.0)
+    assert restarted.journal.read()[-1]["seq"] == 6
@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta, timezone
+
+from exchange.market_data import BinanceStreamFeed, QueueFeed, ReplayFeed, Tick, read_ticks, write_ticks
+
+
+def test_replay_feed_replays_recorded_ticks(tmp_path):
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    recorded = [Tick("BTCUSDT", 100.0 + i, start + timedelta(seconds=i)) for i in range(5)]
+    path = tmp_path / "ticks.csv"
+    write_ticks(path, recorded)
+
+    feed = ReplayFeed(read_ticks(path))
+    feed.start()
+    replayed = []
+    while not feed.closed:
+        replayed.extend(feed.next_ticks(timeout=1))
+    feed.stop()
+
+    assert [tick.price for tick in replayed] == [100.0, 101.0, 102.0, 103.0, 104.0]
+    assert [tick.timestamp for tick in replayed] == [tick.timestamp for tick in recorded]
+
+
+def test_replay_feed_caps_batches_at_queue_size(tmp_path):
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    recorded = [Tick("BTCUSDT", 100.0 + i, start + timedelta(seconds=i)) for i in range(50)]
+
+    feed = ReplayFeed(iter(recorded), maxsize=8)
+    feed.start()
+    batches = []
+    while not feed.closed:
+        batches.append(feed.next_ticks(timeout=1))
+    feed.stop()
+
+    assert max(len(batch) for batch in batches) <= 8
+    assert [tick.price for batch in batches for tick in batch] == [tick.price for tick in recorded]
+
+
+def test_queue_feed_records_pushed_ticks(tmp_path):
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    path = tmp_path / "record" / "ticks.csv"
+    feed = QueueFeed(str(path))
+    feed.start()
+    for i in range(3):
+        feed.push(Tick("ETHUSDT", 2000.0 + i, start + timedelta(seconds=i)))
+    feed.stop()
+    feed.start()
+    feed.push(Tick("ETHUSDT", 2003.0, start + timedelta(seconds=3)))
+    feed.stop()
+
+    assert [tick.price for tick in read_ticks(path)] == [2000.0, 2001.0, 2002.0, 2003.0]
+
+
+def test_stream_feed_parses_book_ticker_and_mark_price():
+    book = BinanceStreamFeed.parse_message(
+        {"stream": "btcusdt@bookTicker", "data": {"e": "bookTicker", "s": "BTCUSDT", "b": "100", "a": "102", "E": 1}}
+    )
+    mark = BinanceStreamFeed.parse_message({"data": {"e": "markPriceUpdate", "s": "ETHUSDT", "p": "2000.5", "E": 1}})
+
+    assert (book.symbol, book.price) == ("BTCUSDT", 101.0)
+    assert (mark.symbol, mark.price) == ("ETHUSDT", 2000.5)
+    assert BinanceStreamFeed.parse_message({"data": {"e": "aggTrade"}}) is None
@@ -0,0 +1,72 @@
+import numpy as np
+
+from backtest import merge_store_bars, read_klines, run_backtest
+from core.clock import SimulatedClock
+from core.market_store import MarketDataStore
+from core.storage import Storage
+from ingest import ingest_klines
+from trading.engine import warm_start_history
+
+
+def columns(timestamps):
+    values = np.asarray(timestamps, dtype=float)
+    return {
+        "timestamp": values,
+        "open": values,
+        "high": values + 1,
+        "low": values - 1,
+        "close": values,
+        "volume": values,
+    }
+
+
+def test_append_is_ordered_and_range_reads_are_memory_mapped(tmp_path):
+    store = MarketDataStore(tmp_path)
+    assert store.append("btcusdt", "1m", columns([3, 1, 2, 2])) == 3
+    assert store.append("BTCUSDT", "1m", columns([2, 4, 5])) == 2
+    assert store.symbols() == ["BTCUSDT"]
+    assert store.length("BTCUSDT", "1m") == 5
+
+    window = store.read("BTCUSDT", "1m", start=2, end=5)
+    assert isinstance(window["close"], np.memmap)
+    assert window["timestamp"].tolist() == [2, 3, 4]
+    assert window["high"].tolist() == [3, 4, 5]
+    assert store.tail("BTCUSDT", "1m", 2)["close"].tolist() == [4, 5]
+    assert store.tail("BTCUSDT", "1m", 10, end=3)["close"].tolist() == [1, 2]
+    assert store.read("ETHUSDT", "1m")["close"].tolist() == []
+
+
+def test_store_feeds_backtest_and_warm_start(tmp_path, make_config, make_engine):
+    store_path = tmp_path / "market"
+    config = make_config(strategy={"fast_period": 3, "slow_period": 6}, market_data={"store_path": str(store_path)})
+
+    start_ms = 1704067200000
+    closes = [100 + (i % 20 if (i // 20) % 2 == 0 else 20 - i % 20) for i in range(400)]
+    data_path = tmp_path / "BTCUSDT-1m-2024-01.csv"
+    data_path.write_text(
+        "\n".join(
+            f"{start_ms + i * 60000},{c},{c},{c},{c},1,{start_ms + i * 60000 + 59999},0,0,0,0,0"
+            for i, c in enumerate(closes)
+        )
+    )
+    store = MarketDataStore(store_path)
+    assert ingest_klines(store, "BTCUSDT", "1m", data_path) == 400
+    assert ingest_klines(store, "BTCUSDT", "1m", data_path) == 0
+
+    results = []
+    for name, bars in (
+        ("csv", read_klines(data_path, "BTCUSDT")),
+        ("store", merge_store_bars(store, ["BTCUSDT"], "1m")),
+    ):
+        clock = SimulatedClock()
+        storage = Storage(str(tmp_path / f"{name}.db"), clock=clock)
+        results.append(run_backtest(config, bars, storage, clock))
+        storage.close()
+    assert (results[0].trades, results[0].final_equity) == (results[1].trades, results[1].final_equity)
+    assert store.length("BTCUSDT", "1m") == 400
+
+    clock = SimulatedClock()
+    clock.set_timestamp(start_ms / 1000 + 400 * 60)
+    engine = make_engine(config, "live", clock)
+    assert warm_start_history(engine) == {"BTCUSDT": engine.price_history.capacity}
+    assert list(engine.price_history.window("BTCUSDT")) == closes[-engine.price_history.capacity :]
@@ -0,0 +1,74 @@
+import json
+import math
+import urllib.request
+from datetime import datetime, timezone
+
+import pytest
+
+from core.clock import SimulatedClock
+from core.config import MetricsConfig
+from core.metrics import EngineMetrics, LatencyHistogram, MetricsServer, build_metrics_server
+from core.storage import Storage
+from exchange.market_data import Tick
+from trading.engine import build_engine
+
+
+def test_histogram_quantiles_are_within_one_bucket():
+    histogram = LatencyHistogram()
+    for i in range(1, 1001):
+        histogram.observe(i * 1e-5)
+    assert histogram.count == 1000
+    assert histogram.quantile(0.5) == pytest.approx(5e-3, rel=0.2)
+    assert histogram.quantile(0.99) == pytest.approx(9.9e-3, rel=0.2)
+    assert histogram.quantile(1.0) == histogram.max == pytest.approx(1e-2)
+    assert LatencyHistogram().quantile(0.5) == 0.0
+
+
+def test_overruns_and_prometheus_text():
+    metrics = EngineMetrics(poll_interval_seconds=0.5)
+    metrics.loop_finished(0.1)
+    metrics.loop_finished(0.7)
+    with metrics.stage("commit"):
+        pass
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"]["loops"] == 2 and snapshot["counters"]["overruns"] == 1
+    text = metrics.render_prometheus()
+    assert 'engine_stage_seconds{stage="loop",quantile="0.99"}' in text
+    assert 'engine_stage_seconds_count{stage="commit"} 1' in text
+    assert "engine_overruns_total 1" in text
+
+
+def test_engine_records_stages_and_serves_them(tmp_path, make_config):
+    config = make_config(
+        strategy={"fast_period": 2, "slow_period": 4}, max_price_age_seconds=0, poll_interval_seconds=1
+    )
+    clock = SimulatedClock()
+    metrics = EngineMetrics(config.poll_interval_seconds)
+    storage = Storage(str(tmp_path / "metrics.db"), clock=clock)
+    storage.metrics = metrics
+    engine = build_engine(config, storage, None, clock=clock, mode="paper", metrics=metrics)
+    for i in range(60):
+        clock.set_timestamp(1_700_000_000 + i)
+        price = 100 + 5 * math.sin(i / 3)
+        engine.on_ticks([Tick("BTCUSDT", price, datetime.fromtimestamp(1_700_000_000 + i, tz=timezone.utc))])
+        engine.record_snapshot()
+    stages = metrics.snapshot()["stages"]
+    assert stages["strategy"]["count"] == 60
+    assert stages["commit"]["count"] >= 120
+    assert engine.trade_count > 0
+    assert stages["order"]["count"] == stages["tick_to_order"]["count"] == engine.trade_count
+    assert metrics.counters["ticks"] == 60
+
+    server = MetricsServer(metrics, port=0)
+    server.start()
+    try:
+        base = f"http://127.0.0.1:{server.port}"
+        with urllib.request.urlopen(f"{base}/metrics", timeout=5) as response:
+            assert response.headers["Content-Type"].startswith("text/plain")
+            assert 'engine_stage_seconds_count{stage="strategy"} 60' in response.read().decode()
+        with urllib.request.urlopen(f"{base}/metrics.json", timeout=5) as response:
+            assert json.load(response)["counters"]["orders"] == engine.trade_count
+        assert build_metrics_server(MetricsConfig(port=server.port), metrics) is None
+    finally:
+        server.stop()
+        storage.close()
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from backtest import run_backtest
+from core.clock import SimulatedClock
+from core.config import StrategyConfig
+from core.storage import Storage
+from optimize import SweepSettings, evaluate, grid, run_sweep
+
+
+@pytest.mark.parametrize("fee_rate", [0.0, 0.0004])
+def test_sweep_matches_event_driven_backtest(tmp_path, make_config, fee_rate):
+    config = make_config(
+        daily_loss_limit_pct=1000,
+        max_consecutive_losses=1000000,
+        strategy={"fast_period": 4, "slow_period": 9},
+        fills={"fee_rate": fee_rate},
+    )
+    prices = 100 * np.exp(np.cumsum(np.random.default_rng(3).normal(0, 0.002, 3000)))
+    settings = SweepSettings.from_config(config, periods_per_year=525600)
+
+    clock = SimulatedClock()
+    storage = Storage(str(tmp_path / "backtest.db"), clock=clock)
+    bars = [(1704067200.0 + i * 60, "BTCUSDT", price) for i, price in enumerate(prices.tolist())]
+    backtest = run_backtest(config, bars, storage, clock)
+    storage.close()
+
+    single = evaluate(prices, config.strategy, settings)
+    assert single.trades == backtest.trades
+    assert np.isclose(single.pnl, backtest.final_equity - config.initial_equity)
+
+    candidates = grid([3, 4, 5], [8, 9])
+    results = run_sweep(prices, candidates, settings, workers=2)
+    assert len(results) == 6
+    assert [r.sharpe for r in results] == sorted((r.sharpe for r in results), reverse=True)
+    match = next(r for r in results if r.strategy == StrategyConfig("ema_crossover", 4, 9))
+    assert match.pnl == single.pnl
@@ -0,0 +1,121 @@
+import pytest
+
+from core.clock import SimulatedClock
+from exchange.binance_client import BinanceClient
+from exchange.fake_exchange import FakeExchange
+from trading.engine import build_engine
+from trading.execution import OrderRequest
+
+
+class RecordingStorage:
+    def __init__(self):
+        self.orders = []
+        self.trades = []
+        self.events = []
+
+    def record_order(self, record):
+        self.orders.append(record)
+
+    def record_trade(self, record):
+        self.trades.append(record)
+
+    def record_event(self, level, event_type, message, metadata):
+        self.events.append((event_type, message))
+
+
+@pytest.fixture
+def setup(make_config):
+    config = make_config(
+        mode="testnet",
+        symbols=["BTCUSDT", "ETHUSDT"],
+        orders={"user_stream": False, "reconcile_seconds": 5},
+    )
+    clock = SimulatedClock()
+    clock.set_timestamp(1_700_000_000)
+    exchange = FakeExchange(prices={"BTCUSDT": 100.0, "ETHUSDT": 10.0})
+    storage = RecordingStorage()
+    engine = build_engine(config, storage, BinanceClient("testnet", client=exchange), clock=clock)
+    engine.orders.stream = exchange
+    engine.start()
+    yield engine, exchange, storage, clock
+    engine.orders.stop()
+
+
+def test_stream_fills_reach_portfolio_and_storage(setup):
+    engine, exchange, storage, _ = setup
+    exchange.fill_chunks = 3
+    engine.submit(OrderRequest("BTCUSDT", "BUY", 0.3, 99.0))
+    assert engine.has_open_orders("BTCUSDT")
+
+    engine.orders.flush()
+    assert engine.apply_fills() == 1
+    assert not engine.has_open_orders("BTCUSDT")
+    position = engine.portfolio.positions["BTCUSDT"]
+    assert position.quantity == pytest.approx(0.3)
+    assert position.entry_price == pytest.approx(100.0)
+    assert len(storage.trades) == 3
+    assert sum(trade.metadata["fee"] for trade in storage.trades) == pytest.approx(0.3 * 100.0 * 0.0004)
+    assert engine.portfolio.realized_pnl == pytest.approx(-0.012)
+    assert [order.status for order in storage.orders] == ["PENDING_NEW", "NEW", "PARTIALLY_FILLED", "FILLED"]
+    assert len({order.order_id for order in storage.orders}) == 1
+
+
+def test_missed_events_are_reconciled_by_query(setup):
+    engine, exchange, storage, clock = setup
+    exchange.auto_fill = False
+    exchange.drop_events = True
+    engine.submit(OrderRequest("ETHUSDT", "SELL", 2.0, 10.0))
+    engine.orders.flush()
+    assert engine.apply_fills() == 0
+    (client_order_id,) = engine.orders.orders
+
+    exchange.fill(client_order_id, 0.5, price=9.8)
+    exchange.cancel(client_order_id)
+    clock.advance(6)
+    assert engine.apply_fills() == 0
+    engine.orders.flush()
+    assert engine.apply_fills() == 1
+
+    position = engine.portfolio.positions["ETHUSDT"]
+    assert (position.side, position.quantity, position.entry_price) == ("SHORT", 0.5, 9.8)
+    assert storage.trades[-1].quantity == 0.5
+    assert storage.orders[-1].status == "CANCELED"
+    assert not engine.orders.orders
+
+
+def test_rejected_order_is_recorded_and_released(setup):
+    engine, exchange, storage, _ = setup
+    exchange.reject_next()
+    engine.submit(OrderRequest("BTCUSDT", "BUY", 1.0, 100.0))
+    engine.orders.flush()
+    assert engine.apply_fills() == 0
+    assert not engine.has_open_orders("BTCUSDT")
+    assert storage.orders[-1].status == "REJECTED"
+    assert storage.events[-1][0] == "ORDER_FAIL"
+    assert not engine.portfolio.positions
+
+
+def test_partially_filled_close_keeps_the_remainder_open(setup):
+    engine, exchange, storage, _ = setup
+    engine.submit(OrderRequest("BTCUSDT", "BUY", 1.0, 100.0))
+    engine.orders.flush()
+    assert engine.apply_fills() == 1
+
+    exchange.auto_fill = False
+    engine.close_positions()
+    engine.orders.flush()
+    (client_order_id,) = engine.orders.orders
+    exchange.fill(client_order_id, 0.25, price=110.0)
+    exchange.cancel(client_order_id, status="EXPIRED")
+    engine.orders.flush()
+    assert engine.apply_fills() == 1
+
+    position = engine.portfolio.positions["BTCUSDT"]
+    assert (position.side, position.quantity) == ("LONG", pytest.approx(0.75))
+    assert storage.orders[-1].status == "EXPIRED"
+    fees = sum(trade.metadata["fee"] for trade in storage.trades)
+    assert engine.portfolio.realized_pnl == pytest.approx(2.5 - fees)
+
+    engine.close_positions()
+    engine.orders.flush()
+    assert engine.orders.orders[next(iter(engine.orders.orders))].request.quantity == pytest.approx(0.75)
@@ -0,0 +1,19 @@
+from trading.price_history import PriceHistory, PriceRing, capacity_for
+from trading.strategy_ema import EMAStrategy
+
+
+def test_price_ring_keeps_latest_window():
+    ring = PriceRing(capacity=4)
+    for i in range(10):
+        ring.append(float(i), 100.0 + i)
+
+    assert len(ring) == 4
+    assert ring.window().tolist() == [106.0, 107.0, 108.0, 109.0]
+    assert ring.window(2).tolist() == [108.0, 109.0]
+    assert ring.timestamps().tolist() == [6.0, 7.0, 8.0, 9.0]
+    assert ring.last() == 109.0
+
+    history = PriceHistory(["BTCUSDT"], capacity_for(EMAStrategy(2, 3).lookback))
+    history.append("BTCUSDT", 0.0, 1.0)
+    assert history.window("BTCUSDT").tolist() == [1.0]
+    assert history.capacity == 20
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from core.config import StrategyConfig
+from trading.registry import StrategySet, build_strategy, create_strategy
+from trading.strategy_ema import EMAStrategy
+
+
+def test_unknown_strategy_name_is_rejected():
+    with pytest.raises(ValueError):
+        create_strategy(StrategyConfig("does_not_exist", 1, 2))
+
+
+def test_strategies_share_indicators_and_respect_symbols():
+    configs = [
+        StrategyConfig("ema_crossover", 12, 26),
+        StrategyConfig("ema_crossover", 5, 26, symbols=["BTCUSDT"]),
+    ]
+    strategy = build_strategy(configs, ["BTCUSDT", "ETHUSDT"])
+    assert isinstance(strategy, StrategySet)
+    assert strategy.lookback == 28
+
+    reference = {12: EMAStrategy(12, 26), 5: EMAStrategy(5, 26)}
+    reference_eth = EMAStrategy(12, 26)
+    signals = 0
+    rng = np.random.default_rng(3)
+    prices = (100 + np.cumsum(rng.normal(0, 1, 2000))).tolist()
+    for price in prices:
+        expected = reference[12].update("BTCUSDT", price) + reference[5].update("BTCUSDT", price)
+        assert strategy.update("BTCUSDT", price) == expected
+        signals += len(expected)
+        assert strategy.update("ETHUSDT", price) == reference_eth.update("ETHUSDT", price)
+
+    assert signals > 10
+    assert strategy.indicators.ema("BTCUSDT", 26) is strategy.members[1][0].indicators.ema("BTCUSDT", 26)
+    assert len(strategy.indicators) == 5
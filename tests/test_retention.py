@@ -0,0 +1,87 @@
+import gzip
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+from core.clock import SimulatedClock
+from core.config import RetentionConfig
+from core.retention import Retention, RetentionWorker
+from core.storage import EquityRecord, Storage
+from dashboard.analytics import equity_series, symbol_pnl
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def test_events_are_merged_into_spans_and_archived(tmp_path):
+    clock = SimulatedClock(START)
+    storage = Storage(str(tmp_path / "events.db"), clock=clock)
+    storage.record_event("INFO", "TRADE", "closed", {"symbol": "BTCUSDT", "pnl": 12.5})
+    for i in range(10):
+        clock.set_timestamp((START + timedelta(seconds=30 * i)).timestamp())
+        storage.record_event("WARN", "RISK_BLOCK", "blocked", {"symbol": "BTCUSDT"})
+        storage.record_event("INFO", "SIGNAL", f"signal {i}", {"symbol": "BTCUSDT"})
+    clock.set_timestamp((START + timedelta(hours=1)).timestamp())
+    storage.record_event("WARN", "RISK_BLOCK", "blocked", {"symbol": "BTCUSDT"})
+
+    config = RetentionConfig(batch_rows=3, pause_ms=0, event_span_seconds=60, archive_dir=str(tmp_path / "archive"))
+    retention = Retention(storage.conn, config, SimulatedClock(START + timedelta(hours=2)))
+    stats = retention.run_once()
+    assert stats.merged_events == 9
+    assert stats.deleted == {}
+    blocked = storage.fetch_events(event_type="RISK_BLOCK")
+    assert [(row["repeat_count"], row["last_timestamp"]) for row in blocked] == [
+        (1, None),
+        (10, (START + timedelta(seconds=270)).isoformat()),
+    ]
+    assert len(storage.fetch_events(event_type="SIGNAL")) == 10
+    assert len(storage.fetch_events(event_type="TRADE")) == 1
+    assert retention.run_once().merged_events == 0
+
+    retention.clock = SimulatedClock(START + timedelta(days=31))
+    stats = retention.run_once()
+    assert stats.deleted == {"events": 12} and stats.archived == {"events": 12}
+    with gzip.open(tmp_path / "archive" / "events" / "2024-01-01.jsonl.gz", "rt") as handle:
+        archived = [json.loads(line) for line in handle]
+    assert len(archived) == 12
+    assert archived[0]["event_type"] == "RISK_BLOCK" and archived[0]["repeat_count"] == 10
+    assert [row["event_type"] for row in storage.fetch_recent_events(10)] == ["TRADE"]
+    assert symbol_pnl(storage.conn)["BTCUSDT"].tolist() == [12.5]
+    storage.close()
+
+
+def test_equity_keeps_rollups_after_raw_rows_expire(tmp_path):
+    storage = Storage(str(tmp_path / "equity.db"))
+    with storage.batch():
+        for i in range(3 * 24 * 60):
+            timestamp = (START + timedelta(minutes=i)).isoformat()
+            storage.record_equity(EquityRecord(timestamp, 1000.0 + i % 100, 0.0, 0.0))
+
+    config = RetentionConfig(batch_rows=500, pause_ms=0, equity_raw_days=1, equity_minute_days=2, archive_dir="")
+    retention = Retention(storage.conn, config, SimulatedClock(START + timedelta(days=3)))
+    stats = retention.run_once()
+    assert stats.deleted == {"equity_curve": 2 * 24 * 60, "equity_rollup_minute": 24 * 60}
+    assert stats.archived == {}
+
+    rollups = dict(
+        storage.conn.execute("SELECT resolution, COUNT(*) FROM equity_rollup GROUP BY resolution").fetchall()
+    )
+    assert rollups == {"hour": 72, "minute": 2 * 24 * 60}
+    curve = equity_series(storage.conn, points=1500)
+    assert curve["timestamp"].iloc[0] == START
+    assert len(equity_series(storage.conn, start=(START + timedelta(days=2, hours=1)).isoformat(), points=1500)) == 23 * 60
+    storage.close()
+
+
+def test_worker_runs_in_background(tmp_path):
+    storage = Storage(str(tmp_path / "worker.db"))
+    storage.record_equity(EquityRecord("2020-01-01T00:00:00+00:00", 1000.0, 0.0, 0.0))
+    storage.record_equity(EquityRecord(datetime.now(timezone.utc).isoformat(), 1000.0, 0.0, 0.0))
+    worker = RetentionWorker(storage.path, storage.profile, RetentionConfig(enabled=True, archive_dir=""))
+    worker.start()
+    deadline = time.monotonic() + 5
+    while not worker.runs and time.monotonic() < deadline:
+        time.sleep(0.01)
+    worker.stop()
+    assert worker.runs == 1 and worker.errors == 0
+    assert storage.conn.execute("SELECT COUNT(*) FROM equity_curve").fetchone()[0] == 1
+    storage.close()
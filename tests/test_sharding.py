@@ -0,0 +1,61 @@
+import math
+from datetime import datetime, timezone
+
+import pytest
+
+from exchange.market_data import Tick
+from trading.engine import TradingEngine
+from trading.sharding import ShardedTradingEngine, partition_symbols
+
+
+@pytest.fixture
+def config(make_config):
+    return make_config(
+        symbols=["BTCUSDT", "ETHUSDT", "SOLUSDT", "BNBUSDT"],
+        strategy={"fast_period": 3, "slow_period": 8},
+        strategy_shards=2,
+        max_price_age_seconds=0,
+    )
+
+
+def run(engine):
+    for step in range(200):
+        ts = 1_700_000_000 + step
+        engine.clock.set_timestamp(ts)
+        stamp = datetime.fromtimestamp(ts, timezone.utc)
+        engine.on_ticks(
+            [
+                Tick(symbol, 100 + 10 * math.sin(step / (5 + i)), stamp)
+                for i, symbol in enumerate(engine.config.symbols)
+            ]
+        )
+    return engine.trade_count, {s: p.quantity for s, p in engine.portfolio.positions.items()}
+
+
+def test_partition_is_stable_and_complete():
+    symbols = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "BNBUSDT", "XRPUSDT"]
+    partitions = partition_symbols(symbols, 3)
+    assert sorted(s for part in partitions for s in part) == sorted(symbols)
+    assert partitions == partition_symbols(symbols, 3)
+
+
+def test_sharded_engine_matches_single_process(config, make_engine):
+    expected = run(make_engine(config, "single", engine_cls=TradingEngine))
+    assert expected[0] > 0
+    assert run(make_engine(config, "sharded", engine_cls=ShardedTradingEngine)) == expected
+
+
+def test_sharded_engine_snapshots_and_restores_shard_state(config, make_engine):
+    single = make_engine(config, "single")
+    sharded = make_engine(config, "sharded", engine_cls=ShardedTradingEngine)
+    restored = make_engine(config, "restored", engine_cls=ShardedTradingEngine)
+    for i, symbol in enumerate(config.symbols):
+        timestamps = [1_700_000_000 + step for step in range(50)]
+        prices = [100 + 10 * math.sin(step / (5 + i)) for step in range(50)]
+        single.replay(symbol, timestamps, prices)
+        sharded.replay(symbol, timestamps, prices)
+    expected = single.state_snapshot()["strategy"]
+    assert set(expected["history"]) == set(config.symbols)
+    assert sharded.state_snapshot()["strategy"] == expected
+    assert restored.restore_state(single.state_snapshot()) == sorted(config.symbols)
+    assert restored.state_snapshot()["strategy"] == expected
@@ -1,4 +1,9 @@
-from core.storage import Storage
+import sqlite3
+
+from core.clock import SimulatedClock
+from core.codec import decode_metadata
+from core.config import EventsConfig
+from core.storage import MIGRATIONS, Storage, convert_legacy_metadata
 
 
 def test_storage_events(tmp_path):
@@ -9,3 +14,102 @@ def test_storage_events(tmp_path):
     assert events
     assert events[0]["event_type"] == "TEST"
     storage.close()
+
+
+def test_storage_write_behind_groups_and_flushes(tmp_path):
+    db_path = tmp_path / "test.db"
+    storage = Storage(str(db_path), write_behind=True, flush_interval=10, flush_max_batch=1000)
+    with storage.batch():
+        for i in range(5):
+            storage.record_event("INFO", "TICK", f"event {i}", {})
+        storage.record_heartbeat("2024-01-01T00:00:00+00:00")
+
+    assert storage.flush(timeout=5)
+    events = storage.fetch_recent_events(10)
+    assert [row["message"] for row in events] == [f"event {i}" for i in reversed(range(5))]
+    assert storage.fetch_latest_heartbeat()["timestamp"] == "2024-01-01T00:00:00+00:00"
+
+    storage.record_event("INFO", "TICK", "after close", {})
+    storage.close()
+    reopened = Storage(str(db_path))
+    assert reopened.fetch_recent_events(1)[0]["message"] == "after close"
+    reopened.close()
+
+
+def test_storage_profile_and_migrations(tmp_path):
+    db_path = tmp_path / "legacy.db"
+    legacy = sqlite3.connect(db_path)
+    legacy.execute(
+        "CREATE TABLE events (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT, level TEXT, "
+        "event_type TEXT, message TEXT, metadata TEXT)"
+    )
+    legacy.execute("INSERT INTO events (timestamp, level, event_type, message, metadata) VALUES ('t', 'INFO', 'OLD', 'm', '')")
+    legacy.commit()
+    legacy.close()
+
+    storage = Storage(str(db_path))
+    assert storage.schema_version() == MIGRATIONS[-1][0]
+    assert storage.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    indexes = {row["name"] for row in storage.conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert "idx_events_event_type" in indexes
+    assert storage.fetch_recent_events(1)[0]["event_type"] == "OLD"
+    storage.close()
+
+    reopened = Storage(str(db_path))
+    assert reopened.schema_version() == MIGRATIONS[-1][0]
+    reopened.close()
+
+
+def test_storage_json_metadata_and_legacy_rows(tmp_path):
+    db_path = tmp_path / "test.db"
+    storage = Storage(str(db_path))
+    storage.record_event("INFO", "SIGNAL", "btc", {"symbol": "BTCUSDT", "side": "BUY"})
+    storage.record_event("INFO", "SIGNAL", "eth", {"symbol": "ETHUSDT", "side": "SELL"})
+    storage.conn.execute(
+        "INSERT INTO events (timestamp, level, event_type, message, metadata) VALUES (?, ?, ?, ?, ?)",
+        ("t", "INFO", "SIGNAL", "legacy", str({"symbol": "BTCUSDT", "side": "SELL"})),
+    )
+    storage.conn.commit()
+
+    assert decode_metadata(storage.fetch_recent_events(1)[0]["metadata"]) == {"symbol": "BTCUSDT", "side": "SELL"}
+    assert [row["message"] for row in storage.fetch_events(symbol="BTCUSDT")] == ["btc"]
+    assert [row["message"] for row in storage.fetch_events(metadata={"side": "SELL"})] == ["eth"]
+
+    convert_legacy_metadata(storage.conn)
+    assert [row["message"] for row in storage.fetch_events(symbol="BTCUSDT")] == ["legacy", "btc"]
+    storage.close()
+
+
+def test_repeated_events_are_coalesced(tmp_path):
+    clock = SimulatedClock()
+    events = EventsConfig(window_seconds=60, policies={"RISK_BLOCK": 60})
+    storage = Storage(str(tmp_path / "events.db"), clock=clock, events=events)
+    assert storage.events.policies["TRADE"] == storage.events.policies["KILL_SWITCH_CLOSE"] == 0
+    admitted = []
+    for second in range(600):
+        clock.set_timestamp(second)
+        admitted.append(storage.record_event("ERROR", "PRICE_FETCH", "timeout", {}))
+        if second % 100 == 0:
+            storage.record_event("WARN", "RISK_BLOCK", "Daily loss limit", {"symbol": "BTCUSDT"})
+            storage.record_event("WARN", "RISK_BLOCK", "Daily loss limit", {"symbol": "ETHUSDT"})
+            storage.record_event("INFO", "TRADE", "Trade executed BUY BTCUSDT", {"pnl": 1.0})
+            storage.record_event("INFO", "TRADE", "Trade executed BUY BTCUSDT", {"pnl": 2.0})
+        storage.record_heartbeat(clock.now().isoformat())
+    assert sum(admitted) == 10
+    assert storage.events.suppressed == 590
+    rows = storage.fetch_events(event_type="PRICE_FETCH", limit=100)
+    assert len(rows) == 19
+    assert sum(row["repeat_count"] for row in rows) == 10 + 9 * 59
+    assert (rows[1]["timestamp"], rows[1]["last_timestamp"], rows[1]["repeat_count"]) == (
+        "1970-01-01T00:08:01+00:00",
+        "1970-01-01T00:08:59+00:00",
+        59,
+    )
+    assert len(storage.fetch_events(event_type="TRADE", limit=100)) == 12
+    assert len(storage.fetch_events(event_type="RISK_BLOCK", limit=100)) == 12
+
+    storage.close()
+    reopened = Storage(str(tmp_path / "events.db"))
+    rows = reopened.fetch_events(event_type="PRICE_FETCH", limit=100)
+    assert len(rows) == 20 and sum(row["repeat_count"] for row in rows) == 600
+    reopened.close()
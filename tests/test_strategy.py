@@ -1,3 +1,8 @@
+import numpy as np
+
+from trading import strategy_ema
+from trading.indicators import ema_array
+from trading.strategy_base import SIGNAL_BUY, SIGNAL_SELL
 from trading.strategy_ema import EMAStrategy
 
 
@@ -7,3 +12,54 @@ def test_ema_crossover_signal():
     signals = strategy.generate_signals("BTCUSDT", prices)
     assert signals
     assert signals[0].side == "BUY"
+
+
+def test_incremental_ema_matches_full_recompute():
+    strategy = EMAStrategy(fast_period=3, slow_period=5)
+    prices = [100 + ((i * 7919) % 13) - 6 + i * 0.1 for i in range(200)]
+
+    for i, price in enumerate(prices):
+        incremental = strategy.update("BTCUSDT", price)
+        assert incremental == strategy.generate_signals("BTCUSDT", prices[: i + 1])
+
+    assert strategy.indicators.ema("BTCUSDT", 3).value == EMAStrategy._ema_series(prices, 3)[-1]
+    assert strategy.indicators.ema("BTCUSDT", 5).value == EMAStrategy._ema_series(prices, 5)[-1]
+
+    warm = EMAStrategy(fast_period=3, slow_period=5)
+    warm.warm_start("BTCUSDT", prices[:-1])
+    assert warm.update("BTCUSDT", prices[-1]) == strategy.generate_signals("BTCUSDT", prices)
+
+
+def test_bulk_signals_match_streaming_path():
+    rng = np.random.default_rng(7)
+    prices = np.concatenate([np.full(40, 100.0), 100 + np.cumsum(rng.normal(0, 1, 5000))])
+    strategy = EMAStrategy(fast_period=5, slow_period=13)
+
+    bulk = strategy.generate_signals_bulk("BTCUSDT", prices)
+
+    streaming = []
+    for price in prices.tolist():
+        signals = strategy.update("BTCUSDT", price)
+        streaming.append(0 if not signals else (SIGNAL_BUY if signals[0].side == "BUY" else SIGNAL_SELL))
+    assert bulk.tolist() == streaming
+    assert np.count_nonzero(bulk) > 10
+    assert np.allclose(ema_array(prices, 13), EMAStrategy._ema_series(prices.tolist(), 13), rtol=1e-12)
+
+
+def test_vectorized_fast_path_matches_streaming_without_ties(monkeypatch):
+    def exact_fallback(values, period):
+        raise AssertionError("exact fallback used")
+
+    monkeypatch.setattr(strategy_ema, "exact_ema_array", exact_fallback)
+    rng = np.random.default_rng(11)
+    prices = 100 + np.cumsum(rng.normal(0, 1, 5000))
+    strategy = EMAStrategy(fast_period=5, slow_period=13)
+
+    bulk = strategy.generate_signals_bulk("BTCUSDT", prices)
+
+    streaming = []
+    for price in prices.tolist():
+        signals = strategy.update("BTCUSDT", price)
+        streaming.append(0 if not signals else (SIGNAL_BUY if signals[0].side == "BUY" else SIGNAL_SELL))
+    assert bulk.tolist() == streaming
+    assert np.count_nonzero(bulk) > 10
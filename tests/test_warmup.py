@@ -0,0 +1,81 @@
+import math
+
+import pytest
+
+from core.clock import SimulatedClock
+from exchange.binance_client import BinanceClient
+from trading.warmup import save_state, warm_start
+
+START = 1_700_000_000
+
+
+def price(i):
+    return 100 + 5 * math.sin(i / 17) + 0.5 * math.sin(i / 3)
+
+
+class FakeKlineClient:
+    def futures_klines(self, symbol, interval, limit):
+        return [
+            [0, "0", "0", "0", str(price(i)), "0", (START + i * 60 + 59) * 1000 + 999]
+            for i in range(300 - limit, 301)
+        ]
+
+
+@pytest.fixture
+def config(tmp_path, make_config):
+    return make_config(
+        strategy={"fast_period": 5, "slow_period": 20},
+        state={"snapshot_path": str(tmp_path / "state.json"), "max_snapshot_age_seconds": 600, "warmup_klines": 300},
+    )
+
+
+@pytest.fixture
+def restart(config, make_engine):
+    def make(name):
+        clock = SimulatedClock()
+        clock.set_timestamp(START + 300 * 60)
+        return make_engine(config, name, clock)
+
+    return make
+
+
+def signals_after(engine, start, count=400):
+    out = []
+    for i in range(start, start + count):
+        out.append([signal.side for signal in engine.strategy.update("BTCUSDT", price(i))])
+    return out
+
+
+def test_restart_restores_snapshot_or_replays_klines(tmp_path, restart):
+    original = restart("original")
+    original.replay("BTCUSDT", [START + i * 60 for i in range(300)], [price(i) for i in range(300)])
+    save_state(original)
+
+    restored = restart("restored")
+    assert warm_start(restored) == {"BTCUSDT": "snapshot"}
+    assert restored.price_history.window("BTCUSDT").tolist() == original.price_history.window("BTCUSDT").tolist()
+
+    (tmp_path / "state.json").unlink()
+    from_klines = restart("klines")
+    assert warm_start(from_klines, BinanceClient("paper", client=FakeKlineClient())) == {"BTCUSDT": "klines"}
+    assert len(from_klines.price_history.window("BTCUSDT")) == from_klines.price_history.capacity
+
+    expected = signals_after(original, 300)
+    assert any(expected)
+    assert signals_after(restored, 300) == expected
+    assert signals_after(from_klines, 300) == expected
+
+
+def test_snapshot_restore_replays_bars_newer_than_the_snapshot(restart):
+    close_times = [START + i * 60 + 59.999 for i in range(300)]
+
+    original = restart("original")
+    original.replay("BTCUSDT", close_times[:250], [price(i) for i in range(250)])
+    save_state(original)
+    original.replay("BTCUSDT", close_times[250:], [price(i) for i in range(250, 300)])
+
+    restored = restart("restored")
+    assert warm_start(restored, BinanceClient("paper", client=FakeKlineClient())) == {"BTCUSDT": "snapshot"}
+    assert restored.price_history.ring("BTCUSDT").timestamps().tolist() == close_times[-restored.price_history.capacity :]
+    assert restored.price_history.window("BTCUSDT").tolist() == original.price_history.window("BTCUSDT").tolist()
+    assert signals_after(restored, 300) == signals_after(original, 300)